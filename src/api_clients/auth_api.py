@@ -21,3 +21,16 @@ class AuthAPIClient:
 
         return response.json()["access_token"]
 
+
+    def logout(self, token: str) -> None:
+        """
+        Revoca los tokens del usuario en la API.
+        """
+        response = requests.post(
+            f"{self.base_url}/auth/logout",
+            headers={"Authorization": f"Bearer {token}"},
+            timeout=5
+        )
+
+        if response.status_code != 200:
+            raise Exception(response.text)
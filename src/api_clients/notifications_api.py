@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 from datetime import datetime
 from src.database import get_db
 from src.notification.notification_dispatcher import dispatch_pending_notifications
+from src.services.archive_service import archive_old_rows, get_archive_metrics
 
 router = APIRouter()
 
@@ -30,3 +31,27 @@ def send_pending_notifications_get(db: Session = Depends(get_db)):
         return {"processed": processed}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/archive")
+def archive_notifications(
+    dry_run: bool = True,
+    retention_days: int | None = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Archiva notificaciones enviadas y replies procesados.
+    Por defecto corre en dry-run: solo informa cuántas filas se moverían.
+    """
+    try:
+        return archive_old_rows(db, retention_days=retention_days, dry_run=dry_run)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/archive/metrics")
+def archive_metrics(db: Session = Depends(get_db)):
+    """
+    Filas estimadas y tamaño de las tablas calientes y de archivo.
+    """
+    return get_archive_metrics(db)
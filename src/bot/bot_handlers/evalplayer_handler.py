@@ -1,3 +1,4 @@
+import asyncio
 from telegram.ext import ContextTypes, ConversationHandler
 from telegram import Update
 import requests
@@ -6,7 +7,7 @@ from src.config import Settings
 
 from src.bot.commands.evalplayer import SELECT_BUTTONS, generar_texto_stat, fila_labels, VALOR_MAP
 from src.database import get_db
-from src.services.telegram_identity_service import get_identity_by_telegram_user_id, is_identity_linked
+from src.services.telegram_identity_service import resolve_identity, is_identity_linked
 
 
 async def evalplayer_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -49,7 +50,7 @@ async def evalplayer_callback(update: Update, context: ContextTypes.DEFAULT_TYPE
 
         # Obtener evaluator_username desde Telegram Identity
         db = next(get_db())
-        identity = get_identity_by_telegram_user_id(
+        identity = resolve_identity(
             db=db,
             telegram_user_id=update.effective_user.id
         )
@@ -59,13 +60,13 @@ async def evalplayer_callback(update: Update, context: ContextTypes.DEFAULT_TYPE
             )
             return ConversationHandler.END
 
-        evaluator_username = identity.user.username
+        evaluator_username = identity.username
         context.user_data["logged_username"] = evaluator_username  # guardamos para futuras referencias
 
         # Enviar al backend
         try:
             params = {"evaluator_username": evaluator_username}  # va en query
-            response = requests.put(
+            response = await asyncio.to_thread(requests.put,
                 f"{Settings.API_BASE_URL}/player/{username}/stats",  # CORRECTO: /player/
                 params=params,
                 json=stats_payload,
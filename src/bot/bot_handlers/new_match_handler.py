@@ -1,16 +1,17 @@
+import asyncio
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import (
     ContextTypes,
     ConversationHandler,
 )
-from io import BytesIO
+from src.bot.telegram_media import send_cached_photo
 import requests
 
 from src.bot.conversations.auth_messages import send_post_auth_menu
 from src.config import Settings
 from src.database import get_db
 from src.services.telegram_identity_service import (
-    get_identity_by_telegram_user_id,
+    resolve_identity,
     is_identity_linked,
 )
 from datetime import datetime
@@ -29,7 +30,7 @@ async def new_match_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     db = next(get_db())
     msg = update.effective_message
 
-    identity = get_identity_by_telegram_user_id(
+    identity = resolve_identity(
         db=db,
         telegram_user_id=update.effective_user.id
     )
@@ -41,7 +42,7 @@ async def new_match_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return ConversationHandler.END
 
     # Guardamos el username logueado para poder obtener top teammates
-    context.user_data["logged_username"] = identity.user.username
+    context.user_data["logged_username"] = identity.username
 
     # Parsear fecha opcional
     match_date = None
@@ -66,7 +67,7 @@ async def new_match_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     }
 
     # Inicializamos la UI dinámica
-    await init_match_ui(update, context, username=identity.user.username)
+    await init_match_ui(update, context, username=identity.username)
     return MATCH_ADD_PLAYERS
 
 # ========================
@@ -227,7 +228,7 @@ async def update_top_teammates(update_or_query, context: ContextTypes.DEFAULT_TY
     headers = {"Authorization": f"Bearer {context.user_data.get('token')}"}
     teammates = []
     try:
-        resp = requests.get(
+        resp = await asyncio.to_thread(requests.get,
             f"{Settings.API_BASE_URL}/player/{username}/top_teammates",
             headers=headers,
             params={"limit": 5},
@@ -424,22 +425,35 @@ async def finalize_match(query, context: ContextTypes.DEFAULT_TYPE):
     input_groups = data["groups"] + [[u] for u in data["individuals"]]
 
     # ========================
-    # Validar todos los players primero
+    # Validar todos los players primero (un solo request para todo el roster)
     # ========================
-    missing_users = []
-    player_objects = []
+    all_usernames = list(dict.fromkeys(u for group in input_groups for u in group))
+    resolve_resp = await asyncio.to_thread(requests.post,
+        f"{Settings.API_BASE_URL}/player/resolve",
+        headers=headers,
+        json={"usernames": all_usernames},
+        timeout=5
+    )
+    if not resolve_resp.ok:
+        await msg.reply_text(f"❌ Error al validar los jugadores:\n{resolve_resp.text}")
+        return MATCH_ADD_PLAYERS
 
-    for group in input_groups:
-        for username in group:
-            player_resp = requests.get(
-                f"{Settings.API_BASE_URL}/player/{username}",
-                headers=headers,
-                timeout=5
-            )
-            if not player_resp.ok:
-                missing_users.append(username)
-            else:
-                player_objects.append(player_resp.json())
+    resolved = resolve_resp.json()
+    player_objects = resolved["players"]
+    missing_users = resolved["missing_usernames"]
+
+    # El resolve no distingue mayúsculas: se guardan los nombres tal como están
+    # en la base. Los exactos y los faltantes (o ambiguos) quedan como vinieron
+    exact_names = {p["name"] for p in player_objects}
+    canonical = {p["name"].lower(): p["name"] for p in player_objects}
+
+    def _canonical_name(username: str) -> str:
+        if username in exact_names or username in missing_users:
+            return username
+        return canonical.get(username.lower(), username)
+
+    data["groups"] = [[_canonical_name(u) for u in group] for group in data["groups"]]
+    data["individuals"] = [_canonical_name(u) for u in data["individuals"]]
 
     # Si hay usernames que no existen, avisar y volver al menú
     if missing_users:
@@ -468,7 +482,7 @@ async def finalize_match(query, context: ContextTypes.DEFAULT_TYPE):
     # Crear match si todos los players existen
     # ========================
     match_date = data.get("date")
-    match_resp = requests.post(
+    match_resp = await asyncio.to_thread(requests.post,
         f"{Settings.API_BASE_URL}/match/matches",
         headers=headers,
         json={
@@ -485,14 +499,14 @@ async def finalize_match(query, context: ContextTypes.DEFAULT_TYPE):
     match_id = match_resp.json()["id"]
 
     for player in player_objects:
-        requests.post(
+        await asyncio.to_thread(requests.post,
             f"{Settings.API_BASE_URL}/match/matches/{match_id}/players/{player['id']}",
             headers=headers,
             timeout=5
         )
 
     if data["groups"]:
-        requests.post(
+        await asyncio.to_thread(requests.post,
             f"{Settings.API_BASE_URL}/match/matches/{match_id}/pre-set-groups",
             headers=headers,
             json={"groups": data["groups"]},
@@ -504,7 +518,7 @@ async def finalize_match(query, context: ContextTypes.DEFAULT_TYPE):
         "⚔️ Generando equipos automáticamente..."
     )
 
-    resp = requests.post(
+    resp = await asyncio.to_thread(requests.post,
         f"{Settings.API_BASE_URL}/match/matches/{match_id}/generate-teams",
         headers=headers,
         timeout=5
@@ -518,7 +532,7 @@ async def finalize_match(query, context: ContextTypes.DEFAULT_TYPE):
         )
 
         try:
-            img_resp = requests.post(
+            img_resp = await asyncio.to_thread(requests.post,
                 f"{Settings.API_BASE_URL}/match/matches/{match_id}/match-card",
                 headers=headers,
                 timeout=10
@@ -529,11 +543,12 @@ async def finalize_match(query, context: ContextTypes.DEFAULT_TYPE):
                     "⚠️ El match se creó correctamente, pero no se pudo generar la imagen."
                 )
             else:
-                image_buffer = BytesIO(img_resp.content)
-                image_buffer.name = "match_card.png"
-                await msg.reply_photo(
-                    photo=image_buffer,
-                    caption="🖼️ Resumen visual del match"
+                await send_cached_photo(
+                    msg,
+                    img_resp.content,
+                    caption="🖼️ Resumen visual del match",
+                    kind="match_card",
+                    filename="match_card.png",
                 )
         except requests.RequestException as e:
             await msg.reply_text(f"⚠️ Error al obtener la imagen del match:\n{e}")
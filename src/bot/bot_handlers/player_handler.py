@@ -8,7 +8,7 @@ from telegram.ext import ContextTypes
 from src.database import get_db
 from src.config import settings
 from src.services.telegram_identity_service import (
-    get_identity_by_telegram_user_id,
+    resolve_identity,
     is_identity_linked,
 )
 
@@ -25,8 +25,8 @@ async def handle_profile_photo(update: Update, context: ContextTypes.DEFAULT_TYP
 
     db = next(get_db())
 
-    # 🔑 Obtener identidad desde DB usando telegram_user_id
-    identity = get_identity_by_telegram_user_id(
+    # 🔑 Obtener identidad (cache) usando telegram_user_id
+    identity = resolve_identity(
         db=db,
         telegram_user_id=update.effective_user.id
     )
@@ -38,8 +38,8 @@ async def handle_profile_photo(update: Update, context: ContextTypes.DEFAULT_TYP
         context.user_data.pop("awaiting_photo", None)
         return
 
-    # ✅ Username desde la relación ORM
-    username = identity.user.username
+    # ✅ Username desde la identidad cacheada
+    username = identity.username
 
     # 📸 Foto en máxima calidad
     photo = update.message.photo[-1]
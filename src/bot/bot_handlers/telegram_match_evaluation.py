@@ -1,6 +1,6 @@
 from sqlalchemy.orm import Session
-from src.models import MatchResultReply
-from src.services.telegram_identity_service import get_identity_by_telegram_user_id
+from src.services.match_service import record_match_result_reply
+from src.services.telegram_identity_service import resolve_identity
 
 def handle_telegram_reply(
     db: Session,
@@ -9,13 +9,13 @@ def handle_telegram_reply(
 ) -> dict:
     """
     Maneja la respuesta de un usuario vía Telegram sobre si ganó o perdió un match.
-    Solo registra la respuesta y devuelve un mensaje de guía para evaluar jugadores.
+    Registra la respuesta (y el voto) y devuelve un mensaje de guía para evaluar jugadores.
     """
 
     print("callback_data:", callback_data, "telegram_user_id:", telegram_user_id)
 
     # 1️⃣ Obtener identidad activa por telegram_user_id
-    identity = get_identity_by_telegram_user_id(db, telegram_user_id)
+    identity = resolve_identity(db, telegram_user_id)
     if not identity or not identity.user_id:
         return {"text": "❌ Tu cuenta de Telegram no está vinculada a un usuario."}
 
@@ -31,25 +31,13 @@ def handle_telegram_reply(
     except Exception:
         return {"text": "Comando inválido o mal formado."}
 
-    # 3️⃣ Revisar si ya respondió
-    already_replied = db.query(MatchResultReply).filter_by(
-        match_id=match_id,
-        user_id=identity.user_id,
-    ).first()
+    # 3️⃣ Guardar respuesta (idempotente, aplica el voto al instante)
+    outcome = record_match_result_reply(db, match_id, identity.user_id, result)
 
-    if already_replied:
+    if not outcome["recorded"]:
         return {"text": "ℹ️ Ya registramos tu respuesta para este partido."}
 
-    # 4️⃣ Guardar respuesta
-    reply = MatchResultReply(
-        match_id=match_id,
-        user_id=identity.user_id,
-        result=result,
-    )
-    db.add(reply)
-    db.commit()
-
-    # 5️⃣ Mensaje final al usuario
+    # 4️⃣ Mensaje final al usuario
     return {
         "text": (
             "✅ Respuesta registrada.\n\n"
@@ -1,9 +1,10 @@
+import asyncio
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
 from telegram.ext import CommandHandler, CallbackQueryHandler, ContextTypes, ConversationHandler
 import requests
 from src.config import Settings
 from src.database import get_db
-from src.services.telegram_identity_service import get_identity_by_telegram_user_id, is_identity_linked
+from src.services.telegram_identity_service import resolve_identity, is_identity_linked
 
 SELECT_BUTTONS = 0
 
@@ -74,7 +75,7 @@ async def evalplayer_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     # Obtener username del evaluador antes de validar
     db = next(get_db())
-    identity = get_identity_by_telegram_user_id(
+    identity = resolve_identity(
         db=db,
         telegram_user_id=update.effective_user.id
     )
@@ -84,7 +85,7 @@ async def evalplayer_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
         )
         return ConversationHandler.END
 
-    evaluator_username = identity.user.username
+    evaluator_username = identity.username
     context.user_data["logged_username"] = evaluator_username
 
     # -----------------------------
@@ -116,7 +117,7 @@ async def evalplayer_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     # Llamada al backend para obtener stats
     try:
-        response = requests.get(f"{Settings.API_BASE_URL}/player/{username}", timeout=5)
+        response = await asyncio.to_thread(requests.get, f"{Settings.API_BASE_URL}/player/{username}", timeout=5)
         response.raise_for_status()
         player_data = response.json()
     except requests.RequestException:
@@ -1,8 +1,13 @@
 # src/bot/commands/logout.py
+import asyncio
+
 from telegram import Update
 from telegram.ext import ContextTypes
+from src.api_clients.auth_api import AuthAPIClient
+from src.config import settings
 from src.database import get_db
 from src.services.telegram_identity_service import get_identity_by_telegram_user_id, unlink_identity_from_user
+from src.utils.logger_config import app_logger as logger
 
 async def logout_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     db = next(get_db())
@@ -12,6 +17,14 @@ async def logout_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if identity:
         unlink_identity_from_user(db, identity)
 
+    # Revocar el JWT en la API (si no, sigue valiendo hasta que expire)
+    token = context.user_data.get("token")
+    if token:
+        try:
+            await asyncio.to_thread(AuthAPIClient(settings.api_root_login).logout, token)
+        except Exception as e:
+            logger.warning(f"No se pudo revocar el token en la API: {e}")
+
     context.user_data.clear()
 
     await update.message.reply_text(
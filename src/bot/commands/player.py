@@ -1,3 +1,4 @@
+import asyncio
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 import requests
@@ -6,8 +7,9 @@ import requests
 from src.api_clients.users_api import UsersAPIClient
 from src.database import get_db
 from src.config import Settings
+from src.bot.telegram_media import send_cached_photo
 from src.services.player_service import generate_player_card_for_telegram_bot
-from src.services.telegram_identity_service import is_identity_linked, get_identity_by_telegram_user_id
+from src.services.telegram_identity_service import is_identity_linked, resolve_identity
 
 users_api = UsersAPIClient()
 
@@ -37,12 +39,14 @@ async def player_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     try:
         # 2️⃣ Generar carta (sin pasar template_path)
-        card_buffer = generate_player_card_for_telegram_bot(username)
+        card_buffer = await asyncio.to_thread(generate_player_card_for_telegram_bot, username)
 
         # 3️⃣ Enviar imagen
-        await message.reply_photo(
-            photo=card_buffer,
-            caption=f"🏅 Carta de {username}"
+        await send_cached_photo(
+            message,
+            card_buffer,
+            caption=f"🏅 Carta de {username}",
+            kind="player_card",
         )
 
         # 4️⃣ Enviar texto + botón
@@ -65,7 +69,7 @@ async def player_info_callback(update: Update, context: ContextTypes.DEFAULT_TYP
     username = query.data.split(":")[1]
 
     try:
-        resp = requests.get(f"{Settings.API_BASE_URL}/player/{username}/profile", timeout=5)
+        resp = await asyncio.to_thread(requests.get, f"{Settings.API_BASE_URL}/player/{username}/profile", timeout=5)
         if resp.status_code != 200:
             await query.message.reply_text(
                 f"❌ No se pudo obtener la información de {username}.\nStatus: {resp.status_code}"
@@ -146,7 +150,7 @@ async def player_info_callback(update: Update, context: ContextTypes.DEFAULT_TYP
 async def photo_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     db = next(get_db())
 
-    identity = get_identity_by_telegram_user_id(
+    identity = resolve_identity(
         db=db,
         telegram_user_id=update.effective_user.id
     )
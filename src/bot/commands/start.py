@@ -5,6 +5,7 @@ from src.bot.conversations.auth_messages import send_post_auth_menu
 from src.services.telegram_identity_service import (
     create_identity_if_not_exists,
     is_identity_linked,
+    resolve_identity,
 )
 from src.database import get_db
 
@@ -31,11 +32,16 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     db = next(get_db())
 
-    identity = create_identity_if_not_exists(
-        db=db,
-        telegram_user_id=tg_user.id,
-        telegram_username=tg_user.username,
-    )
+    identity = resolve_identity(db=db, telegram_user_id=tg_user.id)
+
+    # Solo escribimos si la identidad no existe o cambió el username de Telegram
+    if identity is None or (tg_user.username and identity.telegram_username != tg_user.username):
+        create_identity_if_not_exists(
+            db=db,
+            telegram_user_id=tg_user.id,
+            telegram_username=tg_user.username,
+        )
+        identity = resolve_identity(db=db, telegram_user_id=tg_user.id)
 
     context.user_data["identity_id"] = identity.id
 
@@ -50,11 +56,11 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
         context.user_data["auth_flow"] = "login"
         context.user_data["login_step"] = "password"
         context.user_data["login_data"] = {
-            "username": identity.user.username
+            "username": identity.username
         }
 
         await update.message.reply_text(
-            f"👋 Bienvenido {identity.user.username}.\n"
+            f"👋 Bienvenido {identity.username}.\n"
             "Para iniciar sesión en Max_io, escribí tu contraseña:"
         )
         return
@@ -1,4 +1,5 @@
 # src/bot/conversations/auth_messages.py
+import asyncio
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 
@@ -68,18 +69,18 @@ async def process_registration(update: Update, context: ContextTypes.DEFAULT_TYP
         try:
             # Crear usuario
             users_api = UsersAPIClient()
-            users_api.register_user(payload)
+            await asyncio.to_thread(users_api.register_user, payload)
 
             # Login automático
             auth_api = AuthAPIClient(settings.api_root_login)
-            token = auth_api.login(username=payload.username, password=payload.password)
+            token = await asyncio.to_thread(auth_api.login, username=payload.username, password=payload.password)
 
             # Guardar token
             context.user_data["token"] = token
 
             # Obtener usuario autenticado
             users_api = UsersAPIClient(token)
-            user = users_api.get_user()
+            user = await asyncio.to_thread(users_api.get_user)
 
             # Crear o obtener identidad de Telegram
             db = next(get_db())
@@ -140,12 +141,12 @@ async def process_login(update: Update, context: ContextTypes.DEFAULT_TYPE):
         try:
             # Validar credenciales
             auth_api = AuthAPIClient(settings.api_root_login)
-            token = auth_api.login(username=login_data["username"], password=password)
+            token = await asyncio.to_thread(auth_api.login, username=login_data["username"], password=password)
             context.user_data["token"] = token
 
             # Obtener usuario autenticado
             users_api = UsersAPIClient(token)
-            user = users_api.get_user()
+            user = await asyncio.to_thread(users_api.get_user)
 
             # Vincular identidad solo si no estaba vinculada
             if not identity.user_id:
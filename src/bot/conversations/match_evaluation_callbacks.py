@@ -1,4 +1,5 @@
 # src/bot/handlers/telegram_callbacks.py
+import asyncio
 from telegram import Update
 from telegram.ext import CallbackContext, CallbackQueryHandler, ContextTypes
 from sqlalchemy.orm import Session
@@ -6,6 +7,13 @@ from sqlalchemy.orm import Session
 from src.database import get_db  # función que devuelve sesión SQLAlchemy
 from src.bot.bot_handlers.telegram_match_evaluation import handle_telegram_reply  # tu función
 
+def _handle_reply(telegram_user_id: int, callback_data: str) -> dict:
+    db = next(get_db())  # <-- aquí obtenés la sesión síncrona
+    try:
+        return handle_telegram_reply(db, telegram_user_id, callback_data)
+    finally:
+        db.close()
+
 # --------------------------
 # Función que maneja los clicks de los botones
 # --------------------------
@@ -13,12 +21,6 @@ async def process_match_result_callback(update: Update, context: ContextTypes.DE
     query = update.callback_query
     await query.answer()
 
-    db = next(get_db())  # <-- aquí obtenés la sesión síncrona
-    try:
-        telegram_user_id = query.from_user.id
-        callback_data = query.data
-        result = handle_telegram_reply(db, telegram_user_id, callback_data)
-    finally:
-        db.close()
+    result = await asyncio.to_thread(_handle_reply, query.from_user.id, query.data)
 
     await query.edit_message_text(result["text"])
@@ -1,4 +1,5 @@
 # src/bot/callbacks/profile_callbacks.py
+import asyncio
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 
@@ -10,7 +11,7 @@ import requests
 from src.bot.commands.player import player_command
 from src.config import Settings
 from src.database import get_db
-from src.services.telegram_identity_service import get_identity_by_telegram_user_id
+from src.services.telegram_identity_service import resolve_identity
 
 
 async def profile_view_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -25,16 +26,16 @@ async def profile_view_callback(update: Update, context: ContextTypes.DEFAULT_TY
         return
 
     db = next(get_db())
-    identity = get_identity_by_telegram_user_id(
+    identity = resolve_identity(
         db=db,
         telegram_user_id=update.effective_user.id
     )
 
-    if not identity or not identity.user:
+    if not identity or not identity.username:
         await query.edit_message_text("❌ No se pudo obtener tu usuario.")
         return
 
-    username = identity.user.username
+    username = identity.username
     headers = {"Authorization": f"Bearer {token}"}
 
     # ------------------------
@@ -42,7 +43,7 @@ async def profile_view_callback(update: Update, context: ContextTypes.DEFAULT_TY
     # ------------------------
     teammates = []
     try:
-        resp = requests.get(
+        resp = await asyncio.to_thread(requests.get,
             f"{Settings.API_BASE_URL}/player/{username}/top_teammates",
             headers=headers,
             params={"limit": 3},
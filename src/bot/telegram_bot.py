@@ -3,18 +3,26 @@
 import time
 import httpx
 import asyncio
-from telegram.ext import ApplicationBuilder
+from telegram.ext import Application, ApplicationBuilder
 from src.bot.telegram_sender import TelegramNotificationSender
 from src.bot.telegram_worker import notification_worker
 from src.config import settings
+from src.services.leader_service import Leadership, BOT_LOCK, NOTIFICATION_WORKER_LOCK, wait_for_leadership, \
+    run_as_leader
 from src.utils.logger_config import app_logger as logger
-from src.bot.telegram_handlers import get_handlers
 
 TOKEN = settings.TELEGRAM_TOKEN
-telegram_app: ApplicationBuilder | None = None  # variable global
+telegram_app: Application | None = None  # variable global
 
+# Advisory locks: un solo bot y un solo worker de notificaciones por base,
+# aunque haya varios procesos (ver src/services/leader_service.py). Las
+# tareas corren con run_as_leader: si se pierde el lock se cortan y vuelven
+# a esperar; cancelarlas suelta el lock
+_worker_task: asyncio.Task | None = None
+_bot_task: asyncio.Task | None = None
 
-def get_telegram_app() -> ApplicationBuilder:
+
+def get_telegram_app() -> Application:
     if telegram_app is None:
         raise RuntimeError("Bot de Telegram no inicializado aún")
     return telegram_app
@@ -42,30 +50,191 @@ def wait_for_api():
             time.sleep(1)
 
 
-def run_bot():
-    global telegram_app
-    wait_for_api()
+def build_telegram_app(webhook: bool = False) -> Application:
+    """
+    Crea la Application de Telegram con todos los handlers registrados.
+    En modo webhook no se usa Updater: los updates llegan por la API.
+    """
+    # Los handlers (conversaciones, comandos, ...) solo los necesita el bot,
+    # no el worker de notificaciones
+    from src.bot.telegram_handlers import get_handlers
 
-    logger.info("Inicializando bot de Telegram...")
-    telegram_app = ApplicationBuilder().token(TOKEN).build()
-    telegram_sender = TelegramNotificationSender(telegram_app)
+    builder = ApplicationBuilder().token(TOKEN)
+    if webhook:
+        builder = builder.updater(None)
+    app = builder.build()
 
     # Obtener handlers
     handlers = get_handlers()
 
     # Registrar handlers
     for cmd in handlers["commands"]:
-        telegram_app.add_handler(cmd)
+        app.add_handler(cmd)
     for conv in handlers["conversations"]:
-        telegram_app.add_handler(conv)
+        app.add_handler(conv)
     for cb in handlers["callbacks"]:
-        telegram_app.add_handler(cb)
+        app.add_handler(cb)
     for msg in handlers["messages"]:
-        telegram_app.add_handler(msg)
+        app.add_handler(msg)
+
+    return app
+
+
+# =========================
+# Modo polling (desarrollo)
+# =========================
+async def _embedded_worker(sender: TelegramNotificationSender) -> None:
+    """
+    El worker embebido solo procesa si este proceso tiene el lock. Si ya
+    corre src.run_worker u otro bot, queda en espera (sin duplicar envíos)
+    y toma el lugar cuando el otro se cae.
+    """
+    await run_as_leader("notification_worker", NOTIFICATION_WORKER_LOCK, lambda: notification_worker_loop(sender))
+
+
+async def _stop_worker_task() -> None:
+    global _worker_task
+    if _worker_task is None:
+        return
+    _worker_task.cancel()
+    await asyncio.gather(_worker_task, return_exceptions=True)  # suelta el lock
+    _worker_task = None
 
-    # ⚡ Levantar worker en job_queue
-    telegram_app.job_queue.run_once(lambda _: asyncio.create_task(notification_worker_loop(telegram_sender)), when=0)
 
-    # ⚡ Arrancar polling
+def _poll_while_leader(leadership: Leadership) -> bool:
+    """
+    Corre el bot en polling hasta que se apague o se pierda el lock.
+    Retorna True si se perdió el lock.
+    """
+    global telegram_app
+    lost = False
+
+    logger.info("Inicializando bot de Telegram (polling)...")
+    telegram_app = build_telegram_app()
+    telegram_sender = TelegramNotificationSender(telegram_app)
+
+    async def _check_leadership(context) -> None:
+        nonlocal lost
+        if not await asyncio.to_thread(leadership.is_alive):
+            logger.warning("Liderazgo del bot perdido: se corta el polling")
+            lost = True
+            context.application.stop_running()
+
+    async def _start_worker(_) -> None:
+        global _worker_task
+        _worker_task = asyncio.create_task(_embedded_worker(telegram_sender))
+
+    async def _post_stop(_) -> None:
+        await _stop_worker_task()
+
+    telegram_app.job_queue.run_repeating(
+        _check_leadership, interval=settings.LEADER_CHECK_SECONDS, first=settings.LEADER_CHECK_SECONDS
+    )
+    # ⚡ Levantar worker en job_queue (salvo que corra aparte con src.run_worker)
+    if settings.NOTIFICATION_WORKER_EMBEDDED:
+        telegram_app.job_queue.run_once(_start_worker, when=0)
+    telegram_app.post_stop = _post_stop
+
+    # ⚡ Arrancar polling (el loop queda abierto por si hay que volver a empezar)
     logger.info("Bot iniciado. Esperando mensajes...")
-    telegram_app.run_polling()
+    telegram_app.run_polling(close_loop=False)
+    telegram_app = None
+    return lost
+
+
+def run_bot():
+    wait_for_api()
+
+    while True:
+        # Si hay otro bot corriendo (otro supervisor, un run_bot suelto) este
+        # queda en espera y toma el lugar cuando el otro se cae
+        leadership = wait_for_leadership("bot", BOT_LOCK)
+        try:
+            lost = _poll_while_leader(leadership)
+        finally:
+            leadership.release()
+        if not lost:
+            return
+        logger.info("Bot: esperando volver a ser líder...")
+
+
+# =========================
+# Worker de notificaciones solo (src.run_worker)
+# =========================
+async def run_notification_worker() -> None:
+    """
+    Corre solo el worker de notificaciones, sin handlers ni polling/webhook.
+    La Application se usa únicamente para mandar mensajes (app.bot).
+    """
+    logger.info("Inicializando worker de notificaciones...")
+    app = ApplicationBuilder().token(TOKEN).updater(None).build()
+    sender = TelegramNotificationSender(app)
+
+    await app.initialize()
+    try:
+        await run_as_leader("notification_worker", NOTIFICATION_WORKER_LOCK, lambda: notification_worker_loop(sender))
+    finally:
+        await app.shutdown()
+
+
+# =========================
+# Modo webhook (mismo event loop que FastAPI)
+# =========================
+async def start_webhook_bot() -> None:
+    """
+    Levanta el bot dentro del event loop de la API en segundo plano: si otro
+    proceso tiene el lock este queda en espera, y si lo pierde deja de
+    atender updates hasta recuperarlo. Los updates los recibe
+    src/routers/telegram_router.py y los encola en Application.update_queue.
+    """
+    global _bot_task
+
+    if not settings.TELEGRAM_WEBHOOK_URL:
+        raise RuntimeError("TELEGRAM_WEBHOOK_URL es obligatorio en modo webhook")
+    if not settings.TELEGRAM_WEBHOOK_SECRET:
+        raise RuntimeError("TELEGRAM_WEBHOOK_SECRET es obligatorio en modo webhook")
+
+    _bot_task = asyncio.create_task(run_as_leader("bot", BOT_LOCK, _serve_webhook_bot))
+
+
+async def _serve_webhook_bot() -> None:
+    """
+    Bot en modo webhook mientras este proceso sea líder (hasta que se cancele).
+    """
+    global telegram_app, _worker_task
+
+    logger.info("Inicializando bot de Telegram (webhook)...")
+    app = build_telegram_app(webhook=True)
+
+    await app.initialize()
+    await app.start()
+    try:
+        await app.bot.set_webhook(
+            url=settings.telegram_webhook_full_url,
+            secret_token=settings.TELEGRAM_WEBHOOK_SECRET,
+            allowed_updates=["message", "callback_query"],
+        )
+        telegram_app = app
+
+        if settings.NOTIFICATION_WORKER_EMBEDDED:
+            _worker_task = asyncio.create_task(_embedded_worker(TelegramNotificationSender(app)))
+
+        logger.info(f"Webhook registrado en {settings.telegram_webhook_full_url}")
+        await asyncio.Event().wait()  # hasta el apagado o perder el lock
+    finally:
+        telegram_app = None
+        await _stop_worker_task()
+        await app.stop()
+        await app.shutdown()
+        logger.info("Bot de Telegram (webhook) detenido")
+
+
+async def stop_webhook_bot() -> None:
+    global _bot_task
+
+    # Cancelar la tarea apaga el bot y el worker y suelta los locks: recién
+    # ahí otro proceso puede tomarlos
+    if _bot_task is not None:
+        _bot_task.cancel()
+        await asyncio.gather(_bot_task, return_exceptions=True)
+        _bot_task = None
@@ -0,0 +1,95 @@
+# src/bot/telegram_media.py
+
+import asyncio
+from io import BytesIO
+
+from telegram import Message
+from telegram.error import BadRequest
+
+from src.database import SessionLocal
+from src.services.telegram_file_cache_service import (
+    compute_render_hash,
+    get_cached_file_id,
+    save_file_id,
+    forget_file_id,
+)
+from src.utils.logger_config import app_logger as logger
+
+
+# =========================
+# Acceso a DB (fuera del event loop)
+# =========================
+
+def _lookup(render_hash: str) -> str | None:
+    db = SessionLocal()
+    try:
+        return get_cached_file_id(db, render_hash)
+    finally:
+        db.close()
+
+
+def _store(render_hash: str, file_id: str, kind: str, file_unique_id: str | None) -> None:
+    db = SessionLocal()
+    try:
+        save_file_id(db, render_hash, file_id, kind, file_unique_id)
+    finally:
+        db.close()
+
+
+def _forget(render_hash: str) -> None:
+    db = SessionLocal()
+    try:
+        forget_file_id(db, render_hash)
+    finally:
+        db.close()
+
+
+# =========================
+# Envío con cache de file_id
+# =========================
+
+async def send_cached_photo(
+    message: Message,
+    image: BytesIO | bytes,
+    caption: str | None = None,
+    kind: str = "card",
+    filename: str = "card.png",
+) -> Message:
+    """
+    Envía una imagen reutilizando el file_id de Telegram si esa misma imagen
+    (mismo render_hash) ya se subió antes. Si no, la sube y guarda el file_id.
+
+    Un fallo del cache nunca impide el envío: en el peor caso se sube la imagen.
+    """
+    render_hash = compute_render_hash(image)
+
+    try:
+        file_id = await asyncio.to_thread(_lookup, render_hash)
+    except Exception as e:
+        logger.warning(f"No se pudo leer el cache de file_id: {e}")
+        file_id = None
+
+    # ♻️ Reenvío por file_id
+    if file_id:
+        try:
+            return await message.reply_photo(photo=file_id, caption=caption)
+        except BadRequest as e:
+            logger.warning(f"file_id inválido para {render_hash[:12]}, se vuelve a subir: {e}")
+            await asyncio.to_thread(_forget, render_hash)
+
+    # ⬆️ Subida completa
+    if isinstance(image, bytes):
+        image = BytesIO(image)
+        image.name = filename
+    image.seek(0)
+
+    sent = await message.reply_photo(photo=image, caption=caption)
+
+    if sent.photo:
+        largest = sent.photo[-1]
+        try:
+            await asyncio.to_thread(_store, render_hash, largest.file_id, kind, largest.file_unique_id)
+        except Exception as e:
+            logger.warning(f"No se pudo guardar el file_id en cache: {e}")
+
+    return sent
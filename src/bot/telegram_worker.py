@@ -1,19 +1,26 @@
 # src/bot/telegram_worker.py
 import asyncio
-from datetime import datetime
+from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
+from src.config import settings
 from src.database import SessionLocal
 from src.models import Notification
 from src.bot.telegram_sender import TelegramNotificationSender
 from src.utils.logger_config import app_logger as logger
 from src.notification.notification_dispatcher import dispatch_pending_notifications
+from src.services.archive_service import archive_old_rows, get_archive_metrics
+from src.services.photo_store_service import collect_photo_garbage
 
 async def notification_worker(sender: TelegramNotificationSender, poll_interval: float = 30.0):
     """
     Worker que revisa notificaciones 'pending' y 'ready'.
     1️⃣ Pasa 'pending' a 'ready' usando el dispatcher
     2️⃣ Envía las notificaciones 'ready' al usuario
+    3️⃣ Cada ARCHIVE_INTERVAL_HOURS archiva lo viejo (notifications / replies)
+       y borra las fotos sin referencias
     """
+    last_archive_at: datetime | None = None
+
     while True:
         db: Session = SessionLocal()
         try:
@@ -21,7 +28,7 @@ async def notification_worker(sender: TelegramNotificationSender, poll_interval:
             # 1️⃣ Pasar pending -> ready
             # =========================
             try:
-                processed = dispatch_pending_notifications(db, now=datetime.utcnow())
+                processed = await asyncio.to_thread(dispatch_pending_notifications, db, now=datetime.utcnow())
                 if processed:
                     logger.info(f"Dispatcher: {processed} notificaciones marcadas como 'ready'")
             except Exception as e:
@@ -30,7 +37,12 @@ async def notification_worker(sender: TelegramNotificationSender, poll_interval:
             # =========================
             # 2️⃣ Enviar notificaciones 'ready'
             # =========================
-            ready_notifications = db.query(Notification).filter(Notification.status == "ready").all()
+            ready_notifications = (
+                db.query(Notification)
+                .filter(Notification.status == "ready")
+                .order_by(Notification.available_at)
+                .all()
+            )
 
             for notification in ready_notifications:
                 try:
@@ -42,6 +54,25 @@ async def notification_worker(sender: TelegramNotificationSender, poll_interval:
                     notification.status = "failed"
                     db.commit()
 
+            # =========================
+            # 3️⃣ Archivado periódico
+            # =========================
+            now = datetime.utcnow()
+            archive_interval = timedelta(hours=settings.ARCHIVE_INTERVAL_HOURS)
+            if last_archive_at is None or now - last_archive_at >= archive_interval:
+                last_archive_at = now
+                try:
+                    await asyncio.to_thread(archive_old_rows, db, now=now)
+                    logger.info(f"Métricas de archivado: {get_archive_metrics(db)}")
+                except Exception as e:
+                    logger.exception(f"Error en archivado: {e}")
+                    db.rollback()
+                try:
+                    await asyncio.to_thread(collect_photo_garbage, db)
+                except Exception as e:
+                    logger.exception(f"Error en GC de fotos: {e}")
+                    db.rollback()
+
         finally:
             db.close()
 
@@ -16,19 +16,22 @@ def get_base_dir() -> Path:
 BASE_DIR = get_base_dir()
 
 # =========================
-# Cargar .env de forma estricta
+# Cargar .env
 # =========================
+# El ejecutable (PyInstaller) exige el .env junto al .exe. Corriendo desde
+# el código (api/bot/worker por separado, tests, contenedores) el .env es
+# opcional y alcanza con las variables de entorno del proceso.
 ENV_PATH = Path(".env")
 
-if not ENV_PATH.exists():
+if ENV_PATH.exists():
+    if not load_dotenv(dotenv_path=ENV_PATH):
+        print("❌ ERROR: No se pudo cargar el archivo .env")
+        sys.exit(1)
+elif getattr(sys, "frozen", False):
     print("❌ ERROR: Archivo .env no encontrado")
     print("👉 Debe existir un archivo .env junto al ejecutable")
     sys.exit(1)
 
-if not load_dotenv(dotenv_path=ENV_PATH):
-    print("❌ ERROR: No se pudo cargar el archivo .env")
-    sys.exit(1)
-
 class Settings:
     # =========================
     # Database
@@ -48,12 +51,41 @@ class Settings:
     # =========================
     TELEGRAM_TOKEN = os.getenv("TELEGRAM_TOKEN")
 
+    # polling (desarrollo) | webhook (producción, comparte el server de la API)
+    TELEGRAM_MODE: str = os.getenv("TELEGRAM_MODE", "polling").lower()
+    TELEGRAM_WEBHOOK_URL: str | None = os.getenv("TELEGRAM_WEBHOOK_URL")  # URL pública base, ej: https://maxio.example.com
+    TELEGRAM_WEBHOOK_PATH: str = os.getenv("TELEGRAM_WEBHOOK_PATH", "/telegram/webhook")
+    # Obligatorio en modo webhook: Telegram lo manda en cada update y el
+    # router rechaza lo que no lo trae (sin él cualquiera podría postear updates)
+    TELEGRAM_WEBHOOK_SECRET: str = os.getenv("TELEGRAM_WEBHOOK_SECRET", "")
+
+    # false = el worker de notificaciones corre aparte (python -m src.run_worker)
+    NOTIFICATION_WORKER_EMBEDDED = os.getenv("NOTIFICATION_WORKER_EMBEDDED", "true").lower() == "true"
+
     # =========================
     # API
     # =========================
     API_BASE_URL: str = os.getenv("API_BASE_URL", "http://127.0.0.1:8000")
     API_BASE_PATH: str = os.getenv("API_BASE_PATH", "/maxio")
 
+    # Workers de uvicorn en modo supervisor (python -m src.run_supervisor)
+    API_WORKERS = int(os.getenv("API_WORKERS", "1"))
+    # Cada cuánto el bot / worker líder revisa que su advisory lock siga
+    # tomado (leader_service). Si se cortó la conexión deja de procesar
+    LEADER_CHECK_SECONDS = float(os.getenv("LEADER_CHECK_SECONDS", "15"))
+
+    # Executors de las rutas (src/utils/executors.py). El de DB no debería
+    # superar el pool de SQLAlchemy (5 + 10 de overflow por defecto)
+    DB_EXECUTOR_WORKERS = int(os.getenv("DB_EXECUTOR_WORKERS", "10"))
+    RENDER_EXECUTOR_WORKERS = int(os.getenv("RENDER_EXECUTOR_WORKERS", "2"))
+
+    # Fotos de jugador (src/services/photo_upload_service.py, photo_store_service.py)
+    PHOTO_MAX_BYTES = int(os.getenv("PHOTO_MAX_BYTES", str(5 * 1024 * 1024)))
+    PHOTO_MAX_PIXELS = int(os.getenv("PHOTO_MAX_PIXELS", str(25_000_000)))
+    PHOTO_THUMBNAIL_SIZE = int(os.getenv("PHOTO_THUMBNAIL_SIZE", "768"))
+    # Margen antes de borrar una foto sin referencias (un re-upload la reaprovecha)
+    PHOTO_GC_GRACE_HOURS = float(os.getenv("PHOTO_GC_GRACE_HOURS", "24"))
+
     # =========================
     # Paths (todos desde BASE_DIR)
     # =========================
@@ -73,6 +105,31 @@ class Settings:
     # Others
     # =========================
     MATCH_RESULT_TIMEOUT_HOURS = 24
+    # Suma el voto al match apenas llega el reply (si no, lo hace el dispatcher)
+    MATCH_RESULT_APPLY_IMMEDIATELY = os.getenv("MATCH_RESULT_APPLY_IMMEDIATELY", "true").lower() == "true"
+
+    # =========================
+    # Archivado (notifications / match_result_replies)
+    # =========================
+    ARCHIVE_RETENTION_DAYS = int(os.getenv("ARCHIVE_RETENTION_DAYS", "30"))
+    ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))
+    ARCHIVE_INTERVAL_HOURS = float(os.getenv("ARCHIVE_INTERVAL_HOURS", "6"))
+    ARCHIVE_DRY_RUN = os.getenv("ARCHIVE_DRY_RUN", "false").lower() == "true"
+
+    # =========================
+    # Caches en memoria
+    # =========================
+    IDENTITY_CACHE_TTL_SECONDS = float(os.getenv("IDENTITY_CACHE_TTL_SECONDS", "300"))
+    PLAYER_RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("PLAYER_RESPONSE_CACHE_TTL_SECONDS", "300"))
+    PERMISSION_CACHE_TTL_SECONDS = float(os.getenv("PERMISSION_CACHE_TTL_SECONDS", "300"))
+    # Versión de token por usuario (auth_service). Un logout en otro proceso
+    # se ve por CACHE_SYNC_INTERVAL_SECONDS, no hace falta esperar el TTL
+    TOKEN_VERSION_CACHE_TTL_SECONDS = float(os.getenv("TOKEN_VERSION_CACHE_TTL_SECONDS", "30"))
+    # Cada cuánto cada proceso mira si otro invalidó respuestas, permisos o
+    # versiones de token (cache_sync_service). Es lo máximo que dura un dato
+    # viejo con varios workers o el bot en otro proceso. 0 = no sincronizar
+    # (un solo proceso)
+    CACHE_SYNC_INTERVAL_SECONDS = float(os.getenv("CACHE_SYNC_INTERVAL_SECONDS", "2"))
 
     @property
     def api_root(self) -> str:
@@ -82,5 +139,13 @@ class Settings:
     def api_root_login(self) -> str:
         return self.API_BASE_URL.rstrip('/')
 
+    @property
+    def telegram_webhook_enabled(self) -> bool:
+        return self.TELEGRAM_MODE == "webhook"
+
+    @property
+    def telegram_webhook_full_url(self) -> str:
+        return f"{(self.TELEGRAM_WEBHOOK_URL or '').rstrip('/')}{self.TELEGRAM_WEBHOOK_PATH}"
+
 
 settings = Settings()
@@ -1,5 +1,5 @@
 # src/database.py
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.orm import sessionmaker, declarative_base, Session
 from src.config import settings
 from src.utils.logger_config import app_logger as logger
@@ -10,10 +10,46 @@ Base = declarative_base()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 def init_db():
-    import src.models
-    logger.info("Creando tablas en la base de datos (si no existen)...")
-    Base.metadata.create_all(bind=engine)
-    logger.info("Tablas creadas correctamente.")
+    # Solo toca el schema si cambiaron los modelos (ver startup_service)
+    from src.services.startup_service import ensure_schema
+    ensure_schema()
+
+def ensure_columns():
+    """
+    Igual que ensure_indexes pero para columnas: agrega a las tablas
+    existentes las columnas nuevas de los modelos (ALTER TABLE ADD COLUMN).
+    Las columnas NOT NULL necesitan server_default para poder agregarse.
+    """
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                ddl = f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column.type.compile(engine.dialect)}'
+                if column.server_default is not None:
+                    default = column.server_default.arg
+                    if isinstance(default, str):
+                        default = f"'{default}'"
+                    else:
+                        default = default.compile(dialect=engine.dialect)
+                    ddl += f" DEFAULT {default}"
+                    if not column.nullable:
+                        ddl += " NOT NULL"
+                conn.execute(text(ddl))
+                logger.info(f"Columna agregada: {table.name}.{column.name}")
+
+def ensure_indexes():
+    """
+    create_all no toca tablas que ya existen, así que los índices nuevos
+    declarados en los modelos se crean acá (si no existen).
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
 
 # Esta es la función que FastAPI usará para inyectar la sesión en cada endpoint
 def get_db():
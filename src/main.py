@@ -6,10 +6,11 @@ from fastapi import FastAPI
 from src.api_clients import notifications_api
 from src.database import init_db, SessionLocal
 from src.utils.logger_config import app_logger as logger
-from src.routers import user_router, player_router, match_router, auth_router
-from src.utils.init_bots import create_bot_players
-from src.utils.seed_initial_data import seed_users_and_players, seed_player_relations
-from src.bot.telegram_bot import run_bot
+from src.config import settings
+from src.routers import user_router, player_router, match_router, auth_router, telegram_router
+from src.services.startup_service import run_startup_seed
+from src.services.leader_service import exclusive, STARTUP_LOCK
+from src.utils.executors import shutdown_executors
 
 app = FastAPI()
 
@@ -21,37 +22,50 @@ app.include_router(user_router.router, prefix="/maxio")
 app.include_router(player_router.router, prefix="/player")
 app.include_router(match_router.router, prefix="/match")
 app.include_router(notifications_api.router, prefix="/notifications")
+app.include_router(telegram_router.router)
 
 @app.get("/maxio")
 def home():
     return {"message": "API corriendo correctamente"}
 
 # =========================
-# Startup logic (NO BOT)
+# Startup logic
 # =========================
 @app.on_event("startup")
 async def startup_event():
-    db = SessionLocal()
-    try:
-        create_bot_players(db)
-        seed_users_and_players(db)
-        seed_player_relations(db)
-    finally:
-        db.close()
+    # Con varios workers (src.run_supervisor) el seed corre de a uno: el
+    # primero seedea y los demás encuentran la marca al día
+    with exclusive("startup_seed", STARTUP_LOCK):
+        db = SessionLocal()
+        try:
+            # Una fila de app_state_markers: si la versión coincide no se seedea
+            run_startup_seed(db)
+        finally:
+            db.close()
+
+    # En modo webhook el bot vive en este mismo event loop
+    if settings.telegram_webhook_enabled:
+        from src.bot.telegram_bot import start_webhook_bot
+        await start_webhook_bot()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    if settings.telegram_webhook_enabled:
+        from src.bot.telegram_bot import stop_webhook_bot
+        await stop_webhook_bot()
+
+    shutdown_executors()
 
 # =========================
-# Main entrypoint
+# Entrypoints
 # =========================
-def main():
-    logger.info("Inicializando base de datos...")
-    init_db()
-
-    logger.info("Iniciando bot de Telegram...")
-    bot_thread = threading.Thread(
-        target=run_bot,
-        daemon=True
-    )
-    bot_thread.start()
+# El bot de Telegram (python-telegram-bot) se importa solo donde se usa, así
+# la API sola y los tests no lo cargan. Ver también src/run_api.py,
+# src/run_bot.py y src/run_worker.py para correr cada parte por separado.
+def run_api(init_database: bool = True):
+    if init_database:
+        logger.info("Inicializando base de datos...")
+        init_db()
 
     logger.info("Levantando servidor FastAPI...")
     try:
@@ -64,5 +78,27 @@ def main():
     except KeyboardInterrupt:
         logger.info("Maxio detenido manualmente")
 
+def main():
+    """
+    Todo en un proceso (ejecutable / desarrollo): API + bot en polling.
+    """
+    # Antes de arrancar el bot: sus primeras consultas no pueden llegar
+    # antes de que existan las tablas
+    logger.info("Inicializando base de datos...")
+    init_db()
+
+    # En modo polling el bot corre en su propio thread (desarrollo)
+    if not settings.telegram_webhook_enabled:
+        from src.bot.telegram_bot import run_bot
+
+        logger.info("Iniciando bot de Telegram (polling)...")
+        bot_thread = threading.Thread(
+            target=run_bot,
+            daemon=True
+        )
+        bot_thread.start()
+
+    run_api(init_database=False)
+
 if __name__ == "__main__":
     main()
@@ -1,8 +1,13 @@
 from .user import User
 from .player import Player
+from .player_ranking import PlayerRanking
 from .team import *
 from .match import *
 from .telegram_identity import *
+from .telegram_file_cache import TelegramFileCache
+from .photo_blob import PhotoBlob
 from .notification import Notification
 from .match_result_reply import MatchResultReply
-from .player_evaluation import PlayerEvaluationPermission
\ No newline at end of file
+from .player_evaluation import PlayerEvaluationPermission
+from .archive import NotificationArchive, MatchResultReplyArchive
+from .app_state import AppStateMarker, CacheGeneration
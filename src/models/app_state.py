@@ -0,0 +1,43 @@
+from sqlalchemy import (
+    Column,
+    String,
+    DateTime,
+    BigInteger
+)
+from sqlalchemy.sql import func
+
+from src.database import Base
+
+
+class AppStateMarker(Base):
+    """
+    Marcas de versión del arranque: una fila por tarea ("schema", "seed")
+    con el fingerprint con el que se corrió por última vez. Si al arrancar
+    el fingerprint coincide, la tarea se saltea.
+    """
+    __tablename__ = "app_state_markers"
+
+    key = Column(String(32), primary_key=True)
+
+    # sha256 hex de lo que se aplicó (modelos, datos iniciales, ...)
+    version = Column(String(64), nullable=False)
+
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<AppStateMarker key={self.key} version={self.version[:12]}>"
+
+
+class CacheGeneration(Base):
+    """
+    Contador por cache en memoria compartido entre procesos (ver
+    src/services/cache_sync_service.py): cada invalidación lo incrementa y
+    los demás procesos vacían su copia cuando ven que cambió.
+    """
+    __tablename__ = "cache_generations"
+
+    name = Column(String(32), primary_key=True)
+    generation = Column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<CacheGeneration name={self.name} generation={self.generation}>"
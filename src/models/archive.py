@@ -0,0 +1,58 @@
+# src/models/archive.py
+
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    Boolean,
+    DateTime,
+    JSON,
+    func
+)
+
+from src.database import Base
+
+
+"""
+Tablas de archivo (frías) para notifications y match_result_replies.
+
+Reflejan las columnas de las tablas calientes más archived_at. No tienen
+foreign keys: el histórico tiene que sobrevivir aunque se borre un usuario
+o un match. Las filas las mueve src/services/archive_service.py.
+"""
+
+
+class NotificationArchive(Base):
+    __tablename__ = "notifications_archive"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, nullable=False, index=True)
+
+    event_type = Column(String, nullable=False)
+    channel = Column(String, nullable=False)
+    status = Column(String, nullable=True)
+
+    payload = Column(JSON, nullable=False)
+
+    attempts = Column(Integer, nullable=True)
+
+    available_at = Column(DateTime, nullable=False)
+    created_at = Column(DateTime, nullable=True)
+    sent_at = Column(DateTime, nullable=True)
+
+    archived_at = Column(DateTime, server_default=func.now(), nullable=False)
+
+
+class MatchResultReplyArchive(Base):
+    __tablename__ = "match_result_replies_archive"
+
+    id = Column(Integer, primary_key=True)
+    match_id = Column(Integer, nullable=False, index=True)
+    user_id = Column(Integer, nullable=False)
+    pending = Column(Boolean, nullable=True)
+
+    result = Column(String, nullable=False)
+
+    replied_at = Column(DateTime, nullable=True)
+
+    archived_at = Column(DateTime, server_default=func.now(), nullable=False)
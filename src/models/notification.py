@@ -7,7 +7,9 @@ from sqlalchemy import (
     Boolean,
     DateTime,
     ForeignKey,
-    JSON, func
+    JSON, func,
+    Index,
+    text
 )
 
 from sqlalchemy.orm import relationship
@@ -41,3 +43,14 @@ class Notification(Base):
     sent_at = Column(DateTime, nullable=True)
 
     user = relationship("User", lazy="joined")
+
+    # Índice parcial para el dispatcher/worker: solo indexa las filas vivas
+    # ('pending' / 'ready'), así no crece con el histórico de enviadas.
+    __table_args__ = (
+        Index(
+            "ix_notifications_dispatch",
+            "status",
+            "available_at",
+            postgresql_where=text("status IN ('pending', 'ready')"),
+        ),
+    )
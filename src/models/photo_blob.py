@@ -0,0 +1,34 @@
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    DateTime
+)
+from sqlalchemy.sql import func
+
+from src.database import Base
+
+
+class PhotoBlob(Base):
+    """
+    Foto guardada por contenido: una fila (y un archivo) por sha256, la
+    compartan cuantos jugadores la compartan. ref_count cuenta cuántos
+    players.photo_path apuntan a esta key; con 0 el GC la puede borrar.
+    """
+    __tablename__ = "photo_blobs"
+
+    # sha256 hex de los bytes del archivo
+    hash = Column(String(64), primary_key=True)
+
+    # Ruta relativa a API_PHOTO_PLAYER_PATH_FOLDER (lo que se guarda en players.photo_path)
+    key = Column(String(255), unique=True, nullable=False)
+
+    size = Column(Integer, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)
+
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    # Última vez que cambió ref_count: el GC deja un margen desde acá
+    updated_at = Column(DateTime, server_default=func.now(), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<PhotoBlob hash={self.hash[:12]} refs={self.ref_count}>"
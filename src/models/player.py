@@ -1,11 +1,11 @@
 # src/models/player.py
 
-from sqlalchemy import Column, Integer, Float,String, ForeignKey, UniqueConstraint, Boolean, or_, case, func, desc
+from sqlalchemy import Column, Integer, Float,String, ForeignKey, UniqueConstraint, Index, Boolean, or_, case, func, desc, select, union_all, text
 from sqlalchemy.orm import Session, aliased
 
 from sqlalchemy.orm import relationship
 from src.database import Base
-from sqlalchemy.dialects.postgresql import ARRAY as PG_ARRAY  # Solo si usás PostgreSQL
+from src.utils.recent_results import encode_recent_results, decode_recent_results
 
 
 
@@ -21,13 +21,97 @@ class PlayerRelation(Base):
     games_apart = Column(Integer, default=0, nullable=False)      # equipos contrarios
 
     # Para evitar duplicados cruzados (ej: (1,2) y (2,1))
+    # La unique (player1_id, player2_id) sirve para buscar por player1_id;
+    # player2_id necesita su propio índice para las búsquedas del otro lado.
     __table_args__ = (
         UniqueConstraint("player1_id", "player2_id", name="uq_player_relation"),
+        Index("ix_player_relations_player2_id", "player2_id", "player1_id"),
     )
 
     player1 = relationship("Player", foreign_keys=[player1_id], back_populates="relations_as_player1")
     player2 = relationship("Player", foreign_keys=[player2_id], back_populates="relations_as_player2")
 
+    # Criterios de orden para los top-N
+    ORDER_FIELDS = ("games_together", "games_apart", "total_games")
+
+    @classmethod
+    def directed(cls, player_ids: list[int]):
+        """
+        Subquery con las relaciones vistas desde cada jugador de player_ids:
+        (owner_id, other_id, games_together, games_apart, total_games).
+
+        Cada relación se guarda una sola vez (player1_id < player2_id), así
+        que se arma con dos ramas (una por lado) unidas con UNION ALL.
+        """
+        def _side(owner_col, other_col):
+            return select(
+                owner_col.label("owner_id"),
+                other_col.label("other_id"),
+                cls.games_together.label("games_together"),
+                cls.games_apart.label("games_apart"),
+                (cls.games_together + cls.games_apart).label("total_games"),
+            ).where(owner_col.in_(player_ids))
+
+        return union_all(
+            _side(cls.player1_id, cls.player2_id),
+            _side(cls.player2_id, cls.player1_id),
+        ).subquery("directed_relations")
+
+    @classmethod
+    def top_related(
+        cls,
+        db: Session,
+        player_ids: list[int],
+        order_by: str = "total_games",
+        limit: int = 5,
+        exclude_bots: bool = False,
+    ) -> dict[int, list[tuple["Player", int]]]:
+        """
+        Top-N de jugadores relacionados para uno o varios jugadores en una
+        sola query: join a players, filtro de bots en SQL y row_number()
+        por jugador, así cada lista trae exactamente N (si existen).
+
+        Retorna {player_id: [(Player, games), ...]} con una entrada por
+        cada id pedido (lista vacía si no tiene relaciones).
+        """
+        if order_by not in cls.ORDER_FIELDS:
+            raise ValueError(f"order_by inválido: '{order_by}'")
+
+        player_ids = list(dict.fromkeys(player_ids))
+        result: dict[int, list[tuple[Player, int]]] = {pid: [] for pid in player_ids}
+        if not player_ids:
+            return result
+
+        relations = cls.directed(player_ids)
+        games = relations.c[order_by]
+
+        ranked = (
+            select(
+                Player,
+                relations.c.owner_id,
+                games.label("games"),
+                func.row_number().over(
+                    partition_by=relations.c.owner_id,
+                    order_by=(games.desc(), relations.c.other_id),
+                ).label("position"),
+            )
+            .join(relations, relations.c.other_id == Player.id)
+        )
+        if exclude_bots:
+            ranked = ranked.where(Player.is_bot.is_(False))
+        ranked = ranked.subquery()
+        Other = aliased(Player, ranked)
+
+        rows = db.execute(
+            select(ranked.c.owner_id, Other, ranked.c.games)
+            .where(ranked.c.position <= limit)
+            .order_by(ranked.c.owner_id, ranked.c.position)
+        ).all()
+
+        for owner_id, other, games_count in rows:
+            result[owner_id].append((other, games_count))
+        return result
+
 
 def update_player_relation(
     db: Session,
@@ -66,9 +150,10 @@ class Player(Base):
     cant_partidos_ganados = Column(Integer, default=0)
     is_bot = Column(Boolean, default=False)
 
-    # Guardar los últimos 10 resultados como True (victoria) o False (derrota)
-    # Esto funciona solo si usás PostgreSQL
-    recent_results = Column(PG_ARRAY(Boolean), default=[])
+    # Últimos 10 resultados como bitmask (bit 0 = el más reciente, 1 = victoria)
+    # + cuántos hay. Ver src/utils/recent_results.py
+    recent_results_bits = Column(Integer, default=0, server_default=text("0"), nullable=False)
+    recent_results_len = Column(Integer, default=0, server_default=text("0"), nullable=False)
 
     # ELO general que afecta crecimiento de stats
     elo = Column(Integer, default=1000)  # Conviene arrancar con 1000 como base
@@ -85,6 +170,11 @@ class Player(Base):
 
     photo_path = Column(String, nullable=True)
 
+    # Búsqueda de usernames sin distinguir mayúsculas (lower(name) = ...)
+    __table_args__ = (
+        Index("ix_players_name_lower", func.lower(name)),
+    )
+
 
     # Relaciones desde Player hacia PlayerRelation (sin usar backref ahora)
     relations_as_player1 = relationship(
@@ -124,101 +214,26 @@ class Player(Base):
     def all_relationships(self):
         return self.relations_as_player1 + self.relations_as_player2
 
-    def parse_recent_results(recent: str) -> list[bool]:
-        return [c == "1" for c in recent]
+    @property
+    def recent_results(self) -> list[bool]:
+        """
+        Últimos resultados como lista (más viejo → más nuevo).
+        """
+        return decode_recent_results(self.recent_results_bits, self.recent_results_len)
 
-    def serialize_recent_results(results: list[bool]) -> str:
-        return ''.join(['1' if r else '0' for r in results])
+    @recent_results.setter
+    def recent_results(self, results: list[bool] | None) -> None:
+        self.recent_results_bits, self.recent_results_len = encode_recent_results(results)
 
 
     def top_teammates(self, db: Session, limit: int = 5, exclude_bots: bool = False):
-        relations = db.query(
-            case(
-                (PlayerRelation.player1_id == self.id, PlayerRelation.player2_id),
-                else_=PlayerRelation.player1_id
-            ).label("other_id"),
-            PlayerRelation.games_together + PlayerRelation.games_apart
-        ).filter(
-            or_(
-                PlayerRelation.player1_id == self.id,
-                PlayerRelation.player2_id == self.id
-            )
-        ).order_by(
-            (PlayerRelation.games_together + PlayerRelation.games_apart).desc()
-        ).limit(limit * 2).all()  # usamos *2 para poder filtrar después
-
-        result = []
-        for other_id, total_games in relations:
-            other_player = db.get(Player, other_id)
-            if exclude_bots and other_player.is_bot:
-                continue
-            result.append((other_player, total_games))
-            if len(result) >= limit:
-                break
-        return result
+        return PlayerRelation.top_related(db, [self.id], "total_games", limit, exclude_bots)[self.id]
 
     def top_allies(self, db: Session, limit: int = 3, exclude_bots: bool = False):
-        # Definimos "other_id" como el ID del aliado
-        other_id = case(
-            (PlayerRelation.player1_id == self.id, PlayerRelation.player2_id),
-            else_=PlayerRelation.player1_id
-        ).label("other_id")
-
-        # Hacemos la consulta con agregación de la suma de games_together
-        results = (
-            db.query(
-                other_id,
-                func.sum(PlayerRelation.games_together).label("total_games")
-            )
-            .filter(
-                or_(
-                    PlayerRelation.player1_id == self.id,
-                    PlayerRelation.player2_id == self.id
-                )
-            )
-            .group_by(other_id)
-            .order_by(func.sum(PlayerRelation.games_together).desc())
-            .limit(limit)
-            .all()
-        )
-
-        allies = []
-        for ally_id, total_games in results:
-            ally = db.get(Player, ally_id)
-            if exclude_bots and ally.is_bot:
-                continue
-            allies.append((ally, total_games))
-        return allies
+        return PlayerRelation.top_related(db, [self.id], "games_together", limit, exclude_bots)[self.id]
 
     def top_opponents(self, db: Session, limit: int = 3, exclude_bots: bool = False):
-        # Alias para la tabla Player, para que se entienda que es el oponente
-        Opponent = aliased(Player)
-
-        # Creamos una subquery que calcula el id del "otro jugador" y los juegos separados
-        subquery = db.query(
-            case(
-                (PlayerRelation.player1_id == self.id, PlayerRelation.player2_id),
-                else_=PlayerRelation.player1_id
-            ).label("other_id"),
-            PlayerRelation.games_apart.label("games")
-        ).filter(
-            or_(
-                PlayerRelation.player1_id == self.id,
-                PlayerRelation.player2_id == self.id
-            )
-        ).subquery()
-
-        # Hacemos join con Player para obtener los datos del oponente
-        query = db.query(Opponent, subquery.c.games).join(
-            subquery, Opponent.id == subquery.c.other_id
-        )
-
-        if exclude_bots:
-            query = query.filter(Opponent.is_bot.is_(False))
-
-        query = query.order_by(desc(subquery.c.games)).limit(limit)
-
-        return query.all()  # Devuelve [(Player, games), ...]
+        return PlayerRelation.top_related(db, [self.id], "games_apart", limit, exclude_bots)[self.id]
 
     def get_relation_with(self, other_id: int) -> PlayerRelation | None:
         for r in self.all_relationships:
@@ -0,0 +1,56 @@
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    Boolean,
+    Float,
+    DateTime,
+    ForeignKey,
+    Index
+)
+from sqlalchemy.sql import func
+
+from src.database import Base
+
+
+class PlayerRanking(Base):
+    """
+    Copia desnormalizada de los datos de ranking de cada jugador.
+
+    Se mantiene al día desde src/services/ranking_service.py cada vez que
+    cambia el ELO, los partidos o los stats de un jugador. Cada columna
+    ordenable tiene su índice (valor, player_id) para paginar por keyset
+    sin ordenar la tabla completa.
+    """
+    __tablename__ = "player_rankings"
+
+    player_id = Column(Integer, ForeignKey("players.id", ondelete="CASCADE"), primary_key=True)
+    name = Column(String, nullable=False)
+    is_bot = Column(Boolean, nullable=False, default=False)
+
+    elo = Column(Integer, nullable=False, default=1000)
+    cant_partidos = Column(Integer, nullable=False, default=0)
+    cant_partidos_ganados = Column(Integer, nullable=False, default=0)
+    win_rate = Column(Float, nullable=False, default=0)
+
+    #stats
+    tiro = Column(Float, nullable=False)
+    ritmo = Column(Float, nullable=False)
+    fisico = Column(Float, nullable=False)
+    defensa = Column(Float, nullable=False)
+    aura = Column(Float, nullable=False)
+
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_player_rankings_elo", "elo", "player_id"),
+        Index("ix_player_rankings_win_rate", "win_rate", "player_id"),
+        Index("ix_player_rankings_tiro", "tiro", "player_id"),
+        Index("ix_player_rankings_ritmo", "ritmo", "player_id"),
+        Index("ix_player_rankings_fisico", "fisico", "player_id"),
+        Index("ix_player_rankings_defensa", "defensa", "player_id"),
+        Index("ix_player_rankings_aura", "aura", "player_id"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<PlayerRanking player_id={self.player_id} elo={self.elo}>"
@@ -0,0 +1,34 @@
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    DateTime
+)
+from sqlalchemy.sql import func
+
+from src.database import Base
+
+
+class TelegramFileCache(Base):
+    """
+    Relaciona el hash de una imagen generada (carta de jugador / match)
+    con el file_id que devolvió Telegram la primera vez que se subió.
+    Reenviar el file_id evita volver a subir los bytes.
+    """
+    __tablename__ = "telegram_file_cache"
+
+    id = Column(Integer, primary_key=True)
+
+    # sha256 hex de los bytes PNG
+    render_hash = Column(String(64), unique=True, nullable=False, index=True)
+
+    kind = Column(String(32), nullable=False)  # player_card, match_card, ...
+
+    file_id = Column(String(255), nullable=False)
+    file_unique_id = Column(String(64), nullable=True)
+
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    last_used_at = Column(DateTime, server_default=func.now(), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<TelegramFileCache kind={self.kind} render_hash={self.render_hash[:12]}>"
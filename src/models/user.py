@@ -1,6 +1,6 @@
 # src/models/user.py
 
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Integer, String, text
 from sqlalchemy.orm import validates, relationship
 from ..database import Base
 import bcrypt
@@ -14,6 +14,10 @@ class User(Base):
     password = Column(String(255), nullable=False)  # encriptada
     password_test = Column(String(255), nullable=False)  # encriptada
 
+    # Va dentro del JWT: subirla invalida todos los tokens emitidos antes
+    # (logout / cambio de password, ver auth_service.revoke_user_tokens)
+    token_version = Column(Integer, default=0, server_default=text("0"), nullable=False)
+
     player = relationship("Player", back_populates="user", uselist=False, cascade="all, delete-orphan")
 
     def set_password(self, plain_password: str):
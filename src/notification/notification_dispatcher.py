@@ -1,6 +1,6 @@
 # src/notification/notification_dispatcher.py
 from datetime import datetime
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only, selectinload
 from src.models import Notification
 from src.notification.notification_rules import can_send_notification
 from src.utils.logger_config import app_logger as logger
@@ -38,16 +38,7 @@ def dispatch_pending_notifications(
     # ==========================
     # 3. Despachar notificaciones
     # ==========================
-    notifications = (
-        db.query(Notification)
-        .filter(
-            Notification.status == "pending",
-            Notification.available_at <= now,
-        )
-        .order_by(Notification.available_at)
-        .limit(limit)
-        .all()
-    )
+    notifications = get_dispatchable_notifications(db, now=now, limit=limit)
 
     processed = 0
 
@@ -61,3 +52,40 @@ def dispatch_pending_notifications(
 
     logger.info(f"Dispatch finalizado. Notificaciones procesadas: {processed}")
     return processed
+
+
+def get_dispatchable_notifications(
+    db: Session,
+    now: datetime,
+    limit: int = 50
+) -> list[Notification]:
+    """
+    Trae las notificaciones 'pending' listas para evaluar.
+
+    - Usa el índice parcial ix_notifications_dispatch (status, available_at).
+    - Proyecta solo las columnas que usan las reglas.
+    - Los usuarios se cargan aparte en un único SELECT ... IN (selectinload),
+      en lugar del JOIN contra users que haría lazy="joined".
+    """
+    return (
+        db.query(Notification)
+        .options(
+            load_only(
+                Notification.id,
+                Notification.user_id,
+                Notification.event_type,
+                Notification.channel,
+                Notification.status,
+                Notification.payload,
+                Notification.available_at,
+            ),
+            selectinload(Notification.user),
+        )
+        .filter(
+            Notification.status == "pending",
+            Notification.available_at <= now,
+        )
+        .order_by(Notification.available_at)
+        .limit(limit)
+        .all()
+    )
@@ -1,7 +1,9 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from src.schemas.auth_schema import LoginRequest, TokenResponse
-from src.services.auth_service import authenticate_user, create_access_token
+from src.models import User
+from src.schemas.auth_schema import LoginRequest, TokenResponse, ChangePasswordRequest
+from src.services.auth_service import authenticate_user, create_user_token, get_authenticated_user, \
+    get_current_user, revoke_user_tokens, change_password, AuthenticatedUser
 from src.database import get_db  # suponiendo que tenés esta dependencia
 
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -9,5 +11,21 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 @router.post("/login", response_model=TokenResponse)
 def login(login_data: LoginRequest, db: Session = Depends(get_db)):
     user = authenticate_user(db, login_data.username, login_data.password)
-    token = create_access_token({"sub": user.username})
+    token = create_user_token(user)
     return TokenResponse(access_token=token)
+
+@router.post("/logout")
+def logout(auth: AuthenticatedUser = Depends(get_authenticated_user), db: Session = Depends(get_db)):
+    # Invalida este token y cualquier otro emitido antes para el usuario
+    revoke_user_tokens(db, auth.id)
+    return {"message": "Sesión cerrada"}
+
+@router.post("/change-password", response_model=TokenResponse)
+def update_password(
+    data: ChangePasswordRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    change_password(db, current_user, data.current_password, data.new_password)
+    # Los tokens anteriores quedan revocados: se devuelve uno nuevo
+    return TokenResponse(access_token=create_user_token(current_user))
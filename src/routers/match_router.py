@@ -8,7 +8,7 @@ from src.database import get_db
 from src.models import User,Match, Team, Player, MatchPlayer, TeamEnum
 from src.schemas.match_schema import MatchCreate, MatchResponse, PlayerResponse, MatchReportResponse
 from src.schemas.team_schema import TeamResponse
-from src.services.auth_service import get_current_user
+from src.services.auth_service import get_authenticated_user, AuthenticatedUser
 from src.services.match_service import create_match, assign_team_to_match, assign_player_to_match, \
     get_match_balance_report, generate_teams_for_match, generate_match_card
 from pydantic import BaseModel
@@ -17,6 +17,7 @@ from src.utils.balance_teams import balance_teams
 from sqlalchemy import select, update
 from sqlalchemy.sql import text
 from collections import defaultdict
+from src.utils.executors import run_db, run_render
 from src.utils.logger_config import app_logger as logger
 
 router = APIRouter()
@@ -24,30 +25,40 @@ router = APIRouter()
 class MessageResponse(BaseModel):
     message: str
 
+# Las rutas son async y mandan el trabajo bloqueante a su executor
+# (src/utils/executors.py): run_db para queries, run_render para la carta.
+# Los ORM se pasan a schema dentro del executor para que la serialización
+# no dispare lazy loads en el event loop.
+
 @router.post("/matches", response_model=MatchResponse, tags=["matches"])
-def create_new_match(
+async def create_new_match(
     match_data: MatchCreate,
     db: Session = Depends(get_db)
 ):
     """
     Crea un nuevo match con la fecha y cantidad máxima de jugadores.
     """
+    def _create():
+        return MatchResponse.model_validate(create_match(match_data, db), from_attributes=True)
+
     try:
-        match = create_match(match_data, db)
-        return match
+        return await run_db(_create)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.post("/matches/{match_id}/players/{player_id}", tags=["matches"],status_code=status.HTTP_200_OK)
-def add_player_to_match(match_id: int, player_id: int, team: Optional[TeamEnum] = None,db: Session = Depends(get_db)):
-    match = db.get(Match, match_id)
-    player = db.get(Player, player_id)
+async def add_player_to_match(match_id: int, player_id: int, team: Optional[TeamEnum] = None,db: Session = Depends(get_db)):
+    def _assign():
+        match = db.get(Match, match_id)
+        player = db.get(Player, player_id)
+
+        if not match or not player:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Match o Player no encontrado")
 
-    if not match or not player:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Match o Player no encontrado")
+        return assign_player_to_match(db, match, player, team=team)
 
-    success = assign_player_to_match(db, match, player, team=team)
+    success = await run_db(_assign)
 
     if not success:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No se pudo asignar el jugador al match")
@@ -55,7 +66,7 @@ def add_player_to_match(match_id: int, player_id: int, team: Optional[TeamEnum]
     return {"message": "Jugador asignado exitosamente"}
 
 @router.post("/matches/{match_id}/teams/{team_id}", response_model=MessageResponse, tags=["matches"])
-def assign_team(
+async def assign_team(
     match_id: int,
     team_id: int,
     db: Session = Depends(get_db)
@@ -63,14 +74,17 @@ def assign_team(
     """
     Asigna un team a un match verificando que existan y cumplan condiciones.
     """
-    match = db.query(Match).filter(Match.id == match_id).first()
-    team = db.query(Team).filter(Team.id == team_id).first()
+    def _assign():
+        match = db.query(Match).filter(Match.id == match_id).first()
+        team = db.query(Team).filter(Team.id == team_id).first()
 
-    if not match or not team:
-        raise HTTPException(status_code=404, detail="Match o Team no encontrado")
+        if not match or not team:
+            raise HTTPException(status_code=404, detail="Match o Team no encontrado")
 
-    try:
         assign_team_to_match(team, match, db)
+
+    try:
+        await run_db(_assign)
         return {"message": "Team asignado correctamente al match"}
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -78,13 +92,15 @@ def assign_team(
 
 
 @router.post("/matches/{match_id}/generate-teams", tags=["matches"], response_model=MatchResponse)
-def generate_teams(match_id: int,
+async def generate_teams(match_id: int,
                    db: Session = Depends(get_db),
-                   current_user: User = Depends(get_current_user)
+                   current_user: AuthenticatedUser = Depends(get_authenticated_user)
                    ):
+    def _generate():
+        return MatchResponse.model_validate(generate_teams_for_match(match_id, db), from_attributes=True)
 
     try:
-        return generate_teams_for_match(match_id, db)
+        return await run_db(_generate)
     except HTTPException as e:
         raise e
     except ValueError as e:
@@ -95,8 +111,7 @@ def generate_teams(match_id: int,
         logging.exception(f"Error inesperado en /generate-teams: {e}")
         raise HTTPException(status_code=500, detail="Error interno del servidor")
 
-@router.post("/matches/{match_id}/balance-report", tags=["matches"], response_model=MatchReportResponse)
-def match_balance_report(match_id: int, db: Session = Depends(get_db)):
+def _match_exists(match_id: int, db: Session) -> bool:
     match = db.query(Match).options(
         joinedload(Match.team1).joinedload(Team.players),
         joinedload(Match.team2).joinedload(Team.players)
@@ -105,10 +120,16 @@ def match_balance_report(match_id: int, db: Session = Depends(get_db)):
     if not match:
         #print(f"Match con id={match_id} no encontrado")
         logger.error(f"Match con id={match_id} no encontrado")
+        return False
+    return True
+
+@router.post("/matches/{match_id}/balance-report", tags=["matches"], response_model=MatchReportResponse)
+async def match_balance_report(match_id: int, db: Session = Depends(get_db)):
+    if not await run_db(_match_exists, match_id, db):
         raise HTTPException(status_code=404, detail="Match no encontrado")
 
     try:
-        res = get_match_balance_report(match_id,db)
+        res = await run_db(get_match_balance_report, match_id, db)
         logger.info(res)
 
         return res
@@ -117,19 +138,12 @@ def match_balance_report(match_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail="Error interno al generar el reporte")
 
 @router.post("/matches/{match_id}/match-card", tags=["matches"], response_model=MatchReportResponse)
-def match_card(match_id: int, db: Session = Depends(get_db)):
-    match = db.query(Match).options(
-        joinedload(Match.team1).joinedload(Team.players),
-        joinedload(Match.team2).joinedload(Team.players)
-    ).filter(Match.id == match_id).first()
-
-    if not match:
-        #print(f"Match con id={match_id} no encontrado")
-        logger.error(f"Match con id={match_id} no encontrado")
+async def match_card(match_id: int, db: Session = Depends(get_db)):
+    if not await run_db(_match_exists, match_id, db):
         raise HTTPException(status_code=404, detail="Match no encontrado")
 
     try:
-        buffer = generate_match_card(match_id,db)
+        buffer = await run_render(generate_match_card, match_id, db)
         buffer.seek(0)
 
         return StreamingResponse(
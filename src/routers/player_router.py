@@ -1,31 +1,116 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi import UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi import UploadFile, File, BackgroundTasks
 
 from fastapi.responses import StreamingResponse
 
 from sqlalchemy.orm import Session
 
 from src.schemas.player_full_profile_schema import FullPlayerInfo
-from src.schemas.player_schema import PlayerResponse, PlayerStatsUpdate, RelatedPlayerResponse
+from src.schemas.player_schema import PlayerResponse, PlayerStatsUpdate, RelatedPlayerResponse, PlayerRankingPage, \
+    PlayerStatsBatchRequest, PlayerStatsBatchResponse, PlayerResolveRequest, PlayerResolveResponse
 from src.services.player_service import get_player_by_username, update_player_stats, generate_player_card, \
-    save_player_photo, build_full_player_profile
+    set_player_photo, build_full_player_profile, get_top_related_players, update_player_stats_batch, \
+    resolve_players
+from src.services.ranking_service import get_rankings
+from src.services.player_response_cache import CachedResponse, get_or_build_response
+from src.services.photo_upload_service import PhotoUploadError, save_photo_upload, generate_photo_thumbnail
+from src.services.photo_store_service import delete_photo_files
 from src.database import get_db
-from typing import List
+from src.utils.executors import run_db, run_render
+from typing import Dict, List, Optional
 
 router = APIRouter()
 
+# Las rutas son async y mandan el trabajo bloqueante a su executor
+# (src/utils/executors.py): run_db para queries, run_render para las cartas.
+
+# ⚠️ Tiene que ir antes de /{username} para que "rankings" no se tome como username
+@router.get("/rankings", response_model=PlayerRankingPage, tags=["players"])
+async def read_rankings(
+    sort_by: str = Query("elo"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
+    exclude_bots: bool = Query(True),
+    db: Session = Depends(get_db)
+):
+    try:
+        return await run_db(get_rankings, db, sort_by=sort_by, limit=limit, cursor=cursor, exclude_bots=exclude_bots)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/stats/batch", response_model=PlayerStatsBatchResponse, tags=["players"])
+async def set_player_stats_batch(payload: PlayerStatsBatchRequest, db: Session = Depends(get_db)):
+    """
+    Todas las evaluaciones de un jugador después de un match en un solo request.
+    Solo se aplican las que tienen PlayerEvaluationPermission.
+    """
+    try:
+        results = await run_db(
+            update_player_stats_batch,
+            evaluator_username=payload.evaluator,
+            evaluations=[(e.target, e.stats) for e in payload.evaluations],
+            db=db
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    return {
+        "evaluator": payload.evaluator,
+        "updated": sum(1 for r in results if r["status"] == "updated"),
+        "results": results,
+    }
+
+@router.get("/relations/top", response_model=Dict[str, List[RelatedPlayerResponse]], tags=["players"])
+async def read_top_related_batch(
+    usernames: List[str] = Query(..., min_length=1, max_length=50),
+    order_by: str = Query("total_games"),
+    limit: int = Query(5, ge=1, le=20),
+    exclude_bots: bool = Query(False),
+    db: Session = Depends(get_db)
+):
+    """
+    Top-N de varios jugadores en una sola query (order_by: games_together,
+    games_apart o total_games).
+    """
+    def _load():
+        top = get_top_related_players(db, usernames, order_by=order_by, limit=limit, exclude_bots=exclude_bots)
+        return {
+            username: [_related_player(p, games) for p, games in data]
+            for username, data in top.items()
+        }
+
+    try:
+        return await run_db(_load)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/resolve", response_model=PlayerResolveResponse, tags=["players"])
+async def resolve_player_list(payload: PlayerResolveRequest, db: Session = Depends(get_db)):
+    """
+    Valida un roster entero en un request: busca por username (sin distinguir
+    mayúsculas) y/o id y devuelve los encontrados y los faltantes.
+    """
+    if not payload.usernames and not payload.ids:
+        raise HTTPException(status_code=400, detail="Hay que mandar usernames o ids")
+
+    players, missing_usernames, missing_ids = await run_db(resolve_players, db, payload.usernames, payload.ids)
+    return {
+        "players": players,
+        "missing_usernames": missing_usernames,
+        "missing_ids": missing_ids,
+    }
+
 @router.get("/{username}", response_model=PlayerResponse, tags=["players"])
-def read_player(username: str, db: Session = Depends(get_db)):
+async def read_player(username: str, db: Session = Depends(get_db)):
     try:
-        player = get_player_by_username(username, db)
-        return player
+        return await run_db(get_player_by_username, username, db)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
 @router.get("/{username}/card", tags=["players"])
-def get_player_card(username: str, db: Session = Depends(get_db)):
+async def get_player_card(username: str, db: Session = Depends(get_db)):
     try:
-        buffer = generate_player_card(username, db)
+        buffer = await run_render(generate_player_card, username, db)
         buffer.seek(0)
 
         return StreamingResponse(
@@ -36,160 +121,176 @@ def get_player_card(username: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail=str(e))
 
 @router.put("/{target_username}/stats", tags=["players"])
-def set_player_stats(
+async def set_player_stats(
     target_username: str,
     evaluator_username: str,
     stats: PlayerStatsUpdate,
     db: Session = Depends(get_db)
 ):
-    try:
+    def _update():
         updated_player = update_player_stats(
             target_username=target_username,
             evaluator_username=evaluator_username,
             stats_data=stats,
             db=db
         )
-        return {"message": "Stats actualizados correctamente", "player": updated_player.name}
+        return updated_player.name  # después del commit: se lee en el executor
+
+    try:
+        name = await run_db(_update)
+        return {"message": "Stats actualizados correctamente", "player": name}
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
 
+# =========================
+# Respuestas cacheadas (ETag / If-None-Match)
+# =========================
+
+def _cached_json(request: Request, cached: CachedResponse) -> Response:
+    headers = {"ETag": cached.etag, "Cache-Control": "no-cache"}
+
+    if_none_match = request.headers.get("if-none-match", "")
+    candidates = {tag.strip() for tag in if_none_match.split(",")}
+    if cached.etag in candidates or "*" in candidates:
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=cached.body, media_type="application/json", headers=headers)
+
+
+def _profile_player_ids(profile: dict) -> set[int]:
+    ids = {profile["id"]}
+    for entries in profile["relations"].values():
+        ids.update(entry["id"] for entry in entries)
+    for match in profile["recent_matches"]:
+        ids.update(entry["id"] for entry in match["teammates"] + match["opponents"])
+    ids.update(entry["id"] for entry in profile["evaluation"]["can_evaluate"])
+    return ids
+
+
 @router.get("/{username}/profile", response_model=FullPlayerInfo)
-def get_player_profile(username: str, db: Session = Depends(get_db)):
-    try:
+async def get_player_profile(username: str, request: Request, db: Session = Depends(get_db)):
+    def _build():
         profile = build_full_player_profile(db, username)
-        return profile
+        return FullPlayerInfo.model_validate(profile), _profile_player_ids(profile)
+
+    try:
+        cached = await run_db(get_or_build_response, ("profile", username), _build)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    return _cached_json(request, cached)
 
 @router.post("/{username}/photo")
 async def upload_player_photo(
     username: str,
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     db: Session = Depends(get_db)
 ):
-    # 🛑 Validar tipo de archivo
+    # 🛑 Validar tipo de archivo (el contenido real se valida al leerlo)
     if not file.content_type or not file.content_type.startswith("image/"):
         raise HTTPException(
             status_code=400,
             detail="El archivo debe ser una imagen"
         )
 
-    # 📦 Leer bytes
-    image_bytes = await file.read()
-
-    # 🛑 Validar tamaño (5 MB)
-    MAX_SIZE = 5 * 1024 * 1024
-    if len(image_bytes) > MAX_SIZE:
-        raise HTTPException(
-            status_code=413,
-            detail="La imagen supera el tamaño máximo permitido (5MB)"
-        )
-
+    # 1️⃣ El jugador tiene que existir antes de escribir nada
     try:
-        photo_filename = save_player_photo(
-            username=username,
-            image_bytes=image_bytes,
-            filename=file.filename,
-            db=db
-        )
+        await run_db(get_player_by_username, username, db)
     except ValueError as e:
         raise HTTPException(
             status_code=404,
             detail=str(e)
         )
 
+    # 2️⃣ Copia en chunks al store por contenido (límite de tamaño, header validado)
+    try:
+        photo = await save_photo_upload(file)
+    except PhotoUploadError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+    # 3️⃣ DB en su executor. Si falla, el archivo queda sin referencias y lo
+    # borra el GC (puede ser una foto que ya usa otro jugador)
+    old_path = await run_db(set_player_photo, username, photo, db)
+
+    # 4️⃣ Miniatura y borrado de la foto anterior (formato viejo) después de responder
+    background_tasks.add_task(generate_photo_thumbnail, str(photo.path))
+    if old_path:
+        background_tasks.add_task(delete_photo_files, old_path)
+
     return {
         "username": username,
-        "photo": photo_filename,
+        "photo": photo.key,
         "message": "Foto subida correctamente"
     }
 
 
+def _related_player(p, games: int) -> RelatedPlayerResponse:
+    return RelatedPlayerResponse(
+        id=p.id,
+        name=p.name,
+        cant_partidos=p.cant_partidos,
+        elo=p.elo,
+        tiro=p.tiro,
+        ritmo=p.ritmo,
+        fisico=p.fisico,
+        defensa=p.defensa,
+        aura=p.aura,
+        games=games
+    )
+
+
+async def _related_players_response(
+    request: Request,
+    db: Session,
+    username: str,
+    relation: str,
+    limit: int,
+    exclude_bots: bool,
+) -> Response:
+    """
+    relation es el nombre del método de Player: top_teammates, top_allies o top_opponents.
+    """
+    def _build():
+        player = get_player_by_username(username, db)
+        data = getattr(player, relation)(db, limit=limit, exclude_bots=exclude_bots)
+        payload = [_related_player(p, games) for p, games in data]
+        return payload, {player.id, *(p.id for p, _ in data)}
+
+    try:
+        cached = await run_db(get_or_build_response, (relation, username, limit, exclude_bots), _build)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return _cached_json(request, cached)
+
+
 @router.get("/{username}/top_teammates", response_model=List[RelatedPlayerResponse])
-def get_top_teammates(
+async def get_top_teammates(
     username: str,
+    request: Request,
     limit: int = Query(5, ge=1, le=20),
     exclude_bots: bool = Query(False),
     db: Session = Depends(get_db)
 ):
-    try:
-        player = get_player_by_username(username, db)
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
-
-    data = player.top_teammates(db, limit=limit, exclude_bots=exclude_bots)
-    return [
-        RelatedPlayerResponse(
-            id=p.id,
-            name=p.name,
-            cant_partidos=p.cant_partidos,
-            elo=p.elo,
-            tiro=p.tiro,
-            ritmo=p.ritmo,
-            fisico=p.fisico,
-            defensa=p.defensa,
-            aura=p.aura,
-            games=games
-        )
-        for p, games in data
-    ]
+    return await _related_players_response(request, db, username, "top_teammates", limit, exclude_bots)
 
 @router.get("/{username}/top_allies", response_model=List[RelatedPlayerResponse])
-def get_top_allies(
+async def get_top_allies(
     username: str,
+    request: Request,
     limit: int = Query(3, ge=1, le=20),
     exclude_bots: bool = Query(False),
     db: Session = Depends(get_db)
 ):
-    try:
-        player = get_player_by_username(username, db)
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
-
-    data = player.top_allies(db, limit=limit, exclude_bots=exclude_bots)
-    return [
-        RelatedPlayerResponse(
-            id=p.id,
-            name=p.name,
-            cant_partidos=p.cant_partidos,
-            elo=p.elo,
-            tiro=p.tiro,
-            ritmo=p.ritmo,
-            fisico=p.fisico,
-            defensa=p.defensa,
-            aura=p.aura,
-            games=games
-        )
-        for p, games in data
-    ]
+    return await _related_players_response(request, db, username, "top_allies", limit, exclude_bots)
 
 
 @router.get("/{username}/top_opponents", response_model=List[RelatedPlayerResponse])
-def get_top_opponents(
+async def get_top_opponents(
     username: str,
+    request: Request,
     limit: int = Query(3, ge=1, le=20),
     exclude_bots: bool = Query(False),
     db: Session = Depends(get_db)
 ):
-    try:
-        player = get_player_by_username(username, db)
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
-
-    data = player.top_opponents(db, limit=limit, exclude_bots=exclude_bots)
-    return [
-        RelatedPlayerResponse(
-            id=p.id,
-            name=p.name,
-            cant_partidos=p.cant_partidos,
-            elo=p.elo,
-            tiro=p.tiro,
-            ritmo=p.ritmo,
-            fisico=p.fisico,
-            defensa=p.defensa,
-            aura=p.aura,
-            games=games
-        )
-        for p, games in data
-    ]
\ No newline at end of file
+    return await _related_players_response(request, db, username, "top_opponents", limit, exclude_bots)
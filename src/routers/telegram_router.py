@@ -0,0 +1,40 @@
+import hmac
+
+from fastapi import APIRouter, HTTPException, Request, status
+
+from src.config import settings
+from src.utils.logger_config import app_logger as logger
+
+router = APIRouter(tags=["telegram"])
+
+
+@router.post(settings.TELEGRAM_WEBHOOK_PATH, include_in_schema=False)
+async def telegram_webhook(request: Request):
+    """
+    Recibe updates de Telegram (modo webhook) y los encola en la Application.
+    Corre en el mismo event loop que la API: no hay thread ni long-polling.
+    """
+    # Siempre se compara (sin secret configurado no entra nada)
+    expected = settings.TELEGRAM_WEBHOOK_SECRET.encode()
+    received = request.headers.get("X-Telegram-Bot-Api-Secret-Token", "").encode()
+    if not expected or not hmac.compare_digest(received, expected):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Secret inválido")
+
+    # python-telegram-bot se importa recién acá: en modo polling (o en los
+    # tests) la API no carga el stack del bot
+    from telegram import Update
+    from src.bot.telegram_bot import get_telegram_app
+
+    try:
+        telegram_app = get_telegram_app()
+    except RuntimeError:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Bot no inicializado")
+
+    data = await request.json()
+    update = Update.de_json(data, telegram_app.bot)
+    if update is None:
+        logger.warning("Update de Telegram vacío o inválido")
+        return {"ok": False}
+
+    await telegram_app.update_queue.put(update)
+    return {"ok": True}
@@ -0,0 +1,14 @@
+# src/run_api.py
+"""
+Solo la API (FastAPI + uvicorn), sin el bot en polling.
+En modo webhook el bot igual vive adentro de la API (mismo event loop).
+
+Uso:
+    python -m src.run_api
+"""
+
+from src.main import run_api
+
+
+if __name__ == "__main__":
+    run_api()
@@ -0,0 +1,17 @@
+# src/run_bot.py
+"""
+Solo el bot de Telegram en modo polling. Habla con la API por HTTP, así que
+espera a que esté levantada (python -m src.run_api).
+
+Con NOTIFICATION_WORKER_EMBEDDED=false no levanta el worker de
+notificaciones (para correrlo aparte con python -m src.run_worker).
+
+Uso:
+    python -m src.run_bot
+"""
+
+from src.bot.telegram_bot import run_bot
+
+
+if __name__ == "__main__":
+    run_bot()
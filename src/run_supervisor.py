@@ -0,0 +1,108 @@
+# src/run_supervisor.py
+"""
+Modo supervisor: N workers de uvicorn para la API y un único proceso para
+el bot de Telegram (polling) + worker de notificaciones.
+
+    supervisor
+    ├── uvicorn (N workers, src.main:app)
+    └── maxio-bot (1 proceso, se reinicia si se cae)
+
+Aunque se levanten dos supervisores contra la misma base, el bot y el
+worker de notificaciones corren una sola vez: cada uno toma un advisory
+lock (src/services/leader_service.py) y el resto queda en espera.
+
+En modo webhook los updates de Telegram llegan a la API y el bot tiene que
+vivir en el mismo proceso que los recibe, así que ahí solo se admite un
+worker.
+
+Los caches en memoria son por proceso. Respuestas de jugador, permisos de
+evaluación y versiones de token se sincronizan por la base
+(src/services/cache_sync_service.py): un cambio hecho en un worker o en el
+bot (ej: un logout) vale en los demás en a lo sumo
+CACHE_SYNC_INTERVAL_SECONDS. Las identidades de Telegram vencen por TTL
+(IDENTITY_CACHE_TTL_SECONDS).
+
+Uso:
+    python -m src.run_supervisor --workers 4
+"""
+
+import argparse
+import multiprocessing
+import sys
+import threading
+
+import uvicorn
+
+from src.config import settings
+from src.database import init_db
+from src.utils.logger_config import app_logger as logger
+
+
+def _bot_process() -> None:
+    from src.bot.telegram_bot import run_bot
+    run_bot()
+
+
+def _keep_bot_alive(stop: threading.Event, restart_seconds: float) -> None:
+    """
+    Mantiene vivo el proceso del bot. Se usa spawn (no fork) para que el
+    hijo no herede las conexiones del pool del padre.
+    """
+    context = multiprocessing.get_context("spawn")
+    process = None
+
+    while not stop.is_set():
+        if process is None or not process.is_alive():
+            if process is not None:
+                logger.warning(f"El proceso del bot terminó (exit={process.exitcode}), reiniciando...")
+            process = context.Process(target=_bot_process, name="maxio-bot", daemon=True)
+            process.start()
+            logger.info(f"Proceso del bot iniciado (pid={process.pid})")
+        stop.wait(restart_seconds)
+
+    if process is not None and process.is_alive():
+        process.terminate()
+        process.join(timeout=10)
+
+
+def main(workers: int, host: str, port: int, restart_seconds: float) -> None:
+    if settings.telegram_webhook_enabled and workers > 1:
+        logger.error("En modo webhook el bot vive dentro de la API: usar --workers 1 o TELEGRAM_MODE=polling")
+        sys.exit(1)
+
+    logger.info("Inicializando base de datos...")
+    init_db()
+
+    # 1️⃣ Bot + notificaciones en su propio proceso (solo en polling)
+    stop = threading.Event()
+    bot_thread = None
+    if not settings.telegram_webhook_enabled:
+        bot_thread = threading.Thread(target=_keep_bot_alive, args=(stop, restart_seconds), daemon=True)
+        bot_thread.start()
+
+    # 2️⃣ API con N workers (bloquea hasta Ctrl+C / SIGTERM)
+    logger.info(f"Levantando servidor FastAPI con {workers} workers...")
+    try:
+        uvicorn.run(
+            "src.main:app",
+            host=host,
+            port=port,
+            workers=workers,
+            log_level="info"
+        )
+    finally:
+        stop.set()
+        if bot_thread is not None:
+            bot_thread.join(timeout=15)
+        logger.info("Supervisor detenido")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=settings.API_WORKERS)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--restart-seconds", type=float, default=5.0, help="cada cuánto revisar si el bot sigue vivo")
+    args = parser.parse_args()
+
+    main(args.workers, args.host, args.port, args.restart_seconds)
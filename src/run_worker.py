@@ -0,0 +1,17 @@
+# src/run_worker.py
+"""
+Solo el worker de notificaciones (dispatcher + envíos + archivado), sin
+handlers del bot ni la API. Usar con NOTIFICATION_WORKER_EMBEDDED=false en
+la API / el bot para no tener dos workers mandando lo mismo.
+
+Uso:
+    python -m src.run_worker
+"""
+
+import asyncio
+
+from src.bot.telegram_bot import run_notification_worker
+
+
+if __name__ == "__main__":
+    asyncio.run(run_notification_worker())
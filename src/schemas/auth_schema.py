@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, constr
 
 class LoginRequest(BaseModel):
     username: str
@@ -7,3 +7,7 @@ class LoginRequest(BaseModel):
 class TokenResponse(BaseModel):
     access_token: str
     token_type: str = "bearer"
+
+class ChangePasswordRequest(BaseModel):
+    current_password: str
+    new_password: constr(min_length=6)
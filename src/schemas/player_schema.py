@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Optional, List, Dict, Literal
 from sqlalchemy import Float
 
 from pydantic import BaseModel, Field, ConfigDict
@@ -30,3 +30,54 @@ class RelatedPlayerResponse(PlayerResponse):
     games: int  # puede representar partidos totales, juntos o en contra
 
 
+
+
+class PlayerRankingItem(BaseModel):
+    player_id: int
+    name: str
+    elo: float
+    cant_partidos: int
+    cant_partidos_ganados: int
+    win_rate: float
+    tiro: float
+    ritmo: float
+    fisico: float
+    defensa: float
+    aura: float
+
+    class Config:
+        model_config = ConfigDict(from_attributes=True)
+
+class PlayerRankingPage(BaseModel):
+    sort_by: str
+    items: List[PlayerRankingItem]
+    next_cursor: Optional[str] = None  # None = no hay más páginas
+
+
+class PlayerStatsEvaluation(BaseModel):
+    target: str
+    stats: PlayerStatsUpdate
+
+class PlayerStatsBatchRequest(BaseModel):
+    evaluator: str
+    evaluations: List[PlayerStatsEvaluation] = Field(..., min_length=1, max_length=30)
+
+class PlayerStatsEvaluationResult(BaseModel):
+    target: str
+    status: Literal["updated", "not_found", "forbidden", "self", "duplicate"]
+    stats: Optional[Dict[str, float]] = None  # stats nuevos (solo si status = updated)
+
+class PlayerStatsBatchResponse(BaseModel):
+    evaluator: str
+    updated: int
+    results: List[PlayerStatsEvaluationResult]
+
+
+class PlayerResolveRequest(BaseModel):
+    usernames: List[str] = Field(default_factory=list, max_length=100)
+    ids: List[int] = Field(default_factory=list, max_length=100)
+
+class PlayerResolveResponse(BaseModel):
+    players: List[PlayerResponse]
+    missing_usernames: List[str]
+    missing_ids: List[int]
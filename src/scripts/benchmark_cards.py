@@ -0,0 +1,145 @@
+# src/scripts/benchmark_cards.py
+"""
+Benchmark de render de cartas (match y jugador) con datos sintéticos: no
+usa la base, las fotos son stubs generadas en una carpeta temporal.
+
+Cada escenario corre en un proceso nuevo para que el pico de RSS sea el
+suyo (ru_maxrss no baja nunca dentro de un proceso). Reporta p50/p95 de
+latencia, pico de RSS y bytes del PNG generado.
+
+Escenarios:
+    match          carta de match (reporte sintético de 5 vs 5)
+    player         carta de jugador sin foto (usa la foto por defecto)
+    player_photo   carta de jugador con foto stub y su miniatura (como en prod)
+
+Uso:
+    python -m src.scripts.benchmark_cards
+    python -m src.scripts.benchmark_cards --scenarios match --runs 50 --json bench.json
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+SCENARIOS = ("match", "player", "player_photo")
+
+
+def _build_scenario(name: str, workdir: Path) -> Callable[[], bytes]:
+    """
+    Prepara los datos del escenario y retorna una función que dibuja una
+    carta y devuelve los bytes del PNG.
+    """
+    from src.services.match_service import render_match_card
+    from src.services.player_service import generate_player_card_from_player
+    from src.services.photo_upload_service import generate_photo_thumbnail
+    from src.utils.card_samples import sample_match_report, sample_player, write_stub_photo
+
+    if name == "match":
+        report = sample_match_report()
+        return lambda: render_match_card(report).getvalue()
+
+    if name == "player":
+        player = sample_player()
+        return lambda: generate_player_card_from_player(player).getvalue()
+
+    if name == "player_photo":
+        photo = write_stub_photo(workdir)
+        generate_photo_thumbnail(str(photo))
+        player = sample_player(photo_path=str(photo))
+        return lambda: generate_player_card_from_player(player).getvalue()
+
+    raise ValueError(f"Escenario desconocido: {name}")
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _peak_rss_mb() -> float | None:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    # Linux lo reporta en KB, macOS en bytes
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def measure(name: str, runs: int, warmup: int) -> dict:
+    """
+    Corre el escenario en este proceso. La primera carta (warmup) incluye
+    la carga de templates/fuentes y no entra en los percentiles.
+    """
+    with tempfile.TemporaryDirectory(prefix="maxio-bench-") as workdir:
+        render = _build_scenario(name, Path(workdir))
+
+        started = time.perf_counter()
+        for _ in range(warmup):
+            render()
+        first_ms = (time.perf_counter() - started) * 1000 / max(warmup, 1)
+
+        timings = []
+        output = b""
+        for _ in range(runs):
+            started = time.perf_counter()
+            output = render()
+            timings.append((time.perf_counter() - started) * 1000)
+
+    peak_rss = _peak_rss_mb()
+    return {
+        "scenario": name,
+        "runs": runs,
+        "warmup_ms": round(first_ms, 1),
+        "p50_ms": round(_percentile(timings, 50), 1),
+        "p95_ms": round(_percentile(timings, 95), 1),
+        "peak_rss_mb": round(peak_rss, 1) if peak_rss is not None else None,
+        "bytes": len(output),
+    }
+
+
+def _measure_in_subprocess(name: str, runs: int, warmup: int) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-m", "src.scripts.benchmark_cards", "--child", name,
+         "--runs", str(runs), "--warmup", str(warmup)],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Falló el escenario {name}:\n{result.stderr[-2000:]}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def run(scenarios: list[str], runs: int, warmup: int, json_path: str | None = None) -> list[dict]:
+    print(f"{'escenario':<14} {'p50 ms':>8} {'p95 ms':>8} {'warmup ms':>10} {'RSS MB':>8} {'bytes':>10}")
+    results = []
+    for name in scenarios:
+        row = _measure_in_subprocess(name, runs, warmup)
+        results.append(row)
+        rss = f"{row['peak_rss_mb']:.1f}" if row["peak_rss_mb"] is not None else "-"
+        print(f"{name:<14} {row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['warmup_ms']:>10.1f} {rss:>8} {row['bytes']:>10}")
+
+    if json_path:
+        Path(json_path).write_text(json.dumps(results, indent=2))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--json", dest="json_path", help="guardar los resultados en un archivo JSON")
+    parser.add_argument("--child", choices=SCENARIOS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(args.child, args.runs, args.warmup)))
+    else:
+        run(args.scenarios, args.runs, args.warmup, args.json_path)
@@ -0,0 +1,101 @@
+# src/scripts/benchmark_imports.py
+"""
+Benchmark de tiempo de import (arranque en frío) de cada entrypoint.
+
+Corre cada módulo en un proceso nuevo con `python -X importtime`, suma el
+tiempo total y muestra los paquetes de terceros más pesados. Sirve para
+ver que la API no cargue Pillow ni python-telegram-bot, y que el worker
+no cargue los handlers del bot.
+
+Uso:
+    python -m src.scripts.benchmark_imports
+    python -m src.scripts.benchmark_imports --modules src.main src.run_api --top 15 --runs 3
+"""
+
+import argparse
+import subprocess
+import sys
+from collections import defaultdict
+
+
+DEFAULT_MODULES = [
+    "src.main",
+    "src.run_api",
+    "src.run_bot",
+    "src.run_worker",
+    "src.services.match_service",
+]
+
+# Paquetes que queremos ver si se cargan o no en cada entrypoint
+WATCHED = ("PIL", "telegram", "src.bot", "src.services.match_service_image", "src.services.player_service_image")
+
+
+def _importtime(module: str) -> list[tuple[int, str]]:
+    """
+    (self_us, nombre) de cada import, en un proceso nuevo.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"No se pudo importar {module}:\n{result.stderr[-2000:]}")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        # "import time:  self | cumulative | nombre"
+        self_us, _, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        rows.append((int(self_us), name))
+    return rows
+
+
+def _measure(module: str, runs: int) -> tuple[float, dict[str, float], set[str]]:
+    """
+    Mejor total (ms) de N corridas, ms propios por paquete top-level y
+    paquetes vigilados que se cargaron.
+    """
+    best_total = None
+    best_packages: dict[str, float] = {}
+    loaded: set[str] = set()
+
+    for _ in range(runs):
+        rows = _importtime(module)
+        total = sum(us for us, _ in rows) / 1000
+
+        packages = defaultdict(float)
+        for us, name in rows:
+            packages[name.split(".")[0] if not name.startswith("src.") else ".".join(name.split(".")[:2])] += us / 1000
+
+        if best_total is None or total < best_total:
+            best_total = total
+            best_packages = dict(packages)
+        loaded = {w for w in WATCHED for _, name in rows if name == w or name.startswith(w + ".")}
+
+    return best_total, best_packages, loaded
+
+
+def run(modules: list[str], top: int, runs: int) -> None:
+    print(f"{'módulo':<30} {'total ms':>10}  cargados")
+    details = {}
+    for module in modules:
+        total, packages, loaded = _measure(module, runs)
+        details[module] = packages
+        print(f"{module:<30} {total:>10.1f}  {', '.join(sorted(loaded)) or '-'}")
+
+    for module, packages in details.items():
+        print(f"\n{module} — top {top} por paquete (ms propios)")
+        for name, ms in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]:
+            print(f"    {name:<40} {ms:>8.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modules", nargs="+", default=DEFAULT_MODULES)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--runs", type=int, default=3, help="se queda con la corrida más rápida")
+    args = parser.parse_args()
+
+    run(args.modules, args.top, args.runs)
@@ -0,0 +1,127 @@
+# src/scripts/benchmark_player_relations.py
+"""
+Benchmark de búsquedas en player_relations "desde cualquier lado".
+
+Arma una tabla TEMPORAL con la misma forma que player_relations (no toca
+datos reales), la llena con N pares sintéticos y mide:
+
+    - OR:        WHERE player1_id = X OR player2_id = X
+    - UNION ALL: una rama por lado (lo que usa PlayerRelation.directed)
+
+primero solo con la unique (player1_id, player2_id) y después agregando
+el índice (player2_id, player1_id).
+
+Uso:
+    python -m src.scripts.benchmark_player_relations --pairs 1000000
+"""
+
+import argparse
+import random
+import time
+
+from sqlalchemy import text
+
+from src.database import engine
+
+
+OR_QUERY = text("""
+    SELECT player1_id, player2_id, games_together, games_apart
+    FROM bench_player_relations
+    WHERE player1_id = :pid OR player2_id = :pid
+""")
+
+UNION_QUERY = text("""
+    SELECT player2_id AS other_id, games_together, games_apart
+    FROM bench_player_relations WHERE player1_id = :pid
+    UNION ALL
+    SELECT player1_id AS other_id, games_together, games_apart
+    FROM bench_player_relations WHERE player2_id = :pid
+""")
+
+
+def _create_table(conn, pairs: int, per_player: int) -> int:
+    """
+    Crea y llena la tabla temporal. Cada jugador i se relaciona con
+    i+1 .. i+per_player, así cada uno aparece de los dos lados.
+    Retorna la cantidad de jugadores.
+    """
+    players = max(pairs // per_player, 2)
+
+    conn.execute(text("""
+        CREATE TEMP TABLE bench_player_relations (
+            id SERIAL PRIMARY KEY,
+            player1_id INTEGER NOT NULL,
+            player2_id INTEGER NOT NULL,
+            games_together INTEGER NOT NULL DEFAULT 0,
+            games_apart INTEGER NOT NULL DEFAULT 0,
+            CONSTRAINT bench_uq_player_relation UNIQUE (player1_id, player2_id)
+        ) ON COMMIT PRESERVE ROWS
+    """))
+
+    conn.execute(
+        text("""
+            INSERT INTO bench_player_relations (player1_id, player2_id, games_together, games_apart)
+            SELECT p, p + k, (random() * 20)::int, (random() * 20)::int
+            FROM generate_series(1, :players) AS p,
+                 generate_series(1, :per_player) AS k
+            LIMIT :pairs
+        """),
+        {"players": players, "per_player": per_player, "pairs": pairs},
+    )
+    conn.execute(text("ANALYZE bench_player_relations"))
+    return players
+
+
+def _measure(conn, query, player_ids: list[int]) -> float:
+    """
+    Promedio en ms por búsqueda (después de una pasada de calentamiento).
+    """
+    for pid in player_ids[:10]:
+        conn.execute(query, {"pid": pid}).all()
+
+    start = time.perf_counter()
+    for pid in player_ids:
+        conn.execute(query, {"pid": pid}).all()
+    return (time.perf_counter() - start) * 1000 / len(player_ids)
+
+
+def _plan(conn, query, pid: int) -> str:
+    rows = conn.execute(text(f"EXPLAIN {query.text}"), {"pid": pid}).scalars().all()
+    return rows[0].strip()
+
+
+def run(pairs: int, per_player: int, lookups: int) -> None:
+    with engine.connect() as conn:
+        print(f"Generando {pairs:,} pares...")
+        start = time.perf_counter()
+        players = _create_table(conn, pairs, per_player)
+        conn.commit()
+        print(f"Listo en {time.perf_counter() - start:.1f}s ({players:,} jugadores)\n")
+
+        sample = random.sample(range(1, players + 1), min(lookups, players))
+
+        print(f"{'índices':<28} {'query':<10} {'ms/búsqueda':>12}  plan")
+        for label in ("unique(p1, p2)", "+ (player2_id, player1_id)"):
+            if label.startswith("+"):
+                conn.execute(text(
+                    "CREATE INDEX bench_ix_player2_id ON bench_player_relations (player2_id, player1_id)"
+                ))
+                conn.execute(text("ANALYZE bench_player_relations"))
+                conn.commit()
+
+            for name, query in (("OR", OR_QUERY), ("UNION ALL", UNION_QUERY)):
+                ms = _measure(conn, query, sample)
+                print(f"{label:<28} {name:<10} {ms:>12.3f}  {_plan(conn, query, sample[0])}")
+
+        conn.execute(text("DROP TABLE bench_player_relations"))
+        conn.commit()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pairs", type=int, default=1_000_000)
+    parser.add_argument("--per-player", type=int, default=10)
+    parser.add_argument("--lookups", type=int, default=200)
+    args = parser.parse_args()
+
+    run(args.pairs, args.per_player, args.lookups)
@@ -0,0 +1,37 @@
+# src/scripts/gc_photos.py
+"""
+Limpieza del store de fotos por contenido: borra las fotos sin referencias
+(pasado PHOTO_GC_GRACE_HOURS), archivos huérfanos y .part abandonados.
+Con --migrate antes pasa las fotos del formato viejo al store.
+
+El worker de notificaciones ya lo corre junto con el archivado periódico;
+esto es para correrlo a mano.
+
+Uso:
+    python -m src.scripts.gc_photos --dry-run
+    python -m src.scripts.gc_photos --migrate --grace-hours 0
+"""
+
+import argparse
+
+from src.database import SessionLocal
+from src.services.photo_store_service import collect_photo_garbage, migrate_legacy_photos
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="Solo muestra qué se borraría")
+    parser.add_argument("--grace-hours", type=float, default=None, help="Default: PHOTO_GC_GRACE_HOURS")
+    parser.add_argument("--migrate", action="store_true", help="Migrar antes las fotos del formato viejo")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.migrate and not args.dry_run:
+            print(f"{'migrated':>16}: {migrate_legacy_photos(db)}")
+        summary = collect_photo_garbage(db, grace_hours=args.grace_hours, dry_run=args.dry_run)
+    finally:
+        db.close()
+
+    for key, value in summary.items():
+        print(f"{key:>16}: {value}")
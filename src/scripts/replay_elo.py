@@ -0,0 +1,30 @@
+# src/scripts/replay_elo.py
+"""
+Recalcula ELO, partidos y resultados recientes de todos los jugadores
+re-jugando el historial de matches cerrados.
+
+Uso:
+    python -m src.scripts.replay_elo --dry-run
+    python -m src.scripts.replay_elo
+"""
+
+import argparse
+
+from src.database import SessionLocal
+from src.services.elo_replay_service import replay_elo
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="Solo muestra cuántos jugadores cambiarían")
+    parser.add_argument("--batch-size", type=int, default=1_000, help="Filas por UPDATE")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        summary = replay_elo(db, dry_run=args.dry_run, update_batch_size=args.batch_size)
+    finally:
+        db.close()
+
+    for key, value in summary.items():
+        print(f"{key:>16}: {value}")
@@ -0,0 +1,214 @@
+# src/services/archive_service.py
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, delete, insert, func, text
+from sqlalchemy.orm import Session
+
+from src.config import settings
+from src.models import Notification, MatchResultReply, Match
+from src.models.archive import NotificationArchive, MatchResultReplyArchive
+from src.utils.logger_config import app_logger as logger
+
+
+NOTIFICATION_COLUMNS = [
+    "id", "user_id", "event_type", "channel", "status",
+    "payload", "attempts", "available_at", "created_at", "sent_at",
+]
+
+REPLY_COLUMNS = [
+    "id", "match_id", "user_id", "pending", "result", "replied_at",
+]
+
+ARCHIVED_TABLES = [
+    "notifications",
+    "notifications_archive",
+    "match_result_replies",
+    "match_result_replies_archive",
+]
+
+
+# =========================
+# Condiciones de archivado
+# =========================
+
+def _archivable_notifications(cutoff: datetime):
+    """
+    Notificaciones ya terminadas ('sent' / 'failed') más viejas que cutoff.
+    Las 'pending' y 'ready' nunca se tocan.
+    """
+    reference_date = func.coalesce(
+        Notification.sent_at,
+        Notification.created_at,
+        Notification.available_at,
+    )
+    return [
+        Notification.status.in_(["sent", "failed"]),
+        reference_date < cutoff,
+    ]
+
+
+def _archivable_replies(cutoff: datetime):
+    """
+    Replies ya procesados (pending = False) de matches cerrados.
+    Si el match sigue abierto el reply se queda: la UniqueConstraint
+    (match_id, user_id) es la que evita el doble voto.
+    """
+    closed_matches = select(Match.id).where(Match.winner_team_id.is_not(None))
+    return [
+        MatchResultReply.pending.is_(False),
+        MatchResultReply.replied_at < cutoff,
+        MatchResultReply.match_id.in_(closed_matches),
+    ]
+
+
+# =========================
+# Movimiento por lotes
+# =========================
+
+def _move_batch(db: Session, source, archive, columns: list[str], conditions, batch_size: int) -> int:
+    """
+    Mueve hasta batch_size filas en una sola sentencia:
+
+        WITH moved AS (
+            DELETE FROM source WHERE id IN (
+                SELECT id ... LIMIT n FOR UPDATE SKIP LOCKED
+            ) RETURNING ...
+        )
+        INSERT INTO archive (...) SELECT ... FROM moved
+    """
+    source_table = source.__table__
+
+    candidates = (
+        select(source_table.c.id)
+        .where(*conditions)
+        .order_by(source_table.c.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+
+    moved = (
+        delete(source_table)
+        .where(source_table.c.id.in_(candidates))
+        .returning(*[source_table.c[c] for c in columns])
+        .cte("moved")
+    )
+
+    stmt = insert(archive.__table__).from_select(
+        columns,
+        select(*[moved.c[c] for c in columns]),
+    ).returning(archive.__table__.c.id)
+
+    moved_ids = db.execute(stmt).scalars().all()
+    db.commit()
+    return len(moved_ids)
+
+
+def _archive_table(
+    db: Session,
+    source,
+    archive,
+    columns: list[str],
+    conditions,
+    batch_size: int,
+    max_batches: int | None,
+    dry_run: bool,
+) -> int:
+    if dry_run:
+        return db.scalar(
+            select(func.count()).select_from(source).where(*conditions)
+        ) or 0
+
+    total = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        moved = _move_batch(db, source, archive, columns, conditions, batch_size)
+        total += moved
+        batches += 1
+        if moved < batch_size:
+            break
+    return total
+
+
+def archive_old_rows(
+    db: Session,
+    now: datetime | None = None,
+    retention_days: int | None = None,
+    batch_size: int | None = None,
+    max_batches: int | None = None,
+    dry_run: bool | None = None,
+) -> dict:
+    """
+    Mueve a las tablas *_archive las notificaciones enviadas y los
+    MatchResultReply procesados más viejos que la ventana de retención.
+
+    Cada lote es una transacción corta, así el dispatcher y el sender no
+    quedan bloqueados. Con dry_run=True solo cuenta lo que se movería.
+
+    Retorna un dict con la cantidad de filas (movidas o candidatas) por tabla.
+    """
+    now = now or datetime.utcnow()
+    retention_days = settings.ARCHIVE_RETENTION_DAYS if retention_days is None else retention_days
+    batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+    dry_run = settings.ARCHIVE_DRY_RUN if dry_run is None else dry_run
+
+    cutoff = now - timedelta(days=retention_days)
+
+    notifications = _archive_table(
+        db,
+        Notification,
+        NotificationArchive,
+        NOTIFICATION_COLUMNS,
+        _archivable_notifications(cutoff),
+        batch_size,
+        max_batches,
+        dry_run,
+    )
+
+    replies = _archive_table(
+        db,
+        MatchResultReply,
+        MatchResultReplyArchive,
+        REPLY_COLUMNS,
+        _archivable_replies(cutoff),
+        batch_size,
+        max_batches,
+        dry_run,
+    )
+
+    summary = {
+        "dry_run": dry_run,
+        "cutoff": cutoff.isoformat(),
+        "notifications": notifications,
+        "match_result_replies": replies,
+    }
+
+    action = "candidatas" if dry_run else "archivadas"
+    logger.info(
+        f"Archivado ({action}): notifications={notifications}, "
+        f"match_result_replies={replies}, cutoff={cutoff.isoformat()}"
+    )
+    return summary
+
+
+# =========================
+# Métricas
+# =========================
+
+def get_archive_metrics(db: Session) -> dict:
+    """
+    Devuelve filas estimadas y tamaño en disco (tabla + índices) de las
+    tablas calientes y de archivo. Usa pg_class, no hace COUNT(*).
+    """
+    rows = db.execute(
+        text(
+            "SELECT relname, reltuples::bigint, pg_total_relation_size(oid) "
+            "FROM pg_class WHERE relkind = 'r' AND relname = ANY(:names)"
+        ),
+        {"names": ARCHIVED_TABLES},
+    ).all()
+
+    return {
+        name: {"estimated_rows": max(int(estimate), 0), "total_bytes": int(size)}
+        for name, estimate, size in rows
+    }
@@ -1,12 +1,20 @@
+from dataclasses import dataclass
+
 from fastapi import HTTPException, status, Depends
 from fastapi.security import OAuth2PasswordBearer
 
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 from jose import jwt, JWTError
 from datetime import datetime, timedelta
+from src.config import settings
 from src.models import User  # ajustá el import según tu estructura
-from src.database import get_db
+from src.database import get_db, SessionLocal
 from src.schemas.auth_schema import LoginRequest  # veremos esta en el siguiente paso
+from src.services.cache_sync_service import register_shared_cache, publish_invalidation, sync_shared_caches, \
+    shared_caches_due
+from src.utils.executors import run_db
+from src.utils.ttl_cache import TTLCache
 import os
 
 SECRET_KEY = os.getenv("SECRET_KEY", "secret_dev")  # cambiá esto en producción
@@ -16,6 +24,64 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 60
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 
+# =========================
+# Versión de token por usuario
+# =========================
+# El JWT lleva el id del usuario ("uid") y su token_version ("ver"). Validar
+# un token es decodificarlo y comparar "ver" con la versión cacheada: no se
+# consulta users en cada request. Logout y cambio de password suben la
+# versión y con eso revocan todos los tokens anteriores.
+
+_token_version_cache = TTLCache(ttl_seconds=settings.TOKEN_VERSION_CACHE_TTL_SECONDS)
+# Con varios procesos un logout tiene que valer en todos (cache_sync_service)
+register_shared_cache("token_versions", _token_version_cache.clear)
+
+
+@dataclass(frozen=True)
+class AuthenticatedUser:
+    """
+    Lo que sale del token ya validado. Para los datos completos del
+    usuario usar get_current_user (hace la query).
+    """
+    id: int
+    username: str
+    token_version: int
+
+
+def _load_token_version(user_id: int) -> int | None:
+    db = SessionLocal()
+    try:
+        return db.scalar(select(User.token_version).where(User.id == user_id))
+    finally:
+        db.close()
+
+
+def revoke_user_tokens(db: Session, user_id: int) -> int | None:
+    """
+    Invalida todos los tokens emitidos para user_id. Commitea.
+    Retorna la versión nueva (None si el usuario no existe).
+    """
+    new_version = db.scalar(
+        update(User)
+        .where(User.id == user_id)
+        .values(token_version=User.token_version + 1)
+        .returning(User.token_version)
+    )
+    db.commit()
+    if new_version is not None:
+        _token_version_cache.set(user_id, new_version)
+        publish_invalidation("token_versions")
+    return new_version
+
+
+def clear_token_version_cache() -> None:
+    _token_version_cache.clear()
+
+
+# =========================
+# Login / tokens
+# =========================
+
 def authenticate_user(db: Session, username: str, password: str):
     user = db.query(User).filter(User.username == username).first()
     if not user or not user.check_password(password):
@@ -28,7 +94,26 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None):
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+def create_user_token(user: User) -> str:
+    return create_access_token({"sub": user.username, "uid": user.id, "ver": user.token_version})
+
+def change_password(db: Session, user: User, current_password: str, new_password: str) -> None:
+    if not user.check_password(current_password):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Credenciales incorrectas")
+    user.set_password(new_password)
+    db.add(user)
+    revoke_user_tokens(db, user.id)  # commitea password + versión juntos
+
+
+# =========================
+# Dependencias
+# =========================
+
+async def get_authenticated_user(token: str = Depends(oauth2_scheme)) -> AuthenticatedUser:
+    """
+    Valida el token sin abrir sesión de DB (salvo cuando la versión del
+    usuario no está en cache). Para rutas que solo necesitan saber quién es.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Token inválido o expirado",
@@ -37,12 +122,44 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
-        if username is None:
+        user_id = payload.get("uid")
+        version = payload.get("ver")
+        # Tokens de antes de uid/ver: duran 60 minutos, hay que volver a loguearse
+        if username is None or not isinstance(user_id, int) or not isinstance(version, int):
             raise credentials_exception
     except JWTError:
         raise credentials_exception
 
-    user = db.query(User).filter(User.username == username).first()
-    if user is None:
+    # A lo sumo una query por intervalo; el resto de las veces no toca la base
+    if shared_caches_due():
+        await run_db(sync_shared_caches)
+    current_version = _token_version_cache.get(user_id)
+    if current_version is None:
+        generation = _token_version_cache.generation
+        current_version = await run_db(_load_token_version, user_id)
+        if current_version is None:  # usuario borrado
+            raise credentials_exception
+        # Si mientras tanto un logout cacheó una versión más nueva, gana esa:
+        # pisarla con la leída antes reviviría los tokens revocados. Si otro
+        # proceso invalidó en el medio, lo leído no se cachea
+        current_version = _token_version_cache.set_if_absent(user_id, current_version, generation)
+
+    if version != current_version:
         raise credentials_exception
-    return user
\ No newline at end of file
+    return AuthenticatedUser(id=user_id, username=username, token_version=version)
+
+def get_current_user(
+    auth: AuthenticatedUser = Depends(get_authenticated_user),
+    db: Session = Depends(get_db),
+) -> User:
+    """
+    Usuario completo (con query). Solo para rutas que usan sus datos.
+    """
+    user = db.get(User, auth.id)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token inválido o expirado",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
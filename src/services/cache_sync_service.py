@@ -0,0 +1,113 @@
+# src/services/cache_sync_service.py
+"""
+Invalidación de caches en memoria entre procesos.
+
+Los TTLCache son por proceso: con varios workers de uvicorn
+(src.run_supervisor) o el bot en otro proceso, invalidar en uno no toca a
+los demás y el dato viejo duraba hasta el TTL. Para los caches registrados
+acá, cada invalidación además incrementa su fila en cache_generations, y
+cada proceso lee esas filas como mucho cada CACHE_SYNC_INTERVAL_SECONDS:
+si una cambió desde la última lectura, vacía ese cache entero.
+
+Costo: una query por invalidación y una por intervalo por proceso.
+"""
+
+import threading
+import time
+from typing import Callable
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from src.config import settings
+from src.database import engine
+from src.models.app_state import CacheGeneration
+from src.utils.logger_config import app_logger as logger
+
+
+_clear_callbacks: dict[str, Callable[[], None]] = {}
+_seen_generations: dict[str, int] = {}
+_last_check = 0.0
+_lock = threading.Lock()
+
+
+def _enabled() -> bool:
+    return settings.CACHE_SYNC_INTERVAL_SECONDS > 0
+
+
+def register_shared_cache(name: str, clear: Callable[[], None]) -> None:
+    """
+    Registra un cache local (por nombre) para vaciarlo cuando otro proceso
+    lo invalide.
+    """
+    _clear_callbacks[name] = clear
+
+
+def publish_invalidation(name: str) -> None:
+    """
+    Avisa a los demás procesos que el cache name cambió. Llamar después del
+    commit y de la invalidación local.
+    """
+    if not _enabled():
+        return
+
+    stmt = pg_insert(CacheGeneration).values(name=name, generation=1)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[CacheGeneration.name],
+        set_={"generation": CacheGeneration.generation + 1},
+    ).returning(CacheGeneration.generation)
+    with engine.begin() as connection:
+        generation = connection.execute(stmt).scalar_one()
+
+    with _lock:
+        # Si saltó más de uno, otro proceso también invalidó: se vacía todo
+        if generation != _seen_generations.get(name, 0) + 1:
+            _clear_callbacks[name]()
+        _seen_generations[name] = generation
+
+
+def shared_caches_due() -> bool:
+    """
+    True si sync_shared_caches va a consultar la base. Sirve para código
+    async: solo se manda a un thread cuando hace falta.
+    """
+    return _enabled() and time.monotonic() - _last_check >= settings.CACHE_SYNC_INTERVAL_SECONDS
+
+
+def sync_shared_caches() -> None:
+    """
+    Vacía los caches que otro proceso invalidó. Se llama antes de leer un
+    cache registrado; consulta la base como mucho una vez por intervalo.
+    """
+    global _last_check
+    if not _enabled():
+        return
+
+    now = time.monotonic()
+    with _lock:
+        if now - _last_check < settings.CACHE_SYNC_INTERVAL_SECONDS:
+            return
+        _last_check = now
+
+    try:
+        with engine.connect() as connection:
+            rows = connection.execute(select(CacheGeneration.name, CacheGeneration.generation)).all()
+    except Exception as e:
+        logger.warning(f"No se pudo sincronizar caches entre procesos: {e}")
+        return
+
+    with _lock:
+        for name, generation in rows:
+            if name in _clear_callbacks and _seen_generations.get(name) != generation:
+                _clear_callbacks[name]()
+                _seen_generations[name] = generation
+
+
+def reset_cache_sync() -> None:
+    """
+    Olvida las generaciones vistas (tests: la tabla se recrea en cada uno).
+    """
+    global _last_check
+    with _lock:
+        _seen_generations.clear()
+        _last_check = 0.0
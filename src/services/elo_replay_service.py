@@ -0,0 +1,161 @@
+# src/services/elo_replay_service.py
+
+import time
+from array import array
+
+from sqlalchemy import select, update, bindparam, and_, or_
+from sqlalchemy.orm import Session
+
+from src.models.match import Match, MatchPlayer, TeamEnum
+from src.models.player import Player
+from src.services.player_response_cache import clear_player_responses
+from src.services.player_service import calculate_elo_from_bits
+from src.services.ranking_service import refresh_player_rankings
+from src.utils.logger_config import app_logger as logger
+from src.utils.recent_results import push_recent_result
+
+
+# =========================
+# Replay de historial
+# =========================
+
+def _closed_match_results():
+    """
+    (match_id, player_id, won) de todos los matches cerrados, en orden
+    cronológico. won se calcula en SQL comparando el equipo con el ganador.
+    """
+    won = or_(
+        and_(MatchPlayer.team == TeamEnum.team1, Match.winner_team_id == Match.team1_id),
+        and_(MatchPlayer.team == TeamEnum.team2, Match.winner_team_id == Match.team2_id),
+    )
+    return (
+        select(Match.id, MatchPlayer.player_id, won.label("won"))
+        .join(MatchPlayer, MatchPlayer.match_id == Match.id)
+        .where(Match.winner_team_id.is_not(None), MatchPlayer.player_id.is_not(None))
+        .order_by(Match.date, Match.id)
+    )
+
+
+def replay_elo(
+    db: Session,
+    dry_run: bool = False,
+    stream_batch_size: int = 5_000,
+    update_batch_size: int = 1_000,
+) -> dict:
+    """
+    Recalcula cant_partidos, cant_partidos_ganados, recent_results y elo de
+    todos los jugadores re-jugando los matches cerrados en orden de fecha.
+
+    - El historial se lee en streaming (yield_per), sin cargar objetos ORM.
+    - El estado vive en arrays indexados por posición del jugador.
+    - El ELO se calcula con calculate_elo_from_bits, igual que en vivo,
+      así un cambio de constantes se refleja en todo el historial.
+    - Se escribe con UPDATEs por lotes (executemany).
+
+    Con dry_run=True no escribe nada y solo informa cuántos jugadores cambiarían.
+    """
+    started = time.perf_counter()
+
+    current = db.execute(
+        select(
+            Player.id,
+            Player.cant_partidos,
+            Player.cant_partidos_ganados,
+            Player.recent_results_bits,
+            Player.recent_results_len,
+            Player.elo,
+        ).order_by(Player.id)
+    ).all()
+
+    index = {row.id: i for i, row in enumerate(current)}
+    size = len(current)
+
+    played = array("i", [0]) * size
+    won_count = array("i", [0]) * size
+    bits = array("i", [0]) * size
+    length = array("i", [0]) * size
+    elo = array("i", [1000]) * size
+
+    # ─────────────────────────────
+    # Replay
+    # ─────────────────────────────
+    matches = 0
+    last_match_id = None
+    result = db.execute(
+        _closed_match_results().execution_options(yield_per=stream_batch_size)
+    )
+    for match_id, player_id, won in result:
+        if match_id != last_match_id:
+            matches += 1
+            last_match_id = match_id
+
+        i = index.get(player_id)
+        if i is None:
+            continue
+
+        won = bool(won)
+        played[i] += 1
+        won_count[i] += won
+        bits[i], length[i] = push_recent_result(bits[i], length[i], won)
+        elo[i] = calculate_elo_from_bits(played[i], won_count[i], bits[i], length[i], elo[i])
+
+    # ─────────────────────────────
+    # Diferencias
+    # ─────────────────────────────
+    changes = []
+    max_elo_delta = 0
+    for i, row in enumerate(current):
+        new_values = (played[i], won_count[i], bits[i], length[i], elo[i])
+        old_values = (
+            row.cant_partidos or 0,
+            row.cant_partidos_ganados or 0,
+            row.recent_results_bits or 0,
+            row.recent_results_len or 0,
+            row.elo if row.elo is not None else 1000,
+        )
+        if new_values == old_values:
+            continue
+        max_elo_delta = max(max_elo_delta, abs(elo[i] - old_values[4]))
+        changes.append({
+            "player_id": row.id,
+            "cant_partidos": played[i],
+            "cant_partidos_ganados": won_count[i],
+            "recent_results_bits": bits[i],
+            "recent_results_len": length[i],
+            "elo": elo[i],
+        })
+
+    # ─────────────────────────────
+    # Escritura por lotes
+    # ─────────────────────────────
+    if changes and not dry_run:
+        players = Player.__table__
+        stmt = (
+            update(players)
+            .where(players.c.id == bindparam("player_id"))
+            .values(
+                cant_partidos=bindparam("cant_partidos"),
+                cant_partidos_ganados=bindparam("cant_partidos_ganados"),
+                recent_results_bits=bindparam("recent_results_bits"),
+                recent_results_len=bindparam("recent_results_len"),
+                elo=bindparam("elo"),
+            )
+        )
+        for start in range(0, len(changes), update_batch_size):
+            db.connection().execute(stmt, changes[start:start + update_batch_size])
+        db.commit()
+
+        refresh_player_rankings(db, [c["player_id"] for c in changes])
+        clear_player_responses()
+
+    elapsed = time.perf_counter() - started
+    summary = {
+        "dry_run": dry_run,
+        "matches": matches,
+        "players": size,
+        "players_changed": len(changes),
+        "max_elo_delta": max_elo_delta,
+        "seconds": round(elapsed, 3),
+    }
+    logger.info(f"Replay de ELO: {summary}")
+    return summary
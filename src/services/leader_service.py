@@ -0,0 +1,200 @@
+# src/services/leader_service.py
+"""
+Coordinación entre procesos con advisory locks de PostgreSQL.
+
+Con varios workers de uvicorn (src.run_supervisor) hay tareas que tienen
+que correr en un solo proceso: el bot de Telegram, el worker de
+notificaciones y el seed de arranque. Cada una toma un advisory lock de
+sesión; el lock vive lo que vive la conexión, así que si el proceso líder
+se cae PostgreSQL lo libera solo y otro puede tomar el lugar.
+
+Lo mismo pasa si se corta solo la conexión (reinicio de PostgreSQL,
+idle_session_timeout, red, pgbouncer): el proceso sigue vivo pero ya no es
+líder. Por eso run_as_leader revisa el lock cada LEADER_CHECK_SECONDS y
+corta la tarea apenas lo pierde.
+"""
+
+import asyncio
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.pool import NullPool
+
+from src.config import settings
+from src.database import engine
+from src.utils.logger_config import app_logger as logger
+
+
+# Claves de los locks (bigint). Cualquier número fijo sirve mientras no choque
+# con otros advisory locks de la misma base.
+STARTUP_LOCK = 7_341_001
+BOT_LOCK = 7_341_002
+NOTIFICATION_WORKER_LOCK = 7_341_003
+
+# Las conexiones de liderazgo viven lo que vive el proceso: salen de un
+# engine sin pool para no ocupar lugares del pool de requests
+_leader_engine = create_engine(engine.url, poolclass=NullPool)
+
+
+# =========================
+# Liderazgo (lock tomado mientras viva el proceso)
+# =========================
+
+@dataclass
+class Leadership:
+    """
+    Lock de sesión tomado sobre una conexión dedicada (de _leader_engine,
+    fuera del pool de requests). Hay que mantener la referencia mientras
+    se sea líder.
+    """
+    name: str
+    key: int
+    connection: Connection
+
+    def is_alive(self) -> bool:
+        """
+        True si la conexión sigue abierta y el lock sigue siendo de su sesión.
+        """
+        if self.connection.closed:
+            return False
+        try:
+            held = self.connection.execute(text(
+                "SELECT EXISTS (SELECT 1 FROM pg_locks WHERE locktype = 'advisory' "
+                "AND pid = pg_backend_pid() AND classid = :high AND objid = :low "
+                "AND objsubid = 1 AND granted)"
+            ), {"high": self.key >> 32, "low": self.key & 0xFFFFFFFF}).scalar()
+            self.connection.commit()
+            return bool(held)
+        except Exception as e:
+            logger.warning(f"Conexión de liderazgo caída ({self.name}): {e}")
+            return False
+
+    def release(self) -> None:
+        if self.connection.closed:
+            return
+        try:
+            self.connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": self.key})
+            self.connection.commit()
+        except Exception as e:
+            # Conexión caída: PostgreSQL ya soltó el lock
+            logger.warning(f"No se pudo soltar el lock {self.name} (conexión caída): {e}")
+        finally:
+            # Sin pool: cerrar la conexión cierra la sesión de PostgreSQL
+            self.connection.close()
+        logger.info(f"Liderazgo liberado: {self.name}")
+
+
+def try_acquire_leadership(name: str, key: int) -> Leadership | None:
+    """
+    Intenta ser líder sin esperar. Retorna None si otro proceso ya lo es.
+    """
+    connection = _leader_engine.connect()
+    try:
+        acquired = connection.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": key}).scalar()
+        connection.commit()  # no dejar la conexión "idle in transaction"
+    except Exception:
+        connection.close()
+        raise
+
+    if not acquired:
+        connection.close()
+        return None
+
+    logger.info(f"Liderazgo tomado: {name}")
+    return Leadership(name=name, key=key, connection=connection)
+
+
+def wait_for_leadership(name: str, key: int, retry_seconds: float = 5.0) -> Leadership:
+    """
+    Bloquea hasta ser líder (standby en caliente): reintenta cada retry_seconds.
+    """
+    waiting = False
+    while True:
+        leadership = try_acquire_leadership(name, key)
+        if leadership is not None:
+            return leadership
+        if not waiting:
+            logger.info(f"{name}: otro proceso es líder, quedando en espera...")
+            waiting = True
+        time.sleep(retry_seconds)
+
+
+async def await_leadership(name: str, key: int, retry_seconds: float = 5.0) -> Leadership:
+    """
+    wait_for_leadership para código async: reintenta sin bloquear el event
+    loop y se puede cancelar (ej: al apagar el bot).
+    """
+    waiting = False
+    while True:
+        leadership = await asyncio.to_thread(try_acquire_leadership, name, key)
+        if leadership is not None:
+            return leadership
+        if not waiting:
+            logger.info(f"{name}: otro proceso es líder, quedando en espera...")
+            waiting = True
+        await asyncio.sleep(retry_seconds)
+
+
+async def watch_leadership(leadership: Leadership, check_seconds: float | None = None) -> None:
+    """
+    Retorna cuando este proceso deja de ser líder (revisa cada check_seconds).
+    """
+    check_seconds = settings.LEADER_CHECK_SECONDS if check_seconds is None else check_seconds
+    while True:
+        await asyncio.sleep(check_seconds)
+        if not await asyncio.to_thread(leadership.is_alive):
+            logger.warning(f"Liderazgo perdido: {leadership.name}")
+            return
+
+
+async def run_as_leader(
+    name: str,
+    key: int,
+    job: Callable[[], Awaitable[None]],
+    check_seconds: float | None = None,
+    retry_seconds: float = 5.0,
+) -> None:
+    """
+    Corre job() solo mientras este proceso sea líder: espera el lock, corre
+    job() y, si el lock se pierde, lo cancela y vuelve a esperar. Retorna
+    cuando job() termina; cancelar esta tarea cancela job() y suelta el lock.
+    """
+    while True:
+        leadership = await await_leadership(name, key, retry_seconds)
+        job_task = asyncio.create_task(job())
+        watch_task = asyncio.create_task(watch_leadership(leadership, check_seconds))
+        try:
+            await asyncio.wait({job_task, watch_task}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in (job_task, watch_task):
+                task.cancel()
+            await asyncio.gather(job_task, watch_task, return_exceptions=True)
+            await asyncio.to_thread(leadership.release)
+
+        if not job_task.cancelled():
+            return job_task.result()  # terminó solo (o con error)
+
+
+# =========================
+# Sección exclusiva (lock mientras dura el bloque)
+# =========================
+
+@contextmanager
+def exclusive(name: str, key: int):
+    """
+    Ejecuta el bloque en un solo proceso a la vez; los demás esperan.
+    Pensado para el seed de arranque con varios workers.
+    """
+    with engine.connect() as connection:
+        connection.execute(text("SELECT pg_advisory_lock(:key)"), {"key": key})
+        connection.commit()
+        try:
+            yield
+        finally:
+            connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": key})
+            connection.commit()
+            logger.debug(f"Sección exclusiva terminada: {name}")
@@ -15,12 +15,14 @@ from fastapi import HTTPException, APIRouter
 
 from typing import List, Tuple
 from sqlalchemy import select, update, insert, func, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from datetime import datetime
 
-from src.services.match_service_image import _build_match_layout, _draw_team_block, _draw_match_header, \
-    _draw_comparison_star, _draw_stat_lider, _draw_team_relations, _load_fonts
 from src.services.notification_service import create_notifications_for_users
 from src.services.player_service import calculate_elo, update_player_match_history, get_or_create_relation
+from src.services.telegram_file_cache_service import compute_render_hash
+from src.services.ranking_service import refresh_player_rankings
+from src.services.player_response_cache import invalidate_player_responses
 from src.services.team_service import get_team_relations, get_players_by_team_enum
 from src.utils.balance_teams import balance_teams, chemistry_score, team_stats_summary, STAT_NAMES, \
     calculate_balance_score, calculate_stat_diff
@@ -31,7 +33,6 @@ from src.utils.logger_config import app_logger as logger
 
 
 from io import BytesIO
-from PIL import Image, ImageDraw
 
 
 from src.config import Settings
@@ -179,6 +180,7 @@ def assign_player_to_match(db: Session, match: Match, player: Player, team: Team
         )
     )
     db.commit()
+    invalidate_player_responses([player.id])  # aparece en sus últimos partidos
     return True
 
 def generate_teams_for_match(match_id: int, db: Session) -> Match:
@@ -346,16 +348,28 @@ def fill_with_bots(db: Session, match: Match) -> Match:
     db.refresh(match)
     return match
 
-def assign_match_winner(match: Match, winning_team: Team, db: Session):
+def assign_match_winner(match: Match, winning_team: Team, db: Session) -> bool:
+    """
+    Cierra el match con winning_team y aplica ELO, historial, ranking y
+    relaciones. Retorna False (sin tocar nada) si otro proceso/thread ya lo
+    cerró: el voto, el dispatcher y run_worker pueden intentar a la vez.
+    """
     # Validar que el equipo pertenece al match
     if winning_team.id not in [match.team1_id, match.team2_id]:
         raise ValueError("El equipo no pertenece al match")
 
-    # Guardar el equipo ganador
-    match.winner_team_id = winning_team.id
-    db.add(match)
+    # 🔒 Reclamar el cierre de forma atómica: solo un llamador gana
+    claimed = db.execute(
+        update(Match)
+        .where(Match.id == match.id, Match.winner_team_id.is_(None))
+        .values(winner_team_id=winning_team.id)
+        .returning(Match.id)
+    ).scalar()
     db.commit()
     db.refresh(match)
+    if claimed is None:
+        logger.info(f"Match {match.id} ya estaba cerrado, no se aplica de nuevo")
+        return False
 
     # Obtener todos los MatchPlayer
     match_players = db.query(MatchPlayer).filter_by(match_id=match.id).all()
@@ -371,6 +385,9 @@ def assign_match_winner(match: Match, winning_team: Team, db: Session):
     for player in match.players:
         update_player_match_history(username=player.name, won=player.id in winning_ids, db=db)
 
+    # Ranking: ELO y win rate cambiaron
+    refresh_player_rankings(db, [mp.player_id for mp in match_players])
+
     # Actualizar relaciones entre jugadores
     player_list = match.players
     for i, player1 in enumerate(player_list):
@@ -381,6 +398,12 @@ def assign_match_winner(match: Match, winning_team: Team, db: Session):
             )
             get_or_create_relation(player1.id, player2.id, db=db, new_game_together=same_team)
 
+    # Respuestas cacheadas: recién después de la última escritura (historial,
+    # ranking y relaciones), si no un GET concurrente cachea datos a medias
+    invalidate_player_responses(mp.player_id for mp in match_players)
+
+    return True
+
 def get_match_balance_report(match_id: int, db: Session) -> MatchReportResponse:
     match = db.query(Match).filter(Match.id == match_id).first()
     if not match:
@@ -529,8 +552,7 @@ def try_close_match_if_ready(match: Match, db: Session, now: datetime | None = N
         # (si querés otra política, acá es donde se cambia)
         return False
 
-    assign_match_winner(match, winning_team, db)
-    return True
+    return assign_match_winner(match, winning_team, db)
 
 def set_pre_set_player_groups_for_match(match: Match, groups: List[List[Player]], db: Session) -> None:
     """
@@ -593,17 +615,9 @@ def process_pending_match_result_replies(db: Session) -> int:
         match.vote_win_team1 = match.vote_win_team1 or 0
         match.vote_win_team2 = match.vote_win_team2 or 0
 
-        if reply.result == "win":
-            if match_player.team == TeamEnum.team1:
-                match.vote_win_team1 += 1
-            elif match_player.team == TeamEnum.team2:
-                match.vote_win_team2 += 1
-        if reply.result == "loss":
-            if match_player.team == TeamEnum.team2:
-                match.vote_win_team1 += 1
-            elif match_player.team == TeamEnum.team1:
-                match.vote_win_team2 += 1
-
+        delta_team1, delta_team2 = _vote_deltas(reply.result, match_player.team)
+        match.vote_win_team1 += delta_team1
+        match.vote_win_team2 += delta_team2
 
         reply.pending = False
         processed += 1
@@ -611,12 +625,129 @@ def process_pending_match_result_replies(db: Session) -> int:
     db.commit()
     return processed
 
+def normalize_match_result(result: str) -> str:
+    """
+    El botón de Telegram manda "lose"; en DB se guarda "loss".
+    """
+    result = result.lower()
+    return "loss" if result == "lose" else result
+
+def _vote_deltas(result: str, team: TeamEnum | None) -> tuple[int, int]:
+    """
+    Traduce la respuesta de un jugador en votos (team1, team2).
+    "win" vota por su equipo, "loss" por el rival.
+    """
+    result = normalize_match_result(result)
+    if team == TeamEnum.team1:
+        return (1, 0) if result == "win" else (0, 1) if result == "loss" else (0, 0)
+    if team == TeamEnum.team2:
+        return (0, 1) if result == "win" else (1, 0) if result == "loss" else (0, 0)
+    return 0, 0
+
+def record_match_result_reply(
+    db: Session,
+    match_id: int,
+    user_id: int,
+    result: str,
+    apply_now: bool | None = None,
+) -> dict:
+    """
+    Registra la respuesta de un jugador sobre el resultado de un match.
+
+    Es idempotente: el INSERT usa ON CONFLICT (match_id, user_id) DO NOTHING,
+    así dos clicks seguidos no rompen por la UniqueConstraint.
+
+    Con apply_now=True (default: Settings.MATCH_RESULT_APPLY_IMMEDIATELY) el
+    voto se suma a Match.vote_win_team1/2 en la misma sentencia:
+
+        WITH inserted AS (
+            INSERT INTO match_result_replies ... ON CONFLICT DO NOTHING RETURNING id
+        )
+        UPDATE matches SET vote_win_teamN = coalesce(vote_win_teamN, 0) + 1
+        WHERE id = :match_id AND EXISTS (SELECT 1 FROM inserted)
+
+    y se evalúa try_close_match_if_ready sin esperar al dispatcher.
+    Si el jugador no está en el match, el reply queda pending y lo
+    descarta process_pending_match_result_replies como siempre.
+
+    Retorna {"recorded": bool, "applied": bool, "closed": bool}.
+    """
+    result = normalize_match_result(result)
+    apply_now = Settings.MATCH_RESULT_APPLY_IMMEDIATELY if apply_now is None else apply_now
+
+    team = None
+    if apply_now:
+        team = db.scalar(
+            select(MatchPlayer.team)
+            .join(Player, Player.id == MatchPlayer.player_id)
+            .where(MatchPlayer.match_id == match_id, Player.user_id == user_id)
+        )
+
+    delta_team1, delta_team2 = _vote_deltas(result, team)
+    applies = apply_now and (delta_team1 or delta_team2)
+
+    inserted = (
+        pg_insert(MatchResultReply)
+        .values(
+            match_id=match_id,
+            user_id=user_id,
+            result=result,
+            pending=not applies,
+        )
+        .on_conflict_do_nothing(index_elements=["match_id", "user_id"])
+        .returning(MatchResultReply.id)
+    )
+
+    if not applies:
+        recorded = db.execute(inserted).scalar() is not None
+        db.commit()
+        return {"recorded": recorded, "applied": False, "closed": False}
+
+    inserted_cte = inserted.cte("inserted")
+    matches = Match.__table__
+    stmt = (
+        update(matches)
+        .where(
+            matches.c.id == match_id,
+            select(inserted_cte.c.id).exists(),
+        )
+        .values(
+            vote_win_team1=func.coalesce(matches.c.vote_win_team1, 0) + delta_team1,
+            vote_win_team2=func.coalesce(matches.c.vote_win_team2, 0) + delta_team2,
+        )
+        .returning(matches.c.id)
+        .add_cte(inserted_cte)
+    )
+    applied = db.execute(stmt).scalar() is not None
+    db.commit()
+
+    if not applied:
+        return {"recorded": False, "applied": False, "closed": False}
+
+    # ⚡ Cierre inmediato si el resultado ya está definido
+    match = db.query(Match).filter(Match.id == match_id).first()
+    closed = try_close_match_if_ready(match, db)
+    return {"recorded": True, "applied": True, "closed": closed}
+
 def generate_match_card(match_id: int, db: Session,print_icons:bool = False) -> BytesIO:
     report = get_match_balance_report(match_id, db)
 
     #logger.info(f"REPORTE: {report}")
 
-    template = Image.open(Settings.API_MATCH_TEMPLATE_PATH).convert("RGBA")
+    return render_match_card(report, print_icons=print_icons)
+
+def render_match_card(report: MatchReportResponse, print_icons: bool = False) -> BytesIO:
+    """
+    Dibuja la carta del match a partir del reporte, sin tocar la base
+    (lo usan el benchmark y los tests golden con reportes sintéticos).
+    """
+    # Pillow y los helpers de dibujo se cargan recién acá (ver generate_player_card_from_player)
+    from PIL import ImageDraw
+    from src.services.match_service_image import _build_match_layout, _draw_team_block, _draw_match_header, \
+        _draw_comparison_star, _draw_stat_lider, _draw_team_relations, _load_fonts, load_match_base_layer
+
+    # Template + fondos de equipos + panel de relaciones ya compuestos (cacheado)
+    template = load_match_base_layer()
     draw = ImageDraw.Draw(template)
 
     regions = _build_match_layout(draw, template, debug=True)
@@ -633,6 +764,7 @@ def generate_match_card(match_id: int, db: Session,print_icons:bool = False) ->
         fonts["name"],
         side="left",
         print_icons=True,
+        draw_background=False,
     )
 
     _draw_team_block(
@@ -643,6 +775,7 @@ def generate_match_card(match_id: int, db: Session,print_icons:bool = False) ->
         fonts,
         side="right",
         print_icons=True,
+        draw_background=False,
     )
 
     _draw_stat_lider(
@@ -666,11 +799,13 @@ def generate_match_card(match_id: int, db: Session,print_icons:bool = False) ->
         rect=regions["relations"],  # rect donde se dibujará la imagen
         report=report,  # o "team_2" según quieras
         fonts=fonts,
-        debug=False  # True si querés ver el rectángulo de debug
+        debug=False,  # True si querés ver el rectángulo de debug
+        draw_background=False,
     )
 
     buffer = BytesIO()
     template.save(buffer, format="PNG")
+    buffer.render_hash = compute_render_hash(buffer.getvalue())  # clave del cache de file_id de Telegram
     buffer.seek(0)
     return buffer
 
@@ -1,8 +1,114 @@
 from PIL import Image, ImageDraw, ImageFont
 from src.config import Settings
+from src.services.photo_store_service import photo_render_path
+from functools import lru_cache
 import os
 from pathlib import Path
 
+# ---------- Capas estáticas ----------
+# La carta se arma en capas: lo que no depende del match (template, fondos
+# de los equipos, panel de relaciones con su alpha) se compone una sola vez
+# por versión de los templates y cada render trabaja sobre una copia. Por
+# request solo se dibujan las capas dinámicas, cada una en su bounding box.
+
+TEAM_CARD_COLOR = (245, 245, 245, 12)
+RELATIONS_PANEL_OPACITY = 0.6
+RELATIONS_CORNER_RADIUS = 20
+
+
+def _template_version(*paths) -> tuple:
+    """
+    (ruta, mtime) de cada template: si se reemplaza un archivo cambia la
+    clave y las capas se vuelven a componer.
+    """
+    return tuple(
+        (str(path), os.stat(path).st_mtime_ns if os.path.exists(path) else None)
+        for path in paths
+    )
+
+
+@lru_cache(maxsize=32)
+def _load_stat_icon(stat_name: str, size: int) -> Image.Image | None:
+    path = os.path.join(Settings.API_ICONS_MATCH_PATH_FOLDER, f"{stat_name}.png")
+    if not os.path.exists(path):
+        return None
+
+    icon = Image.open(path).convert("RGBA")
+    return icon.resize((size, size), Image.LANCZOS)
+
+
+def _draw_team_card_background(template: Image.Image, rect: tuple[int, int, int, int]) -> None:
+    """
+    Fondo tipo card de un equipo, compuesto solo sobre su rect.
+    """
+    x1, y1, x2, y2 = rect
+    w, h = x2 - x1, y2 - y1
+
+    # rounded_rectangle incluye el borde derecho/inferior: +1 px
+    overlay = Image.new("RGBA", (w + 1, h + 1), (0, 0, 0, 0))
+    ImageDraw.Draw(overlay).rounded_rectangle((0, 0, w, h), int(h * 0.06), fill=TEAM_CARD_COLOR)
+    template.alpha_composite(overlay, (x1, y1))
+
+
+@lru_cache(maxsize=4)
+def _relations_panel(w: int, h: int, corner_radius: int, version: tuple) -> tuple[Image.Image, Image.Image] | None:
+    """
+    Template de relaciones escalado al rect, con su alpha atenuado y la
+    máscara de bordes redondeados. None si no hay template.
+    """
+    path = version[0][0]
+    if not os.path.exists(path):
+        return None
+
+    rel_img = Image.open(path).convert("RGBA")
+    rel_img = rel_img.resize((w, h), Image.LANCZOS)
+
+    mask = Image.new("L", (w, h), 0)
+    mask_draw = ImageDraw.Draw(mask)
+    mask_draw.rounded_rectangle([0, 0, w, h], radius=corner_radius, fill=255)
+
+    alpha = rel_img.split()[3].point(lambda p: int(p * RELATIONS_PANEL_OPACITY))
+    rel_img.putalpha(alpha)
+
+    final_mask = Image.new("L", (w, h), 0)
+    final_mask.paste(alpha, (0, 0), mask)
+    return rel_img, final_mask
+
+
+def _draw_relations_background(
+    template: Image.Image,
+    rect: tuple[int, int, int, int],
+    corner_radius: int = RELATIONS_CORNER_RADIUS,
+) -> None:
+    x1, y1, x2, y2 = rect
+    panel = _relations_panel(
+        x2 - x1, y2 - y1, corner_radius, _template_version(Settings.API_MATCH_TEMPLATE_RELATIONS_PATH)
+    )
+    if panel is not None:
+        rel_img, final_mask = panel
+        template.paste(rel_img, (x1, y1), final_mask)
+
+
+@lru_cache(maxsize=2)
+def _match_base_layer(version: tuple) -> Image.Image:
+    template = Image.open(version[0][0]).convert("RGBA")
+    regions = _build_match_layout(None, template, debug=False)
+
+    _draw_team_card_background(template, regions["team_1"])
+    _draw_team_card_background(template, regions["team_2"])
+    _draw_relations_background(template, regions["relations"])
+    return template
+
+
+def load_match_base_layer() -> Image.Image:
+    """
+    Template de la carta de match con las capas estáticas ya compuestas.
+    Retorna una copia: el render puede dibujar encima sin tocar el cache.
+    """
+    version = _template_version(Settings.API_MATCH_TEMPLATE_PATH, Settings.API_MATCH_TEMPLATE_RELATIONS_PATH)
+    return _match_base_layer(version).copy()
+
+
 # ---------- Helpers ----------
 def load_match_fonts(size):
     pass
@@ -21,29 +127,11 @@ def _draw_team_block(
     side: str = "left",
     debug: bool = False,
     print_icons: bool = False,  # <-- nuevo parámetro
+    draw_background: bool = True,  # False si el template ya trae la capa (load_match_base_layer)
 ) -> None:
     STAT_ORDER = ["tiro", "ritmo", "fisico", "defensa", "aura"]
     STAT_THRESHOLD = 85
 
-    # =====================
-    # Cache de iconos
-    # =====================
-    _ICON_CACHE: dict[str, Image.Image] = {}
-
-    def _get_stat_icon(stat_name: str, size: int) -> Image.Image | None:
-        key = f"{stat_name}_{size}"
-        if key in _ICON_CACHE:
-            return _ICON_CACHE[key]
-
-        path = os.path.join(Settings.API_ICONS_MATCH_PATH_FOLDER, f"{stat_name}.png")
-        if not os.path.exists(path):
-            return None
-
-        icon = Image.open(path).convert("RGBA")
-        icon = icon.resize((size, size), Image.LANCZOS)
-        _ICON_CACHE[key] = icon
-        return icon
-
     def _truncate_username(name: str, max_len: int = 8) -> str:
         return name if len(name) <= max_len else name[: max_len - 2] + ".."
 
@@ -65,12 +153,8 @@ def _draw_team_block(
     # ─────────────────────────────
     # Fondo tipo card
     # ─────────────────────────────
-    CARD_RADIUS = int(h * 0.06)
-    CARD_COLOR = (245, 245, 245, 12)
-
-    overlay = Image.new("RGBA", template.size, (0, 0, 0, 0))
-    ImageDraw.Draw(overlay).rounded_rectangle(rect, CARD_RADIUS, fill=CARD_COLOR)
-    template.alpha_composite(overlay)
+    if draw_background:
+        _draw_team_card_background(template, rect)
 
     # ─────────────────────────────
     # Título
@@ -211,7 +295,7 @@ def _draw_team_block(
             icon_size = icon_radius * 2 + 1
             for idx, stat_name in enumerate(player_icons):
                 cx = icons_start_x + icon_dir * idx * icon_gap
-                icon = _get_stat_icon(stat_name, icon_size)
+                icon = _load_stat_icon(stat_name, icon_size)
                 if not icon:
                     continue
                 template.paste(
@@ -278,23 +362,6 @@ def _draw_stat_lider(
     # Reservar espacio para título
     title_h = int(h * 0.12)
 
-    # Cache de íconos
-    _ICON_CACHE: dict[str, Image.Image] = {}
-
-    def _get_stat_icon(stat_name: str, size: int) -> Image.Image | None:
-        key = f"{stat_name}_{size}"
-        if key in _ICON_CACHE:
-            return _ICON_CACHE[key]
-
-        path = os.path.join(Settings.API_ICONS_MATCH_PATH_FOLDER, f"{stat_name}.png")
-        if not os.path.exists(path):
-            return None
-
-        icon = Image.open(path).convert("RGBA")
-        icon = icon.resize((size, size), Image.LANCZOS)
-        _ICON_CACHE[key] = icon
-        return icon
-
     # Ordenar players según prioridad de stats
     def ordenar_players(players):
         ordered = []
@@ -343,7 +410,7 @@ def _draw_stat_lider(
         cy = int(row_top + row_h / 2)
 
         # Icono del stat correspondiente a la línea
-        icon = _get_stat_icon(stat_name, icon_radius * 2)
+        icon = _load_stat_icon(stat_name, icon_radius * 2)
         if not icon or (v1 < STAT_THRESHOLD or v2 < STAT_THRESHOLD) or (winner_team == "team1" and v1 < STAT_THRESHOLD) or (winner_team == "team2" and v2 < STAT_THRESHOLD):
             continue
 
@@ -376,8 +443,9 @@ def _draw_team_relations(
     report,  # MatchBalanceReport
     fonts: dict | ImageFont.FreeTypeFont | None = None,
     debug: bool = False,
-    corner_radius: int = 20,  # radio de las esquinas
+    corner_radius: int = RELATIONS_CORNER_RADIUS,  # radio de las esquinas
     player_coords: dict | None = None,  # coordenadas configurables
+    draw_background: bool = True,  # False si el template ya trae la capa (load_match_base_layer)
 ) -> None:
     """
     Dibuja los jugadores de cada equipo dentro del rect con sus fotos,
@@ -392,21 +460,8 @@ def _draw_team_relations(
     # =====================
     # Imprimir template de relaciones
     # =====================
-    if os.path.exists(Settings.API_MATCH_TEMPLATE_RELATIONS_PATH):
-        rel_img = Image.open(Settings.API_MATCH_TEMPLATE_RELATIONS_PATH).convert("RGBA")
-        rel_img = rel_img.resize((w, h), Image.LANCZOS)
-
-        mask = Image.new("L", (w, h), 0)
-        mask_draw = ImageDraw.Draw(mask)
-        mask_draw.rounded_rectangle([0, 0, w, h], radius=corner_radius, fill=255)
-
-        alpha = rel_img.split()[3].point(lambda p: int(p * 0.6))
-        rel_img.putalpha(alpha)
-
-        final_mask = Image.new("L", (w, h), 0)
-        final_mask.paste(alpha, (0, 0), mask)
-
-        template.paste(rel_img, (x1, y1), final_mask)
+    if draw_background:
+        _draw_relations_background(template, rect, corner_radius)
 
     # =====================
     # Generar coordenadas por defecto si no se pasan
@@ -485,7 +540,7 @@ def _draw_team_relations(
         for player_stat in team.individual_stats:
             player_name = player_stat.name
             px, py = player_coords.get(team_name, {}).get(player_name, (x1 + w // 2, y1 + h // 2))
-            photo_path = getattr(player_stat, "photo_path", None) or DEFAULT_PHOTO_PATH
+            photo_path = photo_render_path(getattr(player_stat, "photo_path", None)) or DEFAULT_PHOTO_PATH
             if not os.path.exists(photo_path):
                 continue
 
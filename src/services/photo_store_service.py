@@ -0,0 +1,259 @@
+# src/services/photo_store_service.py
+"""
+Almacenamiento de fotos por contenido.
+
+Cada archivo se guarda una sola vez bajo su sha256:
+
+    player_photos/ab/abcdef...1234.jpg          (key = "ab/abcdef...1234.jpg")
+    player_photos/ab/thumbs/abcdef...1234.png   (miniatura)
+
+players.photo_path guarda la key relativa y photo_blobs lleva la cuenta de
+cuántos jugadores la usan. Cuando ref_count llega a 0 el archivo no se borra
+en el momento: lo borra collect_photo_garbage() pasado un margen, así un
+re-upload del mismo contenido mientras tanto lo reaprovecha.
+
+Las fotos viejas ({username}_{uuid}.ext con ruta absoluta en la base) se
+siguen leyendo; migrate_legacy_photos() las pasa al store.
+"""
+
+import hashlib
+import os
+import re
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import select, update, delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from src.config import settings
+from src.models.photo_blob import PhotoBlob
+from src.models.player import Player
+from src.utils.logger_config import app_logger as logger
+
+
+_HASH_RE = re.compile(r"^[0-9a-f]{64}$")
+
+
+# =========================
+# Paths / keys
+# =========================
+
+def photo_folder() -> Path:
+    folder = settings.API_PHOTO_PLAYER_PATH_FOLDER.resolve()
+    folder.mkdir(parents=True, exist_ok=True)
+    return folder
+
+
+def blob_key(photo_hash: str, ext: str) -> str:
+    return f"{photo_hash[:2]}/{photo_hash}{ext}"
+
+
+def is_blob_key(photo_path: str | None) -> bool:
+    return bool(photo_path) and photo_hash_from_key(photo_path) is not None
+
+
+def photo_hash_from_key(photo_path: str | None) -> str | None:
+    """
+    sha256 de la foto si photo_path es una key del store (sirve como clave
+    de caches de render). None para fotos viejas o vacías.
+    """
+    if not photo_path or os.path.isabs(photo_path):
+        return None
+    stem = Path(photo_path).stem
+    return stem if _HASH_RE.match(stem) else None
+
+
+def resolve_photo_path(photo_path: str | None) -> Path | None:
+    """
+    Ruta en disco de players.photo_path: key relativa del store o ruta
+    absoluta vieja.
+    """
+    if not photo_path:
+        return None
+    path = Path(photo_path)
+    if path.is_absolute():
+        return path
+    return settings.API_PHOTO_PLAYER_PATH_FOLDER.resolve() / path
+
+
+def thumbnail_path_for(photo_path: str | Path) -> Path:
+    photo_path = resolve_photo_path(str(photo_path))
+    return photo_path.parent / "thumbs" / f"{photo_path.stem}.png"
+
+
+def photo_render_path(photo_path: str | None) -> str | None:
+    """
+    Qué archivo usar para dibujar una foto en las cartas: la miniatura si
+    ya está generada, si no la original. None si no hay ninguna.
+    """
+    path = resolve_photo_path(photo_path)
+    if path is None:
+        return None
+    thumbnail = thumbnail_path_for(path)
+    if thumbnail.exists():
+        return str(thumbnail)
+    if path.exists():
+        return str(path)
+    return None
+
+
+def delete_photo_files(photo_path: str) -> None:
+    """
+    Borra una foto y su miniatura (si existen).
+    """
+    path = resolve_photo_path(photo_path)
+    for file in (path, thumbnail_path_for(path)):
+        file.unlink(missing_ok=True)
+
+
+# =========================
+# Reference counting
+# =========================
+
+def acquire_photo_blob(db: Session, photo_hash: str, key: str, size: int) -> None:
+    """
+    +1 referencia (crea la fila si es la primera). No commitea.
+    """
+    stmt = pg_insert(PhotoBlob).values(
+        hash=photo_hash, key=key, size=size, ref_count=1, updated_at=datetime.utcnow()
+    )
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[PhotoBlob.hash],
+        set_={"ref_count": PhotoBlob.ref_count + 1, "updated_at": datetime.utcnow()},
+    ))
+
+
+def release_photo_blob(db: Session, key: str) -> None:
+    """
+    -1 referencia. El archivo queda hasta el próximo GC. No commitea.
+    """
+    db.execute(
+        update(PhotoBlob)
+        .where(PhotoBlob.key == key, PhotoBlob.ref_count > 0)
+        .values(ref_count=PhotoBlob.ref_count - 1, updated_at=datetime.utcnow())
+    )
+
+
+# =========================
+# Garbage collection
+# =========================
+
+def collect_photo_garbage(db: Session, grace_hours: float | None = None, dry_run: bool = False) -> dict:
+    """
+    Borra del disco (y de photo_blobs):
+        - blobs con ref_count = 0 sin cambios hace más de grace_hours
+        - archivos del store sin fila (upload cuya transacción falló)
+        - .part abandonados
+    Un archivo tocado dentro del margen (re-upload reciente) no se borra;
+    el mtime se vuelve a mirar justo antes de borrar.
+    """
+    grace_hours = settings.PHOTO_GC_GRACE_HOURS if grace_hours is None else grace_hours
+    cutoff = datetime.utcnow() - timedelta(hours=grace_hours)
+    cutoff_ts = time.time() - grace_hours * 3600
+    folder = photo_folder()
+
+    def _old_enough(path: Path) -> bool:
+        try:
+            return path.stat().st_mtime < cutoff_ts
+        except FileNotFoundError:
+            return True
+
+    # 1️⃣ Blobs sin referencias
+    candidates = db.execute(
+        select(PhotoBlob.hash, PhotoBlob.key)
+        .where(PhotoBlob.ref_count == 0, PhotoBlob.updated_at < cutoff)
+    ).all()
+    orphan_keys = [key for _, key in candidates if _old_enough(folder / key)]
+
+    if orphan_keys and not dry_run:
+        # Se vuelve a chequear ref_count: si alguien la tomó mientras tanto, queda
+        orphan_keys = list(db.scalars(
+            delete(PhotoBlob)
+            .where(PhotoBlob.key.in_(orphan_keys), PhotoBlob.ref_count == 0)
+            .returning(PhotoBlob.key)
+        ))
+        db.commit()
+        for key in orphan_keys:
+            # Un upload del mismo contenido pudo tocar el archivo después del
+            # primer chequeo: se deja, su acquire vuelve a crear la fila
+            if _old_enough(folder / key):
+                delete_photo_files(key)
+
+    # 2️⃣ Archivos del store sin fila y .part viejos
+    known = set(db.scalars(select(PhotoBlob.key)))
+    stray = []
+    for path in folder.glob("*/*"):
+        if not path.is_file():
+            continue
+        key = f"{path.parent.name}/{path.name}"
+        if photo_hash_from_key(key) and key not in known and _old_enough(path):
+            stray.append(key)
+    partials = [p for p in folder.glob(".*.part") if _old_enough(p)]
+
+    if not dry_run:
+        for key in stray:
+            if _old_enough(folder / key):
+                delete_photo_files(key)
+        for path in partials:
+            path.unlink(missing_ok=True)
+
+    summary = {
+        "dry_run": dry_run,
+        "orphan_blobs": len(orphan_keys),
+        "stray_files": len(stray),
+        "partials": len(partials),
+    }
+    logger.info(f"GC de fotos: {summary}")
+    return summary
+
+
+# =========================
+# Migración de fotos viejas
+# =========================
+
+def _hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def migrate_legacy_photos(db: Session) -> int:
+    """
+    Pasa las fotos con ruta absoluta ({username}_{uuid}.ext) al store por
+    contenido. Las que no existen en disco quedan en NULL. Retorna cuántas
+    se migraron.
+    """
+    players = db.execute(
+        select(Player.id, Player.photo_path).where(Player.photo_path.is_not(None))
+    ).all()
+
+    migrated = 0
+    for player_id, photo_path in players:
+        if is_blob_key(photo_path):
+            continue
+
+        legacy = resolve_photo_path(photo_path)
+        if not legacy.exists():
+            db.execute(update(Player).where(Player.id == player_id).values(photo_path=None))
+            continue
+
+        photo_hash = _hash_file(legacy)
+        key = blob_key(photo_hash, legacy.suffix.lower())
+        target = photo_folder() / key
+        if target.exists():
+            legacy.unlink()
+        else:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(legacy, target)
+
+        acquire_photo_blob(db, photo_hash, key, target.stat().st_size)
+        db.execute(update(Player).where(Player.id == player_id).values(photo_path=key))
+        migrated += 1
+
+    db.commit()
+    logger.info(f"Fotos migradas al store por contenido: {migrated}")
+    return migrated
@@ -0,0 +1,200 @@
+# src/services/photo_upload_service.py
+"""
+Subida de fotos de jugador en streaming.
+
+    1️⃣ El upload se lee en chunks (nunca entero en memoria) y se corta
+       apenas supera PHOTO_MAX_BYTES.
+    2️⃣ El tipo sale de los magic bytes del primer chunk, no del
+       content-type ni de la extensión que manda el cliente.
+    3️⃣ Se escribe a un .part en la misma carpeta calculando el sha256 en
+       el mismo paso, y se renombra a su key del store por contenido
+       (photo_store_service). Si esa foto ya existía el rename la pisa con
+       los mismos bytes: no queda un segundo archivo.
+    4️⃣ Pillow solo lee el header (formato y dimensiones), sin decodificar.
+    5️⃣ La miniatura para las cartas va en background, después de responder
+       (y solo si la foto no la tenía ya).
+
+Pillow se importa dentro de las funciones: la API no lo carga al arrancar.
+"""
+
+import hashlib
+import os
+import uuid
+import warnings
+from dataclasses import dataclass
+from pathlib import Path
+
+import anyio
+from fastapi import UploadFile
+
+from src.config import settings
+from src.services.photo_store_service import photo_folder, blob_key, thumbnail_path_for
+from src.utils.logger_config import app_logger as logger
+
+
+UPLOAD_CHUNK_SIZE = 64 * 1024
+_SNIFF_BYTES = 12
+
+# extensión -> formato que reporta Pillow
+_PIL_FORMATS = {".png": "PNG", ".jpg": "JPEG", ".webp": "WEBP"}
+
+
+class PhotoUploadError(ValueError):
+    """
+    Upload rechazado. status_code es el que tiene que devolver la ruta.
+    """
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+@dataclass
+class StoredPhoto:
+    """
+    Foto ya escrita en el store. deduplicated = el archivo ya existía.
+    """
+    hash: str
+    key: str
+    size: int
+    path: Path
+    deduplicated: bool
+
+
+# =========================
+# Validación
+# =========================
+
+def sniff_image_extension(header: bytes) -> str | None:
+    """
+    Extensión según los magic bytes (PNG, JPEG o WEBP). None si no es ninguna.
+    """
+    if header.startswith(b"\x89PNG\r\n\x1a\n"):
+        return ".png"
+    if header.startswith(b"\xff\xd8\xff"):
+        return ".jpg"
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return ".webp"
+    return None
+
+
+def read_image_header(path: str | Path, expected_ext: str) -> tuple[int, int]:
+    """
+    Abre la imagen en modo lazy (solo header) y valida formato y tamaño.
+    Retorna (ancho, alto).
+    """
+    from PIL import Image, UnidentifiedImageError
+
+    try:
+        # El límite de píxeles es PHOTO_MAX_PIXELS (abajo): el aviso de
+        # Pillow entre su límite y el doble no aporta nada
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", Image.DecompressionBombWarning)
+            with Image.open(path) as image:
+                image_format, size = image.format, image.size
+    except Image.DecompressionBombError:
+        # Header que declara más del doble de Image.MAX_IMAGE_PIXELS
+        raise PhotoUploadError("La imagen tiene demasiados píxeles", status_code=413)
+    except (UnidentifiedImageError, OSError):
+        raise PhotoUploadError("El archivo no es una imagen válida")
+
+    if image_format != _PIL_FORMATS[expected_ext]:
+        raise PhotoUploadError("El contenido de la imagen no coincide con su formato")
+
+    width, height = size
+    if width * height > settings.PHOTO_MAX_PIXELS:
+        raise PhotoUploadError("La imagen tiene demasiados píxeles", status_code=413)
+    return width, height
+
+
+# =========================
+# Upload
+# =========================
+
+async def save_photo_upload(upload: UploadFile) -> StoredPhoto:
+    """
+    Copia el upload al store en chunks, validando y hasheando en el camino.
+    No toca la base: la referencia la toma player_service.set_player_photo.
+
+    Raises:
+        PhotoUploadError si es muy grande o no es una imagen soportada
+    """
+    folder = photo_folder()
+    tmp_path = folder / f".{uuid.uuid4().hex}.part"
+
+    digest = hashlib.sha256()
+    size = 0
+    header = b""
+    ext = None
+    try:
+        async with await anyio.open_file(tmp_path, "wb") as out:
+            while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > settings.PHOTO_MAX_BYTES:
+                    max_mb = settings.PHOTO_MAX_BYTES // (1024 * 1024)
+                    raise PhotoUploadError(
+                        f"La imagen supera el tamaño máximo permitido ({max_mb}MB)", status_code=413
+                    )
+
+                if ext is None:
+                    header += chunk[:_SNIFF_BYTES - len(header)]
+                    if len(header) >= _SNIFF_BYTES:
+                        ext = sniff_image_extension(header)
+                        if ext is None:
+                            raise PhotoUploadError("El archivo debe ser una imagen PNG, JPEG o WEBP")
+
+                digest.update(chunk)
+                await out.write(chunk)
+
+        if ext is None:
+            raise PhotoUploadError("El archivo debe ser una imagen PNG, JPEG o WEBP")
+
+        await anyio.to_thread.run_sync(read_image_header, tmp_path, ext)
+
+        photo_hash = digest.hexdigest()
+        key = blob_key(photo_hash, ext)
+        photo_path = folder / key
+        photo_path.parent.mkdir(exist_ok=True)
+        deduplicated = photo_path.exists()
+        # Aunque exista se reemplaza: mismos bytes, y el mtime nuevo le avisa
+        # al GC que se está usando (no borra archivos tocados dentro del margen)
+        os.replace(tmp_path, photo_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    logger.info(f"Foto recibida: {key} ({size} bytes{', ya existía' if deduplicated else ''})")
+    return StoredPhoto(hash=photo_hash, key=key, size=size, path=photo_path, deduplicated=deduplicated)
+
+
+# =========================
+# Background tasks
+# =========================
+
+def generate_photo_thumbnail(photo_path: str) -> str | None:
+    """
+    Miniatura PNG (RGBA) para las cartas, así no se decodifica la foto
+    original completa en cada render. Retorna la ruta o None si falla.
+    """
+    from PIL import Image
+
+    thumbnail = thumbnail_path_for(photo_path)
+    if thumbnail.exists():
+        return str(thumbnail)
+    thumbnail.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = thumbnail.with_name(f".{thumbnail.name}.part")
+    size = (settings.PHOTO_THUMBNAIL_SIZE, settings.PHOTO_THUMBNAIL_SIZE)
+
+    try:
+        with Image.open(photo_path) as image:
+            if image.format == "JPEG":
+                image.draft("RGB", size)  # JPEG decodifica directo a escala reducida
+            image.thumbnail(size)
+            image.convert("RGBA").save(tmp_path, format="PNG")
+        os.replace(tmp_path, thumbnail)
+    except Exception as e:
+        tmp_path.unlink(missing_ok=True)
+        logger.exception(f"No se pudo generar la miniatura de {photo_path}: {e}")
+        return None
+
+    return str(thumbnail)
+
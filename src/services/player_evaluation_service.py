@@ -1,8 +1,48 @@
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session, aliased
+
+from src.config import settings
 from src.models.player_evaluation import PlayerEvaluationPermission
-from sqlalchemy.orm import Session
-from src.models.match import Match
-from src.models.player import Player
-from src.services.match_service import get_player_groups_from_match
+from src.models.match import MatchPlayer
+from src.utils.ttl_cache import TTLCache
+from src.services.cache_sync_service import register_shared_cache, publish_invalidation, sync_shared_caches
+from src.services.player_response_cache import invalidate_player_responses
+
+
+# =========================
+# Cache de permisos por evaluador
+# =========================
+
+_permission_cache = TTLCache(ttl_seconds=settings.PERMISSION_CACHE_TTL_SECONDS)
+register_shared_cache("permissions", _permission_cache.clear)
+
+
+def get_evaluable_target_ids(db: Session, evaluator_id: int) -> frozenset[int]:
+    """
+    Ids de los jugadores que evaluator_id puede evaluar (cacheado).
+    """
+    def _load() -> frozenset[int]:
+        return frozenset(db.scalars(
+            select(PlayerEvaluationPermission.target_id)
+            .where(PlayerEvaluationPermission.evaluator_id == evaluator_id)
+        ))
+
+    sync_shared_caches()
+    return _permission_cache.get_or_set(evaluator_id, _load)
+
+
+def invalidate_permission_cache(evaluator_ids) -> None:
+    evaluator_ids = set(evaluator_ids)
+    if not evaluator_ids:
+        return
+    for evaluator_id in evaluator_ids:
+        _permission_cache.invalidate(evaluator_id)
+    publish_invalidation("permissions")
+
+
+def clear_permission_cache() -> None:
+    _permission_cache.clear()
 
 
 def can_player_evaluate(
@@ -10,68 +50,69 @@ def can_player_evaluate(
     player_id: int,
     target_id: int
 ) -> bool:
-    return db.query(PlayerEvaluationPermission).filter_by(
-        evaluator_id=player_id,
-        target_id=target_id
-    ).first() is not None
+    return target_id in get_evaluable_target_ids(db, player_id)
+
 
+# =========================
+# Otorgar permisos
+# =========================
 
 def grant_evaluation_permission(
     db: Session,
     evaluator_id: int,
     target_id: int
 ):
+    """
+    Commitea y recién ahí invalida el cache: si se invalida antes, un
+    request concurrente vuelve a cachear el set sin el permiso nuevo.
+    """
     if evaluator_id == target_id:
         return
 
-    exists = db.query(PlayerEvaluationPermission).filter_by(
-        evaluator_id=evaluator_id,
-        target_id=target_id
-    ).first()
-
-    if not exists:
-        db.add(
-            PlayerEvaluationPermission(
-                evaluator_id=evaluator_id,
-                target_id=target_id
-            )
-        )
-
+    db.execute(
+        pg_insert(PlayerEvaluationPermission)
+        .values(evaluator_id=evaluator_id, target_id=target_id)
+        .on_conflict_do_nothing(constraint="uq_player_evaluation_permission")
+    )
+    db.commit()
+    invalidate_permission_cache([evaluator_id])
 
 
 def create_evaluation_permissions_from_match(
     db: Session,
     match_id: int
-):
-    match = db.get(Match, match_id)
-    if not match:
-        return
+) -> int:
+    """
+    Todos los jugadores del match pueden evaluarse entre sí.
+
+    Un solo INSERT ... SELECT sobre match_players (evaluador × evaluado,
+    sin uno mismo) con ON CONFLICT DO NOTHING para los que ya existían.
+    Retorna la cantidad de permisos nuevos.
+    """
+    evaluator = aliased(MatchPlayer)
+    target = aliased(MatchPlayer)
+
+    pairs = (
+        select(evaluator.player_id, target.player_id)
+        .join(target, target.match_id == evaluator.match_id)
+        .where(
+            evaluator.match_id == match_id,
+            evaluator.player_id.is_not(None),
+            target.player_id.is_not(None),
+            evaluator.player_id != target.player_id,
+        )
+        .distinct()
+    )
+
+    inserted = db.execute(
+        pg_insert(PlayerEvaluationPermission)
+        .from_select(["evaluator_id", "target_id"], pairs)
+        .on_conflict_do_nothing(constraint="uq_player_evaluation_permission")
+        .returning(PlayerEvaluationPermission.evaluator_id)
+    ).scalars().all()
+    db.commit()
 
-    player_groups, _ = get_player_groups_from_match(match, db)
-
-    # Flatten de jugadores (grupos + individuales)
-    players: list[Player] = [
-        player
-        for group in player_groups
-        for player in group
-    ]
-
-    for evaluator in players:
-        for target in players:
-            if evaluator.id == target.id:
-                continue
-
-            exists = db.query(PlayerEvaluationPermission).filter_by(
-                evaluator_id=evaluator.id,
-                target_id=target.id
-            ).first()
-
-            if not exists:
-                db.add(
-                    PlayerEvaluationPermission(
-                        evaluator_id=evaluator.id,
-                        target_id=target.id
-                    )
-                )
-
-    db.commit()
\ No newline at end of file
+    evaluator_ids = set(inserted)
+    invalidate_permission_cache(evaluator_ids)
+    invalidate_player_responses(evaluator_ids)
+    return len(inserted)
@@ -0,0 +1,78 @@
+# src/services/player_response_cache.py
+
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Iterable
+
+from fastapi.encoders import jsonable_encoder
+
+from src.config import settings
+from src.services.cache_sync_service import register_shared_cache, publish_invalidation, sync_shared_caches
+from src.utils.ttl_cache import TTLCache
+
+
+# =========================
+# Cache de respuestas de jugador
+# =========================
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """
+    Respuesta JSON ya serializada de un endpoint de jugador.
+
+    player_ids son los jugadores cuyos datos aparecen en la respuesta
+    (el dueño y los listados): si cambia cualquiera, la entrada se descarta.
+    """
+    body: bytes
+    etag: str
+    player_ids: frozenset[int]
+
+
+_response_cache = TTLCache(ttl_seconds=settings.PLAYER_RESPONSE_CACHE_TTL_SECONDS, max_size=2_000)
+register_shared_cache("player_responses", _response_cache.clear)
+
+
+def get_or_build_response(
+    key: Hashable,
+    builder: Callable[[], tuple[Any, Iterable[int]]],
+) -> CachedResponse:
+    """
+    Devuelve la respuesta cacheada para key o la arma con builder().
+
+    builder retorna (payload, player_ids). El payload se serializa una sola
+    vez; los hits posteriores no tocan la base ni vuelven a serializar.
+    Si mientras builder leía hubo una invalidación, la respuesta se
+    devuelve pero no se cachea (pudo leer datos de antes del cambio).
+    """
+    sync_shared_caches()
+    cached = _response_cache.get(key)
+    if cached is not None:
+        return cached
+
+    generation = _response_cache.generation
+    payload, player_ids = builder()
+    body = json.dumps(jsonable_encoder(payload), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    cached = CachedResponse(
+        body=body,
+        etag=f'"{hashlib.sha1(body).hexdigest()}"',
+        player_ids=frozenset(player_ids),
+    )
+    _response_cache.set_if_generation(key, cached, generation)
+    return cached
+
+
+def invalidate_player_responses(player_ids: Iterable[int]) -> None:
+    """
+    Descarta todas las respuestas en las que aparece alguno de los jugadores.
+    Se llama después de cerrar un match, evaluar stats, subir foto, etc.
+    """
+    changed = frozenset(player_ids)
+    if not changed:
+        return
+    _response_cache.invalidate_entries_where(lambda _, cached: not cached.player_ids.isdisjoint(changed))
+    publish_invalidation("player_responses")
+
+
+def clear_player_responses() -> None:
+    _response_cache.clear()
@@ -3,14 +3,21 @@
 from typing import Optional,Dict
 
 from src.models import TeamEnum
+from src.models.match import Match, MatchPlayer
 from src.models.player import Player, PlayerRelation
-from sqlalchemy.orm import Session
+from src.models.player_evaluation import PlayerEvaluationPermission
+from sqlalchemy import select, update, func, or_, and_, text
+from sqlalchemy.orm import Session, aliased
 from src.models.user import User
 from src.schemas.player_schema import PlayerStatsUpdate
-from src.services.player_service_image import _load_template, _draw_player_photo, _draw_player_name, _draw_player_stats, \
-    _draw_player_stats_star, _save_to_buffer, _load_fonts
 from src.utils.logger_config import app_logger as logger
 from src.utils.stat_calculator import calculate_updated_stats
+from src.utils.recent_results import RECENT_RESULTS_MASK, RECENT_RESULTS_SIZE, encode_recent_results, streak_score
+from src.services.ranking_service import refresh_player_rankings
+from src.services.player_response_cache import invalidate_player_responses
+from src.services.player_evaluation_service import get_evaluable_target_ids
+from src.services.photo_store_service import acquire_photo_blob, release_photo_blob, is_blob_key, resolve_photo_path
+from src.services.photo_upload_service import StoredPhoto
 from src.config import settings
 
 from fastapi import APIRouter, Depends, HTTPException
@@ -18,8 +25,6 @@ from fastapi import APIRouter, Depends, HTTPException
 
 from src.database import SessionLocal
 
-import uuid
-
 
 
 def create_player_for_user(
@@ -54,57 +59,107 @@ def get_player_by_username(username: str, db: Session) -> Player:
     logger.info(f"Player obtenido: {username}")
     return player
 
-def save_player_photo(
-    username: str,
-    image_bytes: bytes,
-    filename: str,
-    db: Session
-) -> str:
+def resolve_players(
+    db: Session,
+    usernames: Optional[list[str]] = None,
+    ids: Optional[list[int]] = None,
+) -> tuple[list[Player], list[str], list[int]]:
     """
-    Guarda la foto de un jugador y actualiza su photo_path.
+    Resuelve varios jugadores por username (sin distinguir mayúsculas) y/o id
+    en una sola query, usando el índice ix_players_name_lower.
 
-    Returns:
-        Nombre del archivo guardado
+    Un username que coincide exacto gana siempre. Si no, se acepta el único
+    jugador que coincide sin distinguir mayúsculas; si hay varios ("Ana" y
+    "ana") es ambiguo y va a missing_usernames.
+
+    Retorna (players, missing_usernames, missing_ids). Los players vienen sin
+    repetir y en el orden pedido (primero usernames, después ids); los
+    faltantes se devuelven tal cual se pidieron.
     """
+    usernames = list(dict.fromkeys(u.strip() for u in (usernames or []) if u and u.strip()))
+    ids = list(dict.fromkeys(ids or []))
+    if not usernames and not ids:
+        return [], [], []
+
+    conditions = []
+    if usernames:
+        conditions.append(func.lower(Player.name).in_({u.lower() for u in usernames}))
+    if ids:
+        conditions.append(Player.id.in_(ids))
+
+    rows = db.execute(
+        select(Player).where(or_(*conditions)).order_by(Player.id)
+    ).scalars().all()
+
+    by_exact_name: dict[str, Player] = {}
+    by_lower_name: dict[str, list[Player]] = {}
+    by_id: dict[int, Player] = {}
+    for player in rows:
+        by_exact_name[player.name] = player
+        by_lower_name.setdefault(player.name.lower(), []).append(player)
+        by_id[player.id] = player
+
+    players: dict[int, Player] = {}
+    missing_usernames = []
+    for username in usernames:
+        player = by_exact_name.get(username)
+        if player is None:
+            candidates = by_lower_name.get(username.lower(), [])
+            player = candidates[0] if len(candidates) == 1 else None
+        if player is None:
+            missing_usernames.append(username)
+        else:
+            players.setdefault(player.id, player)
 
-    player: Player = get_player_by_username(username, db)
-    if not player:
-        raise HTTPException(
-            status_code=404,
-            detail="Jugador no encontrado"
-        )
+    missing_ids = []
+    for player_id in ids:
+        player = by_id.get(player_id)
+        if player is None:
+            missing_ids.append(player_id)
+        else:
+            players.setdefault(player.id, player)
 
-    # 📁 Carpeta base
-    base_folder = settings.API_PHOTO_PLAYER_PATH_FOLDER.resolve()
-    os.makedirs(base_folder, exist_ok=True)
+    return list(players.values()), missing_usernames, missing_ids
 
-    # 🧩 Extensión segura
-    _, ext = os.path.splitext(filename or "")
-    ext = ext.lower() if ext in {".png", ".jpg", ".jpeg", ".webp"} else ".png"
+def set_player_photo(username: str, photo: StoredPhoto, db: Session) -> str | None:
+    """
+    Apunta la foto del jugador a photo (ya escrita en el store, ver
+    photo_upload_service.save_photo_upload). Toma una referencia al blob
+    nuevo y suelta la del anterior en la misma transacción; los archivos
+    sin referencias los borra el GC (photo_store_service).
 
-    # 🆔 Nombre único
-    photo_filename = f"{username}_{uuid.uuid4().hex}{ext}"
-    photo_path = os.path.join(base_folder, photo_filename)
+    La fila del jugador queda bloqueada hasta el commit: dos uploads a la
+    vez para el mismo jugador no pueden soltar dos veces la misma foto.
 
-    # 🗑️ Eliminar foto anterior si existe
-    if player.photo_path:
-        old_path = os.path.join(base_folder, player.photo_path)
-        if os.path.exists(old_path):
-            os.remove(old_path)
+    Returns:
+        Ruta de la foto anterior si era del formato viejo (fuera del store,
+        hay que borrarla a mano) o None
+    """
+    player: Player | None = db.execute(
+        select(Player)
+        .where(Player.name == username)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    ).scalar_one_or_none()
+    if not player:
+        raise ValueError(f"Player con username '{username}' no encontrado")
 
-    # 💾 Guardar archivo
-    with open(photo_path, "wb") as f:
-        f.write(image_bytes)
+    old_path = player.photo_path
+    if old_path == photo.key:
+        db.commit()  # suelta el lock
+        return None
 
-    # 🗄️ Persistir en DB
-    player.photo_path = photo_path
+    # 🗄️ Referencias + jugador en una sola transacción
+    acquire_photo_blob(db, photo.hash, photo.key, photo.size)
+    if is_blob_key(old_path):
+        release_photo_blob(db, old_path)
+    player.photo_path = photo.key
     db.add(player)
     db.commit()
-    db.refresh(player)
+    invalidate_player_responses([player.id])
 
-    print("📸 Foto guardada en:", photo_path)
-
-    return photo_filename
+    logger.info(f"📸 Foto guardada en: {photo.key}")
+    return str(resolve_photo_path(old_path)) if old_path and not is_blob_key(old_path) else None
 
 def add_player_relation(player1_id: int, player2_id: int, together: bool, db: Session):
     logger.info(f"Agregando {player1_id} - {player2_id}  un nuevo juego {together} juntos")
@@ -139,6 +194,28 @@ def add_player_relation(player1_id: int, player2_id: int, together: bool, db: Se
     db.refresh(relation)
     return relation
 
+def get_top_related_players(
+    db: Session,
+    usernames: list[str],
+    order_by: str = "total_games",
+    limit: int = 5,
+    exclude_bots: bool = False,
+) -> dict[str, list[tuple[Player, int]]]:
+    """
+    Top-N de relacionados para varios jugadores a la vez (vistas en lote).
+    Dos queries en total: ids de los jugadores + PlayerRelation.top_related.
+    Los usernames inexistentes no aparecen en el resultado.
+    """
+    players = db.query(Player.id, Player.name).filter(Player.name.in_(usernames)).all()
+    top = PlayerRelation.top_related(
+        db,
+        [player_id for player_id, _ in players],
+        order_by=order_by,
+        limit=limit,
+        exclude_bots=exclude_bots,
+    )
+    return {name: top[player_id] for player_id, name in players}
+
 def update_player_stats(
     target_username: str,
     evaluator_username: str,
@@ -188,11 +265,107 @@ def update_player_stats(
         setattr(target, key, value)
 
     db.commit()
+    refresh_player_rankings(db, [target.id])
+    invalidate_player_responses([target.id])
     db.refresh(target)
     #logger.info(f"Stats actualizados para player {target_username} (puntuado por {evaluator_username}), nuevo stat [{new_stats}]")
     return target
 
+def update_player_stats_batch(
+    evaluator_username: str,
+    evaluations: list[tuple[str, PlayerStatsUpdate]],
+    db: Session,
+    require_permission: bool = True
+) -> list[dict]:
+    """
+    Aplica varias evaluaciones de un mismo evaluador (típicamente todo un
+    match) con una query de jugadores, una de permisos y un solo commit.
+
+    Cada evaluación devuelve su estado:
+    updated | not_found | forbidden (sin PlayerEvaluationPermission) | self
+    | duplicate (el mismo evaluado ya vino antes en el lote: cuenta una vez)
+    """
+    target_names = [target for target, _ in evaluations]
+
+    # 1️⃣ Evaluador + todos los evaluados en una query
+    players = {
+        p.name: p
+        for p in db.query(Player).filter(Player.name.in_([evaluator_username, *target_names]))
+    }
+    evaluator = players.get(evaluator_username)
+    if not evaluator:
+        raise ValueError(f"Jugador evaluador '{evaluator_username}' no encontrado")
+
+    # 2️⃣ Permisos en bloque (set cacheado por evaluador)
+    allowed_ids = get_evaluable_target_ids(db, evaluator.id) if require_permission else None
+
+    evaluator_stats = {
+        "tiro": evaluator.tiro,
+        "ritmo": evaluator.ritmo,
+        "fisico": evaluator.fisico,
+        "defensa": evaluator.defensa,
+        "aura": evaluator.aura,
+    }
+
+    # 3️⃣ Calcular
+    results = []
+    updated_ids = set()
+    for target_username, stats_data in evaluations:
+        target = players.get(target_username)
+        if not target:
+            results.append({"target": target_username, "status": "not_found", "stats": None})
+            continue
+        if target.id == evaluator.id:
+            results.append({"target": target_username, "status": "self", "stats": None})
+            continue
+        if target.id in updated_ids:
+            results.append({"target": target_username, "status": "duplicate", "stats": None})
+            continue
+        if allowed_ids is not None and target.id not in allowed_ids:
+            results.append({"target": target_username, "status": "forbidden", "stats": None})
+            continue
+
+        current_stats = {
+            "tiro": target.tiro,
+            "ritmo": target.ritmo,
+            "fisico": target.fisico,
+            "defensa": target.defensa,
+            "aura": target.aura,
+        }
+
+        new_stats = calculate_updated_stats(
+            current_stats=current_stats,
+            evaluator_stats=evaluator_stats,
+            incoming_stats=stats_data.dict(exclude_unset=True),
+            elo=target.elo
+        )
+
+        for key, value in new_stats.items():
+            setattr(target, key, value)
+
+        updated_ids.add(target.id)
+        results.append({"target": target_username, "status": "updated", "stats": new_stats})
+
+    # 4️⃣ Un solo commit
+    if updated_ids:
+        db.commit()
+        refresh_player_rankings(db, updated_ids)
+        invalidate_player_responses(updated_ids)
+
+    logger.info(f"Evaluación en lote de {evaluator_username}: {len(updated_ids)}/{len(evaluations)} aplicadas")
+    return results
+
 def calculate_elo(cant_partidos: int, cant_partidos_ganados: int, recent_results: list[bool], current_elo: int) -> int:
+    bits, length = encode_recent_results(recent_results)
+    return calculate_elo_from_bits(cant_partidos, cant_partidos_ganados, bits, length, current_elo)
+
+def calculate_elo_from_bits(
+    cant_partidos: int,
+    cant_partidos_ganados: int,
+    recent_bits: int,
+    recent_len: int,
+    current_elo: int
+) -> int:
     # Si no ha jugado partidos, asignamos un ELO inicial
     if cant_partidos == 0:
         return 1000
@@ -211,13 +384,13 @@ def calculate_elo(cant_partidos: int, cant_partidos_ganados: int, recent_results
     streak_bonus = 0
     streak_penalty = 0
 
-    if recent_results:
-        streak_score = sum(1 if r else -1 for r in recent_results)
+    # Racha = victorias - derrotas de la ventana (popcount del bitmask)
+    score = streak_score(recent_bits, recent_len)
 
-        if streak_score > 0:
-            streak_bonus = streak_score * 5
-        elif streak_score < 0:
-            streak_penalty = abs(streak_score) * 7
+    if score > 0:
+        streak_bonus = score * 5
+    elif score < 0:
+        streak_penalty = abs(score) * 7
 
     base_change = int((win_rate - 0.5) * 200)
     new_elo = current_elo + base_change + streak_bonus - streak_penalty
@@ -225,31 +398,79 @@ def calculate_elo(cant_partidos: int, cant_partidos_ganados: int, recent_results
     return max(0, min(2000, new_elo))
 
 def update_player_match_history(username: str, won: bool, db: Session):
-    player = db.query(Player).filter_by(name=username).first()
-    if not player:
-        raise ValueError(f"Player with username '{username}' not found")
+    """
+    Suma el partido al historial del jugador y recalcula su ELO.
 
-    # Actualizar historial de partidos
-    player.cant_partidos += 1
-    if won:
-        player.cant_partidos_ganados += 1
+    Contadores y resultados recientes se actualizan en SQL, sin leer antes
+    la fila: bits = ((bits << 1) | won) & 0x3FF, largo = least(largo + 1, 10).
+    """
+    players = Player.__table__
+    row = db.execute(
+        update(players)
+        .where(players.c.name == username)
+        .values(
+            cant_partidos=func.coalesce(players.c.cant_partidos, 0) + 1,
+            cant_partidos_ganados=func.coalesce(players.c.cant_partidos_ganados, 0) + int(won),
+            recent_results_bits=(players.c.recent_results_bits.op("<<")(1).op("|")(int(won))).op("&")(RECENT_RESULTS_MASK),
+            recent_results_len=func.least(players.c.recent_results_len + 1, RECENT_RESULTS_SIZE),
+        )
+        .returning(
+            players.c.id,
+            players.c.cant_partidos,
+            players.c.cant_partidos_ganados,
+            players.c.recent_results_bits,
+            players.c.recent_results_len,
+            players.c.elo,
+        )
+    ).first()
 
-    # Actualizar resultados recientes (máximo 10)
-    if player.recent_results is None:
-        player.recent_results = []
-    player.recent_results = (player.recent_results or []) + [won]
-    player.recent_results = player.recent_results[-10:]
+    if row is None:
+        raise ValueError(f"Player with username '{username}' not found")
 
     # Recalcular ELO
-    player.elo = calculate_elo(
-        cant_partidos=player.cant_partidos,
-        cant_partidos_ganados=player.cant_partidos_ganados,
-        recent_results=player.recent_results,
-        current_elo=player.elo,
+    new_elo = calculate_elo_from_bits(
+        cant_partidos=row.cant_partidos,
+        cant_partidos_ganados=row.cant_partidos_ganados,
+        recent_bits=row.recent_results_bits,
+        recent_len=row.recent_results_len,
+        current_elo=row.elo if row.elo is not None else 1000,
     )
+    db.execute(update(players).where(players.c.id == row.id).values(elo=new_elo))
 
     db.commit()
 
+def backfill_recent_results_bits(db: Session) -> int:
+    """
+    Pasa el ARRAY(Boolean) viejo de players.recent_results (si la columna
+    todavía existe) al bitmask. Solo toca jugadores sin bitmask cargado.
+    Retorna la cantidad de jugadores migrados.
+    """
+    has_legacy = db.scalar(text(
+        "SELECT 1 FROM information_schema.columns "
+        "WHERE table_name = 'players' AND column_name = 'recent_results'"
+    ))
+    if not has_legacy:
+        return 0
+
+    rows = db.execute(text(
+        "SELECT id, recent_results FROM players "
+        "WHERE recent_results_len = 0 AND cardinality(recent_results) > 0"
+    )).all()
+
+    players = Player.__table__
+    for player_id, results in rows:
+        bits, length = encode_recent_results(results)
+        db.execute(
+            update(players)
+            .where(players.c.id == player_id)
+            .values(recent_results_bits=bits, recent_results_len=length)
+        )
+    db.commit()
+
+    if rows:
+        logger.info(f"recent_results migrado a bitmask para {len(rows)} jugadores")
+    return len(rows)
+
 def get_or_create_relation(
     player1_id: int,
     player2_id: int,
@@ -278,11 +499,140 @@ def get_or_create_relation(
     return relation
 
 
+# =========================
+# Perfil completo (cantidad fija de queries)
+# =========================
+
+def _profile_relations(db: Session, player_id: int) -> dict:
+    """
+    Top aliados / rivales / compañeros en una sola query: las relaciones
+    del jugador (sin bots) y un row_number() por cada ranking.
+    """
+    relations = PlayerRelation.directed([player_id])
+
+    def _rank(column):
+        return func.row_number().over(order_by=(column.desc(), relations.c.other_id))
+
+    ranked = (
+        select(
+            Player.id,
+            Player.name,
+            relations.c.games_together,
+            relations.c.games_apart,
+            relations.c.total_games,
+            _rank(relations.c.games_together).label("rank_allies"),
+            _rank(relations.c.games_apart).label("rank_opponents"),
+            _rank(relations.c.total_games).label("rank_teammates"),
+        )
+        .join(relations, relations.c.other_id == Player.id)
+        .where(Player.is_bot.is_(False))
+        .subquery()
+    )
+
+    rows = db.execute(
+        select(ranked).where(
+            or_(
+                ranked.c.rank_allies <= 3,
+                ranked.c.rank_opponents <= 3,
+                ranked.c.rank_teammates <= 5,
+            )
+        )
+    ).all()
+
+    def _top(rank_field: str, games_field: str, limit: int) -> list[dict]:
+        selected = sorted(
+            (r for r in rows if getattr(r, rank_field) <= limit),
+            key=lambda r: getattr(r, rank_field),
+        )
+        return [{"id": r.id, "name": r.name, games_field: getattr(r, games_field)} for r in selected]
+
+    return {
+        "top_allies": _top("rank_allies", "games_together", 3),
+        "top_opponents": _top("rank_opponents", "games_apart", 3),
+        "most_played_with": _top("rank_teammates", "total_games", 5),
+    }
+
+
+def _profile_recent_matches(db: Session, player_id: int, limit: int) -> list[dict]:
+    """
+    Últimos partidos con compañeros y rivales en una sola query:
+    los N matches más recientes del jugador + join a los demás MatchPlayer.
+    """
+    recent = (
+        select(
+            Match.id.label("match_id"),
+            Match.date,
+            Match.winner_team_id,
+            Match.team1_id,
+            Match.team2_id,
+            MatchPlayer.team.label("my_team"),
+        )
+        .join(MatchPlayer, MatchPlayer.match_id == Match.id)
+        .where(MatchPlayer.player_id == player_id)
+        .order_by(Match.date.desc(), Match.id.desc())
+        .limit(limit)
+        .subquery()
+    )
+
+    Other = aliased(MatchPlayer)
+    rows = db.execute(
+        select(
+            recent,
+            Player.id.label("other_id"),
+            Player.name.label("other_name"),
+            Other.team.label("other_team"),
+        )
+        .outerjoin(Other, and_(Other.match_id == recent.c.match_id, Other.player_id != player_id))
+        .outerjoin(Player, Player.id == Other.player_id)
+        .order_by(recent.c.date.desc(), recent.c.match_id.desc(), Other.id)
+    ).all()
+
+    recent_matches: dict[int, dict] = {}
+    for row in rows:
+        info = recent_matches.get(row.match_id)
+        if info is None:
+            my_team = row.my_team
+
+            # Determinar resultado del partido
+            if row.winner_team_id is None or my_team is None:
+                result = "pending"  # Partido aún no tiene resultado
+            elif (
+                (my_team == TeamEnum.team1 and row.winner_team_id == row.team1_id) or
+                (my_team == TeamEnum.team2 and row.winner_team_id == row.team2_id)
+            ):
+                result = "win"
+            else:
+                result = "loss"
+
+            info = recent_matches[row.match_id] = {
+                "match_id": row.match_id,
+                "date": row.date.isoformat(),  # Convertimos a string
+                "team": my_team.value if my_team else None,
+                "result": result,
+                "teammates": [],
+                "opponents": [],
+            }
+
+        if row.other_id is None:
+            continue
+        entry = {"id": row.other_id, "name": row.other_name}
+        if row.other_team == row.my_team:
+            info["teammates"].append(entry)
+        else:
+            info["opponents"].append(entry)
+
+    return list(recent_matches.values())
+
+
 def build_full_player_profile(
     db: Session,
     username: str,
     recent_matches_limit: int = 5
 ) -> dict:
+    """
+    Arma el perfil completo con 4 queries, sin importar el historial:
+    jugador, relaciones (agregadas), permisos de evaluación y últimos partidos.
+    """
     player = db.query(Player).filter(Player.name == username).first()
     if not player:
         raise ValueError(f"Player '{username}' not found")
@@ -313,76 +663,26 @@ def build_full_player_profile(
     # --------------------
     # Relaciones
     # --------------------
-    relations = {
-        "top_allies": [
-            {"id": p.id, "name": p.name, "games_together": games}
-            for p, games in player.top_allies(db, limit=3, exclude_bots=True)
-        ],
-        "top_opponents": [
-            {"id": p.id, "name": p.name, "games_apart": games}
-            for p, games in player.top_opponents(db, limit=3, exclude_bots=True)
-        ],
-        "most_played_with": [
-            {"id": p.id, "name": p.name, "total_games": games}
-            for p, games in player.top_teammates(db, limit=5, exclude_bots=True)
-        ],
-    }
+    relations = _profile_relations(db, player.id)
 
     # --------------------
     # Evaluation permissions
     # --------------------
+    targets = db.execute(
+        select(Player.id, Player.name)
+        .join(PlayerEvaluationPermission, PlayerEvaluationPermission.target_id == Player.id)
+        .where(PlayerEvaluationPermission.evaluator_id == player.id)
+        .order_by(PlayerEvaluationPermission.id)
+    ).all()
+
     evaluation = {
-        "can_evaluate": [
-            {"id": perm.target.id, "name": perm.target.name}
-            for perm in player.evaluation_permissions_given
-        ]
+        "can_evaluate": [{"id": target_id, "name": name} for target_id, name in targets]
     }
 
     # --------------------
     # Últimos partidos
     # --------------------
-    recent_matches = []
-    associations = sorted(
-        player.match_associations,
-        key=lambda ma: ma.match.date,
-        reverse=True
-    )[:recent_matches_limit]
-
-    for assoc in associations:
-        match = assoc.match
-        my_team = assoc.team
-
-        teammates = []
-        opponents = []
-
-        for mp in match.match_associations:
-            if mp.player_id == player.id:
-                continue
-            entry = {"id": mp.player.id, "name": mp.player.name}
-            if mp.team == my_team:
-                teammates.append(entry)
-            else:
-                opponents.append(entry)
-
-        # Determinar resultado del partido
-        if match.winner_team_id is None or my_team is None:
-            result = "pending"  # Partido aún no tiene resultado
-        elif (
-            (my_team == TeamEnum.team1 and match.winner_team_id == match.team1_id) or
-            (my_team == TeamEnum.team2 and match.winner_team_id == match.team2_id)
-        ):
-            result = "win"
-        else:
-            result = "loss"
-
-        recent_matches.append({
-            "match_id": match.id,
-            "date": match.date.isoformat(),  # Convertimos a string
-            "team": my_team.value if my_team else None,
-            "result": result,
-            "teammates": teammates,
-            "opponents": opponents,
-        })
+    recent_matches = _profile_recent_matches(db, player.id, recent_matches_limit)
 
     # --------------------
     # Perfil final
@@ -423,16 +723,15 @@ def generate_player_card(target_username: str, db: Session):
     return generate_player_card_from_player(player)
 
 
-from io import BytesIO
-from PIL import Image, ImageDraw, ImageFont
-import os
-
-
 def generate_player_card_from_player(player):
     """
     Genera la carta de un jugador usando un template.
     Foto arriba, nombre centrado, stats alineados abajo.
     """
+    # Pillow se carga recién acá: la API y los tests que no dibujan no lo importan
+    from PIL import ImageDraw
+    from src.services.player_service_image import _load_template, _draw_player_photo, _draw_player_name, \
+        _draw_player_stats, _draw_player_stats_star, _save_to_buffer, _load_fonts
 
     template = _load_template(settings.API_CARD_TEMPLATE_PATH)
     draw = ImageDraw.Draw(template)
@@ -5,15 +5,52 @@ from fastapi import APIRouter, Depends, HTTPException
 from io import BytesIO
 import os
 from src.config import settings
+from src.services.telegram_file_cache_service import compute_render_hash
+from src.services.photo_store_service import photo_render_path
 
 import math
+from functools import lru_cache
 from PIL import Image, ImageDraw, ImageFont
 # ---------- Helpers ----------
 
+@lru_cache(maxsize=4)
+def _decoded_template(path: str, mtime_ns: int) -> Image.Image:
+    return Image.open(path).convert("RGBA")
+
+
 def _load_template(path: str) -> Image.Image:
+    """
+    Template decodificado una vez por versión (mtime). Retorna una copia
+    para dibujar encima.
+    """
     if not os.path.exists(path):
         raise FileNotFoundError(f"Template no encontrado en {path}")
-    return Image.open(path).convert("RGBA")
+    return _decoded_template(str(path), os.stat(path).st_mtime_ns).copy()
+
+
+@lru_cache(maxsize=8)
+def _radar_grid_layer(size: int, grid_color: tuple[int, int, int, int]) -> Image.Image:
+    """
+    Grilla del radar de stats (no depende del jugador). No se modifica:
+    se usa como fondo de alpha_composite, que devuelve una imagen nueva.
+    """
+    radar_layer = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+    rdraw = ImageDraw.Draw(radar_layer)
+
+    center = (size // 2, size // 2)
+    radius = size * 0.45
+
+    for f in [0.2, 0.4, 0.6, 0.8, 1.0]:
+        pts = []
+        for i in range(5):
+            a = math.radians(90 + i * 72)
+            pts.append((
+                center[0] + math.cos(a) * radius * f,
+                center[1] - math.sin(a) * radius * f,
+            ))
+        rdraw.polygon(pts, outline=grid_color)
+
+    return radar_layer
 
 
 
@@ -75,9 +112,10 @@ def _draw_player_photo(template: Image.Image, player) -> None:
 
     photo_path = None
 
-    # decidir qué imagen usar
-    if getattr(player, "photo_path", None) and os.path.exists(player.photo_path):
-        photo_path = player.photo_path
+    # decidir qué imagen usar (la miniatura pre-generada si existe)
+    player_photo = photo_render_path(getattr(player, "photo_path", None))
+    if player_photo:
+        photo_path = player_photo
     elif os.path.exists(DEFAULT_PHOTO_PATH):
         photo_path = DEFAULT_PHOTO_PATH
     else:
@@ -322,24 +360,13 @@ def _draw_player_stats_star(
         )
 
     # ==========================================================
-    # 🧱 Capa del RADAR (grid)
+    # 🧱 Capa del RADAR (grid, cacheada por tamaño)
     # ==========================================================
-    radar_layer = Image.new("RGBA", (size, size), (0, 0, 0, 0))
-    rdraw = ImageDraw.Draw(radar_layer)
+    radar_layer = _radar_grid_layer(size, grid_color)
 
     center = (size // 2, size // 2)
     radius = size * 0.45
 
-    for f in [0.2, 0.4, 0.6, 0.8, 1.0]:
-        pts = []
-        for i in range(5):
-            a = math.radians(90 + i * 72)
-            pts.append((
-                center[0] + math.cos(a) * radius * f,
-                center[1] - math.sin(a) * radius * f,
-            ))
-        rdraw.polygon(pts, outline=grid_color)
-
     # ==========================================================
     # ⭐ Capa ESTRELLA (relleno por stats)
     # ==========================================================
@@ -426,5 +453,6 @@ def _save_to_buffer(image: Image.Image) -> BytesIO:
     buffer = BytesIO()
     buffer.name = "carta.png"
     image.save(buffer, format="PNG")
+    buffer.render_hash = compute_render_hash(buffer.getvalue())  # clave del cache de file_id de Telegram
     buffer.seek(0)
     return buffer
\ No newline at end of file
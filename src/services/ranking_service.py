@@ -0,0 +1,139 @@
+# src/services/ranking_service.py
+
+import base64
+import json
+from typing import Iterable, Optional
+
+from sqlalchemy import select, func, case, tuple_, cast, Float
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from src.models.player import Player
+from src.models.player_ranking import PlayerRanking
+from src.utils.balance_teams import STAT_NAMES
+from src.utils.logger_config import app_logger as logger
+
+
+RANKING_SORT_FIELDS = ["elo", "win_rate", *STAT_NAMES]
+
+RANKING_COLUMNS = [
+    "player_id", "name", "is_bot", "elo", "cant_partidos",
+    "cant_partidos_ganados", "win_rate", *STAT_NAMES,
+]
+
+
+# =========================
+# Refresco incremental
+# =========================
+
+def refresh_player_rankings(db: Session, player_ids: Optional[Iterable[int]] = None) -> None:
+    """
+    Copia a player_rankings los datos actuales de los jugadores indicados
+    (o de todos si player_ids es None) con un único INSERT ... SELECT
+    ON CONFLICT (player_id) DO UPDATE.
+
+    Se llama después de cada cambio de ELO / partidos / stats.
+    """
+    if player_ids is not None:
+        player_ids = list(set(player_ids))
+        if not player_ids:
+            return
+
+    partidos = func.coalesce(Player.cant_partidos, 0)
+    ganados = func.coalesce(Player.cant_partidos_ganados, 0)
+
+    source = select(
+        Player.id,
+        Player.name,
+        func.coalesce(Player.is_bot, False),
+        func.coalesce(Player.elo, 1000),
+        partidos,
+        ganados,
+        case((partidos > 0, cast(ganados, Float) / partidos), else_=0.0),
+        *[getattr(Player, stat) for stat in STAT_NAMES],
+    )
+    if player_ids is not None:
+        source = source.where(Player.id.in_(player_ids))
+
+    stmt = pg_insert(PlayerRanking).from_select(RANKING_COLUMNS, source)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[PlayerRanking.player_id],
+        set_={
+            **{c: stmt.excluded[c] for c in RANKING_COLUMNS if c != "player_id"},
+            "updated_at": func.now(),
+        },
+    )
+
+    db.execute(stmt)
+    db.commit()
+
+    if player_ids is None:
+        logger.info("Ranking de jugadores reconstruido completo")
+
+
+# =========================
+# Cursor (keyset)
+# =========================
+
+def encode_ranking_cursor(value, player_id: int) -> str:
+    raw = json.dumps([value, player_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_ranking_cursor(cursor: str) -> tuple:
+    try:
+        value, player_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return value, int(player_id)
+    except Exception:
+        raise ValueError("Cursor inválido")
+
+
+# =========================
+# Consulta paginada
+# =========================
+
+def get_rankings(
+    db: Session,
+    sort_by: str = "elo",
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    exclude_bots: bool = True,
+) -> dict:
+    """
+    Devuelve una página del ranking ordenado de mayor a menor por sort_by.
+
+    Pagina por keyset: el cursor guarda (valor, player_id) de la última fila
+    y la siguiente página arranca con WHERE (valor, player_id) < cursor,
+    recorriendo el índice (valor, player_id) sin OFFSET.
+
+    Retorna {"sort_by", "items", "next_cursor"}.
+    """
+    if sort_by not in RANKING_SORT_FIELDS:
+        raise ValueError(f"sort_by inválido: '{sort_by}'. Opciones: {', '.join(RANKING_SORT_FIELDS)}")
+
+    sort_column = getattr(PlayerRanking, sort_by)
+
+    query = select(PlayerRanking)
+    if exclude_bots:
+        query = query.where(PlayerRanking.is_bot.is_(False))
+
+    if cursor:
+        value, player_id = decode_ranking_cursor(cursor)
+        query = query.where(tuple_(sort_column, PlayerRanking.player_id) < (value, player_id))
+
+    query = query.order_by(sort_column.desc(), PlayerRanking.player_id.desc()).limit(limit + 1)
+
+    rows = db.execute(query).scalars().all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = None
+    if has_more and rows:
+        last = rows[-1]
+        next_cursor = encode_ranking_cursor(getattr(last, sort_by), last.player_id)
+
+    return {
+        "sort_by": sort_by,
+        "items": rows,
+        "next_cursor": next_cursor,
+    }
@@ -0,0 +1,146 @@
+# src/services/startup_service.py
+"""
+Tareas de arranque versionadas.
+
+Cada tarea (schema, seed) guarda en app_state_markers el fingerprint con
+el que se corrió. Al arrancar se lee una fila por tarea: si coincide no se
+hace nada, si no se corre la tarea completa y se actualiza la marca.
+
+    - schema: create_all + ensure_columns + ensure_indexes
+    - seed:   bots + usuarios/jugadores iniciales + relaciones + backfills
+"""
+
+import hashlib
+import json
+
+from sqlalchemy import inspect, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+import src.models  # registra todos los modelos en Base.metadata
+from src.database import Base, engine, SessionLocal, ensure_columns, ensure_indexes
+from src.models.app_state import AppStateMarker
+from src.scripts.init_los_pibes import INITIAL_USERS, INITIAL_PLAYER_RELATIONS
+from src.services.player_service import backfill_recent_results_bits
+from src.services.ranking_service import refresh_player_rankings
+from src.utils.init_bots import create_bot_players
+from src.utils.logger_config import app_logger as logger
+from src.utils.seed_initial_data import seed_users_and_players, seed_player_relations
+
+
+SCHEMA_MARKER = "schema"
+SEED_MARKER = "seed"
+
+# Subir a mano para forzar un re-seed aunque los datos no hayan cambiado
+SEED_VERSION = 1
+TOTAL_BOTS = 20
+
+
+# =========================
+# Fingerprints
+# =========================
+
+def _sha256(payload) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def schema_fingerprint() -> str:
+    """
+    Hash de tablas, columnas e índices declarados en los modelos.
+    Cambia cuando se agrega una tabla, columna o índice.
+    """
+    tables = []
+    for table in Base.metadata.sorted_tables:
+        tables.append({
+            "name": table.name,
+            "columns": [
+                [c.name, str(c.type.compile(engine.dialect)), c.nullable, c.server_default is not None]
+                for c in table.columns
+            ],
+            "indexes": sorted(index.name for index in table.indexes),
+        })
+    return _sha256(tables)
+
+
+def seed_fingerprint() -> str:
+    """
+    Hash de los datos iniciales + schema: si cambia cualquiera de los dos
+    hay que volver a seedear.
+    """
+    return _sha256({
+        "version": SEED_VERSION,
+        "bots": TOTAL_BOTS,
+        "users": INITIAL_USERS,
+        "relations": INITIAL_PLAYER_RELATIONS,
+        "schema": schema_fingerprint(),
+    })
+
+
+# =========================
+# Marcas
+# =========================
+
+def read_marker(db: Session, key: str) -> str | None:
+    return db.scalar(select(AppStateMarker.version).where(AppStateMarker.key == key))
+
+
+def write_marker(db: Session, key: str, version: str) -> None:
+    stmt = pg_insert(AppStateMarker).values(key=key, version=version)
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[AppStateMarker.key],
+        set_={"version": stmt.excluded.version, "updated_at": stmt.excluded.updated_at},
+    ))
+    db.commit()
+
+
+# =========================
+# Tareas
+# =========================
+
+def ensure_schema() -> bool:
+    """
+    Corre create_all + ensure_columns + ensure_indexes solo si los modelos
+    cambiaron desde la última vez. Retorna True si tocó el schema.
+    """
+    version = schema_fingerprint()
+
+    # Base nueva: ni siquiera existe la tabla de marcas
+    if inspect(engine).has_table(AppStateMarker.__tablename__):
+        with SessionLocal() as db:
+            if read_marker(db, SCHEMA_MARKER) == version:
+                logger.info("Schema al día, se saltea create_all")
+                return False
+
+    logger.info("Creando tablas en la base de datos (si no existen)...")
+    Base.metadata.create_all(bind=engine)
+    ensure_columns()
+    ensure_indexes()
+
+    with SessionLocal() as db:
+        write_marker(db, SCHEMA_MARKER, version)
+    logger.info("Tablas creadas correctamente.")
+    return True
+
+
+def run_startup_seed(db: Session) -> bool:
+    """
+    Seed completo (en bulk) solo si cambió la versión. Retorna True si seedeó.
+    """
+    version = seed_fingerprint()
+    if read_marker(db, SEED_MARKER) == version:
+        logger.info("Seed al día, se saltea")
+        return False
+
+    # 1️⃣ Datos iniciales
+    create_bot_players(db, total_bots=TOTAL_BOTS)
+    seed_users_and_players(db)
+    seed_player_relations(db)
+
+    # 2️⃣ Backfills que dependen del schema
+    backfill_recent_results_bits(db)
+    refresh_player_rankings(db)  # backfill del ranking materializado
+
+    # 3️⃣ Marca
+    write_marker(db, SEED_MARKER, version)
+    logger.info("Seed aplicado")
+    return True
@@ -83,19 +83,21 @@ def get_team_relations(players: List[Player], db: Session) -> Dict[str, List[Tup
     player_ids = [p.id for p in players]
     player_lookup = {p.id: p.name for p in players}
 
+    # Una sola query en vez de una por par: ambos lados dentro del equipo
+    relations = {
+        tuple(sorted((r.player1_id, r.player2_id))): r
+        for r in db.query(PlayerRelation).filter(
+            PlayerRelation.player1_id.in_(player_ids),
+            PlayerRelation.player2_id.in_(player_ids),
+        )
+    }
+
     for i in range(len(player_ids)):
         for j in range(i + 1, len(player_ids)):
             id1 = player_ids[i]
             id2 = player_ids[j]
 
-            relation = (
-                db.query(PlayerRelation)
-                .filter(
-                    ((PlayerRelation.player1_id == id1) & (PlayerRelation.player2_id == id2)) |
-                    ((PlayerRelation.player1_id == id2) & (PlayerRelation.player2_id == id1))
-                )
-                .first()
-            )
+            relation = relations.get(tuple(sorted((id1, id2))))
 
             if not relation:
                 continue  # No hay relación previa
@@ -0,0 +1,81 @@
+# src/services/telegram_file_cache_service.py
+
+import hashlib
+from datetime import datetime
+from io import BytesIO
+from typing import Optional
+
+from sqlalchemy import update, delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from src.models.telegram_file_cache import TelegramFileCache
+
+
+def compute_render_hash(image: bytes | BytesIO) -> str:
+    """
+    sha256 de los bytes de la imagen. Si el buffer ya trae render_hash
+    (lo setean generate_match_card / _save_to_buffer) se reutiliza.
+    """
+    if isinstance(image, BytesIO):
+        cached = getattr(image, "render_hash", None)
+        if cached:
+            return cached
+        image = image.getvalue()
+    return hashlib.sha256(image).hexdigest()
+
+
+def get_cached_file_id(db: Session, render_hash: str) -> Optional[str]:
+    entry = (
+        db.query(TelegramFileCache.file_id)
+        .filter(TelegramFileCache.render_hash == render_hash)
+        .first()
+    )
+    if entry is None:
+        return None
+
+    db.execute(
+        update(TelegramFileCache)
+        .where(TelegramFileCache.render_hash == render_hash)
+        .values(last_used_at=datetime.utcnow())
+    )
+    db.commit()
+    return entry.file_id
+
+
+def save_file_id(
+    db: Session,
+    render_hash: str,
+    file_id: str,
+    kind: str,
+    file_unique_id: Optional[str] = None,
+) -> None:
+    """
+    Guarda (o reemplaza) el file_id de un render_hash.
+    """
+    stmt = pg_insert(TelegramFileCache).values(
+        render_hash=render_hash,
+        kind=kind,
+        file_id=file_id,
+        file_unique_id=file_unique_id,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[TelegramFileCache.render_hash],
+        set_={
+            "file_id": stmt.excluded.file_id,
+            "file_unique_id": stmt.excluded.file_unique_id,
+            "last_used_at": datetime.utcnow(),
+        },
+    )
+    db.execute(stmt)
+    db.commit()
+
+
+def forget_file_id(db: Session, render_hash: str) -> None:
+    """
+    Borra la entrada (por ejemplo si Telegram rechazó el file_id).
+    """
+    db.execute(
+        delete(TelegramFileCache).where(TelegramFileCache.render_hash == render_hash)
+    )
+    db.commit()
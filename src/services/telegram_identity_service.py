@@ -1,10 +1,60 @@
 # src/services/telegram_identity_service.py
 
+from dataclasses import dataclass
 from sqlalchemy.orm import Session
 from typing import Optional
 
+from src.config import settings
 from src.models.telegram_identity import TelegramIdentity
 from src.models.user import User
+from src.utils.ttl_cache import TTLCache
+
+
+# =========================
+# Identity cache
+# =========================
+
+@dataclass(frozen=True)
+class CachedIdentity:
+    """
+    Copia liviana (sin sesión) de una TelegramIdentity activa y su usuario.
+    Es lo que necesitan los handlers para saber quién está hablando.
+    """
+    id: int
+    telegram_user_id: int
+    telegram_username: Optional[str]
+    user_id: Optional[int]
+    username: Optional[str]
+
+
+_identity_cache = TTLCache(ttl_seconds=settings.IDENTITY_CACHE_TTL_SECONDS)
+
+
+def resolve_identity(
+    db: Session,
+    telegram_user_id: int
+) -> Optional[CachedIdentity]:
+    """
+    Devuelve la identidad activa de un telegram_user_id usando el cache.
+    Solo consulta la base en un miss (o cuando venció el TTL).
+    """
+    def _load() -> Optional[CachedIdentity]:
+        identity = get_identity_by_telegram_user_id(db, telegram_user_id)
+        if identity is None:
+            return None
+        return CachedIdentity(
+            id=identity.id,
+            telegram_user_id=identity.telegram_user_id,
+            telegram_username=identity.telegram_username,
+            user_id=identity.user_id,
+            username=identity.user.username if identity.user else None,
+        )
+
+    return _identity_cache.get_or_set(telegram_user_id, _load)
+
+
+def invalidate_identity_cache(telegram_user_id: int) -> None:
+    _identity_cache.invalidate(telegram_user_id)
 
 
 # =========================
@@ -66,6 +116,7 @@ def create_identity_if_not_exists(
             identity.telegram_username = telegram_username
             db.commit()
             db.refresh(identity)
+            invalidate_identity_cache(identity.telegram_user_id)
         return identity
 
     identity = TelegramIdentity(
@@ -108,6 +159,7 @@ def link_identity_to_user(
     identity.user_id =  user_id
     db.commit()
     db.refresh(identity)
+    invalidate_identity_cache(identity.telegram_user_id)
     return identity
 
 
@@ -115,7 +167,7 @@ def link_identity_to_user(
 # State helpers
 # =========================
 
-def is_identity_linked(identity: TelegramIdentity) -> bool:
+def is_identity_linked(identity: TelegramIdentity | CachedIdentity) -> bool:
     """
     Indica si la identidad ya está vinculada a un usuario.
     """
@@ -132,6 +184,7 @@ def deactivate_identity(
     identity.is_active = False
     db.commit()
     db.refresh(identity)
+    invalidate_identity_cache(identity.telegram_user_id)
     return identity
 
 def _get_user_id(user) -> int:
@@ -163,4 +216,5 @@ def unlink_identity_from_user(
     identity.user_id = None
     db.commit()
     db.refresh(identity)
+    invalidate_identity_cache(identity.telegram_user_id)
     return identity
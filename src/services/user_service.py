@@ -2,6 +2,7 @@ from sqlalchemy.orm import Session
 
 from src.models.user import User
 from src.services.player_service import create_player_for_user
+from src.services.ranking_service import refresh_player_rankings
 from typing import Optional, Dict
 
 
@@ -46,6 +47,7 @@ def create_user(
     )
 
     db.commit()
+    refresh_player_rankings(db, [new_user.player.id])
     db.refresh(new_user)
 
     logger.info(f"Usuario creado: {new_user.username}")
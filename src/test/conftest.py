@@ -1,11 +1,23 @@
+from contextlib import contextmanager
+
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 from sqlalchemy.orm import sessionmaker, Session
 from src.main import app
 from src.database import Base, get_db, engine
+from src.services.player_response_cache import clear_player_responses
+from src.services.player_evaluation_service import clear_permission_cache
+from src.services.auth_service import clear_token_version_cache
+from src.services.cache_sync_service import reset_cache_sync
+from src.config import settings
 
 SessionLocal = sessionmaker(bind=engine)
 
+# Los tests corren en un solo proceso: sin sincronizar caches por la base
+# (no suma queries a los tests que las cuentan). test_cache_sync la prueba
+settings.CACHE_SYNC_INTERVAL_SECONDS = 0
+
 # Cache para saber el nivel de cada item (necesario para reporte)
 item_niveles_cache = {}
 
@@ -43,9 +55,42 @@ def client(db_session):
 def reset_database(db_session: Session):
     Base.metadata.drop_all(bind=db_session.get_bind())
     Base.metadata.create_all(bind=db_session.get_bind())
+    # drop/create recrea los tipos (ej: enum teamenum) con otro OID: las
+    # conexiones del pool con statements preparados de antes fallarían con
+    # "cached plan must not change result type"
+    engine.dispose()
+    # los caches en memoria sobreviven entre tests
+    clear_player_responses()
+    clear_permission_cache()
+    clear_token_version_cache()
+    reset_cache_sync()
     yield
     db_session.commit()
 
+@pytest.fixture(scope="function")
+def count_queries():
+    """
+    Captura los statements SQL que se ejecutan dentro del bloque:
+
+        with count_queries() as statements:
+            ...
+        assert len(statements) == 1
+    """
+    @contextmanager
+    def _count():
+        statements = []
+
+        def _record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", _record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", _record)
+
+    return _count
+
 # Marcas y niveles
 niveles_ejecucion = ["bajo", "medio", "alto"]
 estado_niveles = {nivel: {"passed": 0, "failed": 0, "skipped": 0} for nivel in niveles_ejecucion}
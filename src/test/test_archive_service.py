@@ -0,0 +1,100 @@
+import pytest
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from src.models import Match, Team, Notification, MatchResultReply
+from src.models.archive import NotificationArchive, MatchResultReplyArchive
+from src.services.archive_service import archive_old_rows, get_archive_metrics
+from src.test.utils_common_methods import TestUtils
+from src.utils.logger_config import test_logger as logger
+
+utils = TestUtils()
+
+
+def _notification(user_id: int, status: str, when: datetime) -> Notification:
+    return Notification(
+        user_id=user_id,
+        event_type="MATCH_EVALUATION",
+        channel="telegram",
+        status=status,
+        payload={"match_id": 1},
+        available_at=when,
+        sent_at=when if status == "sent" else None,
+    )
+
+
+@pytest.mark.nivel("medio")
+def test_archive_moves_only_old_finished_rows(client: TestClient, db_session: Session):
+    user_id = utils.create_player(client, "archive_user")
+
+    now = datetime.utcnow()
+    old = now - timedelta(days=60)
+    recent = now - timedelta(days=1)
+
+    # ─────────────────────────────
+    # Notificaciones
+    # ─────────────────────────────
+    db_session.add_all([
+        _notification(user_id, "sent", old),
+        _notification(user_id, "sent", old),
+        _notification(user_id, "sent", recent),
+        _notification(user_id, "pending", old),
+    ])
+
+    # ─────────────────────────────
+    # Matches: uno cerrado y uno abierto
+    # ─────────────────────────────
+    team = Team(name="Team 1")
+    db_session.add(team)
+    db_session.flush()
+
+    closed_match = Match(date=old, team1_id=team.id, winner_team_id=team.id)
+    open_match = Match(date=old)
+    db_session.add_all([closed_match, open_match])
+    db_session.flush()
+
+    db_session.add_all([
+        MatchResultReply(match_id=closed_match.id, user_id=user_id, result="win", pending=False, replied_at=old),
+        MatchResultReply(match_id=open_match.id, user_id=user_id, result="win", pending=False, replied_at=old),
+    ])
+    db_session.commit()
+
+    # ─────────────────────────────
+    # Dry-run: cuenta pero no mueve
+    # ─────────────────────────────
+    summary = archive_old_rows(db_session, now=now, retention_days=30, dry_run=True)
+    logger.info(f"Dry-run: {summary}")
+
+    assert summary["notifications"] == 2
+    assert summary["match_result_replies"] == 1
+    assert db_session.query(Notification).count() == 4
+    assert db_session.query(NotificationArchive).count() == 0
+
+    # ─────────────────────────────
+    # Ejecución real en lotes de 1
+    # ─────────────────────────────
+    summary = archive_old_rows(db_session, now=now, retention_days=30, batch_size=1, dry_run=False)
+    logger.info(f"Archivado: {summary}")
+
+    assert summary["notifications"] == 2
+    assert summary["match_result_replies"] == 1
+
+    remaining_status = sorted(n.status for n in db_session.query(Notification).all())
+    assert remaining_status == ["pending", "sent"]
+    assert db_session.query(NotificationArchive).count() == 2
+
+    remaining_replies = db_session.query(MatchResultReply).all()
+    assert [r.match_id for r in remaining_replies] == [open_match.id]
+
+    archived_reply = db_session.query(MatchResultReplyArchive).one()
+    assert archived_reply.match_id == closed_match.id
+    assert archived_reply.archived_at is not None
+
+    # ─────────────────────────────
+    # Métricas
+    # ─────────────────────────────
+    metrics = get_archive_metrics(db_session)
+    assert "notifications" in metrics
+    assert "notifications_archive" in metrics
+    assert metrics["notifications"]["total_bytes"] > 0
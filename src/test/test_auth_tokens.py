@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from jose import jwt
+from sqlalchemy.orm import Session
+
+from src.database import SessionLocal
+from src.services import auth_service
+from src.services.auth_service import SECRET_KEY, ALGORITHM, create_access_token, get_authenticated_user, \
+    clear_token_version_cache, revoke_user_tokens
+from src.test.utils_common_methods import TestUtils
+
+utils = TestUtils()
+
+
+def _me(client: TestClient, token: str):
+    return client.get("/maxio/users/me", headers={"Authorization": f"Bearer {token}"})
+
+
+def _users_queries(statements: list[str]) -> int:
+    return sum(1 for s in statements if "FROM users" in s)
+
+
+@pytest.mark.nivel("medio")
+def test_token_fast_path_and_revocation(client: TestClient, db_session: Session, count_queries):
+    user_id = utils.create_player(client, "token_user")
+
+    # ─────────────────────────────
+    # El token lleva id y versión; validarlo no consulta users (cache caliente)
+    # ─────────────────────────────
+    token = utils.login(client, "token_user")
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    assert payload["uid"] == user_id and payload["ver"] == 0
+
+    with count_queries() as statements:
+        asyncio.run(get_authenticated_user(token))
+    assert _users_queries(statements) == 1
+
+    with count_queries() as statements:
+        asyncio.run(get_authenticated_user(token))
+    assert _users_queries(statements) == 0
+    assert asyncio.run(get_authenticated_user(token)).username == "token_user"
+
+    res = _me(client, token)
+    assert res.status_code == 200 and res.json()["id"] == user_id
+
+    # Tokens sin uid/ver (formato anterior) ya no valen
+    legacy = create_access_token({"sub": "token_user"})
+    assert _me(client, legacy).status_code == 401
+
+    # ─────────────────────────────
+    # Logout: revoca el token actual
+    # ─────────────────────────────
+    res = client.post("/auth/logout", headers={"Authorization": f"Bearer {token}"})
+    assert res.status_code == 200, res.text
+    assert _me(client, token).status_code == 401
+    with pytest.raises(HTTPException):
+        asyncio.run(get_authenticated_user(token))
+
+    # ─────────────────────────────
+    # Cambio de password: revoca todo y devuelve un token nuevo
+    # ─────────────────────────────
+    token = utils.login(client, "token_user")
+    other_session = utils.login(client, "token_user")
+    res = client.post(
+        "/auth/change-password",
+        json={"current_password": "testpass", "new_password": "nuevapass"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert res.status_code == 200, res.text
+    new_token = res.json()["access_token"]
+
+    assert _me(client, token).status_code == 401
+    assert _me(client, other_session).status_code == 401
+    assert _me(client, new_token).status_code == 200
+    assert client.post("/auth/login", json={"username": "token_user", "password": "testpass"}).status_code == 401
+    utils.login(client, "token_user", "nuevapass")
+
+    # Password actual incorrecta => no cambia nada
+    res = client.post(
+        "/auth/change-password",
+        json={"current_password": "otra", "new_password": "123456789"},
+        headers={"Authorization": f"Bearer {new_token}"},
+    )
+    assert res.status_code == 401
+    assert _me(client, new_token).status_code == 200
+
+
+@pytest.mark.nivel("medio")
+def test_slow_cache_fill_does_not_undo_revocation(client: TestClient, db_session: Session, monkeypatch):
+    user_id = utils.create_player(client, "race_user")
+    token = utils.login(client, "race_user")
+    clear_token_version_cache()
+
+    # ─────────────────────────────
+    # Un logout entra entre la lectura de la versión y el set en cache
+    # ─────────────────────────────
+    load_version = auth_service._load_token_version
+
+    def _load_then_revoke(uid: int) -> int | None:
+        stale = load_version(uid)
+        with SessionLocal() as other:
+            revoke_user_tokens(other, uid)
+        return stale
+
+    monkeypatch.setattr(auth_service, "_load_token_version", _load_then_revoke)
+    with pytest.raises(HTTPException):
+        asyncio.run(get_authenticated_user(token))
+
+    # La versión cacheada sigue siendo la del logout
+    monkeypatch.setattr(auth_service, "_load_token_version", load_version)
+    with pytest.raises(HTTPException):
+        asyncio.run(get_authenticated_user(token))
+    assert auth_service._token_version_cache.get(user_id) == 1
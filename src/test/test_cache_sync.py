@@ -0,0 +1,80 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from src.config import settings
+from src.models import CacheGeneration, User
+from src.services.auth_service import get_authenticated_user
+from src.services.player_response_cache import get_or_build_response, invalidate_player_responses
+from src.test.utils_common_methods import TestUtils
+
+utils = TestUtils()
+
+SYNC_SECONDS = 0.05
+
+
+def _other_process_invalidates(db: Session, name: str) -> None:
+    """
+    Lo que hace publish_invalidation en otro proceso: solo la fila de la base.
+    """
+    stmt = pg_insert(CacheGeneration).values(name=name, generation=1)
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[CacheGeneration.name],
+        set_={"generation": CacheGeneration.generation + 1},
+    ))
+    db.commit()
+
+
+@pytest.mark.nivel("medio")
+def test_invalidation_reaches_other_processes(db_session: Session, monkeypatch):
+    monkeypatch.setattr(settings, "CACHE_SYNC_INTERVAL_SECONDS", SYNC_SECONDS)
+    builds = []
+
+    def _build():
+        builds.append(1)
+        return {"n": len(builds)}, [1]
+
+    # ─────────────────────────────
+    # Miss + hit en este proceso
+    # ─────────────────────────────
+    assert get_or_build_response("sync", _build).body == b'{"n":1}'
+    assert get_or_build_response("sync", _build).body == b'{"n":1}'
+
+    # ─────────────────────────────
+    # Otro proceso invalida: se ve pasado el intervalo
+    # ─────────────────────────────
+    _other_process_invalidates(db_session, "player_responses")
+    time.sleep(SYNC_SECONDS * 2)
+    assert get_or_build_response("sync", _build).body == b'{"n":2}'
+
+    # ─────────────────────────────
+    # Una invalidación propia (de otro jugador) no vacía el resto
+    # ─────────────────────────────
+    invalidate_player_responses([999])
+    time.sleep(SYNC_SECONDS * 2)
+    assert get_or_build_response("sync", _build).body == b'{"n":2}'
+    assert db_session.get(CacheGeneration, "player_responses").generation == 2
+
+
+@pytest.mark.nivel("medio")
+def test_logout_in_other_process_revokes_here(client: TestClient, db_session: Session, monkeypatch):
+    monkeypatch.setattr(settings, "CACHE_SYNC_INTERVAL_SECONDS", SYNC_SECONDS)
+    user_id = utils.create_player(client, "sync_token_user")
+    token = utils.login(client, "sync_token_user")
+    assert asyncio.run(get_authenticated_user(token)).id == user_id  # versión cacheada
+
+    # ─────────────────────────────
+    # Logout atendido por otro proceso: sube la versión y publica
+    # ─────────────────────────────
+    db_session.query(User).filter(User.id == user_id).update({"token_version": User.token_version + 1})
+    db_session.commit()
+    _other_process_invalidates(db_session, "token_versions")
+
+    time.sleep(SYNC_SECONDS * 2)
+    with pytest.raises(HTTPException):
+        asyncio.run(get_authenticated_user(token))
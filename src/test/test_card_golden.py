@@ -0,0 +1,94 @@
+import os
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+from PIL import Image, ImageChops, ImageFilter
+
+from src.services.match_service import render_match_card
+from src.services.player_service import generate_player_card_from_player
+from src.services.photo_upload_service import generate_photo_thumbnail
+from src.utils.card_samples import sample_match_report, sample_player, write_stub_photo
+
+# Cartas de referencia (a media resolución para no inflar el repo).
+# Para regenerarlas después de un cambio visual intencional:
+#     UPDATE_GOLDEN=1 python -m pytest src/test/test_card_golden.py
+GOLDEN_DIR = Path(__file__).parent / "golden"
+GOLDEN_SCALE = 0.5
+
+# Diferencia perceptual: se suaviza (tolera antialiasing / versión de
+# FreeType) y se cuentan los píxeles que cambian más de PIXEL_TOLERANCE
+PIXEL_TOLERANCE = 24
+MAX_CHANGED_RATIO = 0.005
+
+
+def _downscale(png: bytes) -> Image.Image:
+    image = Image.open(BytesIO(png)).convert("RGBA")
+    size = (int(image.width * GOLDEN_SCALE), int(image.height * GOLDEN_SCALE))
+    return image.resize(size, Image.LANCZOS)
+
+
+def perceptual_diff(expected: Image.Image, actual: Image.Image) -> float:
+    """
+    Proporción de píxeles que cambian de forma visible (0..1).
+    """
+    assert expected.size == actual.size, f"tamaño {actual.size} != {expected.size}"
+    blur = ImageFilter.GaussianBlur(1)
+    diff = ImageChops.difference(expected.filter(blur), actual.filter(blur))
+    # Máximo por canal de cada píxel
+    channels = diff.split()
+    worst = channels[0]
+    for channel in channels[1:]:
+        worst = ImageChops.lighter(worst, channel)
+    changed = worst.point(lambda p: 255 if p > PIXEL_TOLERANCE else 0).histogram()[255]
+    return changed / (worst.width * worst.height)
+
+
+def _assert_matches_golden(name: str, png: bytes) -> None:
+    actual = _downscale(png)
+    golden = GOLDEN_DIR / f"{name}.png"
+
+    if os.getenv("UPDATE_GOLDEN") == "1":
+        GOLDEN_DIR.mkdir(exist_ok=True)
+        actual.save(golden, format="PNG", optimize=True)
+        return
+    assert golden.exists(), f"Falta {golden} (generarlo con UPDATE_GOLDEN=1)"
+
+    ratio = perceptual_diff(Image.open(golden).convert("RGBA"), actual)
+    assert ratio <= MAX_CHANGED_RATIO, f"{name}: {ratio:.2%} de píxeles distintos al golden"
+
+
+@pytest.mark.nivel("medio")
+def test_match_card_golden():
+    _assert_matches_golden("match_card", render_match_card(sample_match_report()).getvalue())
+
+
+@pytest.mark.nivel("medio")
+def test_player_card_golden(tmp_path):
+    # ─────────────────────────────
+    # Sin foto (foto por defecto)
+    # ─────────────────────────────
+    png = generate_player_card_from_player(sample_player()).getvalue()
+    _assert_matches_golden("player_card", png)
+
+    # ─────────────────────────────
+    # Con foto stub + miniatura, como después de un upload
+    # ─────────────────────────────
+    photo = write_stub_photo(tmp_path)
+    generate_photo_thumbnail(str(photo))
+    png = generate_player_card_from_player(sample_player(photo_path=str(photo))).getvalue()
+    _assert_matches_golden("player_card_photo", png)
+
+
+@pytest.mark.nivel("medio")
+def test_perceptual_diff_detects_changes():
+    base = _downscale(render_match_card(sample_match_report()).getvalue())
+
+    # Otro reporte => otra carta
+    other = _downscale(render_match_card(sample_match_report(seed=8)).getvalue())
+    assert perceptual_diff(base, other) > MAX_CHANGED_RATIO
+
+    # Ruido de 1 px (antialiasing) no cuenta
+    shifted = base.copy()
+    shifted.putpixel((10, 10), (0, 0, 0, 255))
+    assert perceptual_diff(base, shifted) <= MAX_CHANGED_RATIO
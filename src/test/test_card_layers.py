@@ -0,0 +1,61 @@
+import os
+import shutil
+
+import pytest
+from PIL import Image, ImageChops, ImageDraw
+
+from src.config import Settings
+from src.services.match_service_image import load_match_base_layer, _build_match_layout, _draw_team_block, \
+    _draw_team_relations, _match_base_layer
+
+
+class _EmptyTeam:
+    individual_stats = []
+
+
+class _EmptyReport:
+    teams = {"team_1": _EmptyTeam(), "team_2": _EmptyTeam()}
+    relations_summary = {}
+
+
+@pytest.mark.nivel("medio")
+def test_match_base_layer_matches_full_render(tmp_path, monkeypatch):
+    # ─────────────────────────────
+    # Capas estáticas precompuestas == dibujarlas sobre el template crudo
+    # ─────────────────────────────
+    expected = Image.open(Settings.API_MATCH_TEMPLATE_PATH).convert("RGBA")
+    draw = ImageDraw.Draw(expected)
+    regions = _build_match_layout(draw, expected, debug=False)
+    _draw_team_block(draw, expected, regions["team_1"], _EmptyTeam(), side="left")
+    _draw_team_block(draw, expected, regions["team_2"], _EmptyTeam(), side="right")
+    _draw_team_relations(draw, expected, regions["relations"], _EmptyReport())
+
+    base = load_match_base_layer()
+    draw = ImageDraw.Draw(base)
+    _draw_team_block(draw, base, regions["team_1"], _EmptyTeam(), side="left", draw_background=False)
+    _draw_team_block(draw, base, regions["team_2"], _EmptyTeam(), side="right", draw_background=False)
+    _draw_team_relations(draw, base, regions["relations"], _EmptyReport(), draw_background=False)
+
+    assert ImageChops.difference(expected, base).getbbox() is None
+
+    # Cada render recibe una copia: dibujar encima no ensucia el cache
+    draw.rectangle((0, 0, 50, 50), fill=(255, 0, 0, 255))
+    assert load_match_base_layer().getpixel((10, 10)) != (255, 0, 0, 255)
+
+    # ─────────────────────────────
+    # Template nuevo (otro mtime) => se recompone
+    # ─────────────────────────────
+    template = tmp_path / "template_match_card.png"
+    shutil.copy(Settings.API_MATCH_TEMPLATE_PATH, template)
+    monkeypatch.setattr(Settings, "API_MATCH_TEMPLATE_PATH", template)
+
+    load_match_base_layer()
+    misses = _match_base_layer.cache_info().misses
+    load_match_base_layer()
+    assert _match_base_layer.cache_info().misses == misses
+
+    Image.new("RGB", Image.open(template).size, (0, 0, 255)).save(template)
+    stat = os.stat(template)
+    os.utime(template, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert load_match_base_layer().getpixel((0, 0))[:3] == (0, 0, 255)
+    assert _match_base_layer.cache_info().misses == misses + 1
@@ -0,0 +1,70 @@
+import pytest
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from src.models import Match, Team, Player
+from src.models.match import MatchPlayer, TeamEnum
+from src.services.elo_replay_service import replay_elo
+from src.services.match_service import assign_match_winner
+from src.test.utils_common_methods import TestUtils
+
+utils = TestUtils()
+
+
+@pytest.mark.nivel("medio")
+def test_replay_matches_live_updates(client: TestClient, db_session: Session):
+    names = [f"replay_{i}" for i in range(4)]
+    for name in names:
+        utils.create_player(client, name)
+    players = db_session.query(Player).filter(Player.name.in_(names)).order_by(Player.id).all()
+
+    # ─────────────────────────────
+    # 12 matches 2 vs 2 cerrados por el camino normal
+    # ─────────────────────────────
+    start = datetime.utcnow() - timedelta(days=30)
+    for n in range(12):
+        team_1, team_2 = Team(name=f"A{n}"), Team(name=f"B{n}")
+        db_session.add_all([team_1, team_2])
+        db_session.flush()
+
+        match = Match(date=start + timedelta(days=n), max_players=4, team1_id=team_1.id, team2_id=team_2.id)
+        db_session.add(match)
+        db_session.flush()
+
+        rotation = players[n % 4:] + players[:n % 4]
+        db_session.add_all(
+            [MatchPlayer(match_id=match.id, player_id=p.id, team=TeamEnum.team1) for p in rotation[:2]]
+            + [MatchPlayer(match_id=match.id, player_id=p.id, team=TeamEnum.team2) for p in rotation[2:]]
+        )
+        db_session.commit()
+        db_session.refresh(match)
+
+        assign_match_winner(match, team_1 if n % 3 else team_2, db_session)
+
+    expected = {
+        p.id: (p.cant_partidos, p.cant_partidos_ganados, p.recent_results, p.elo)
+        for p in db_session.query(Player).filter(Player.name.in_(names))
+    }
+
+    # ─────────────────────────────
+    # Romper los datos y re-jugar
+    # ─────────────────────────────
+    for p in db_session.query(Player).filter(Player.name.in_(names)):
+        p.elo = 1500
+        p.cant_partidos = 0
+        p.recent_results = []
+    db_session.commit()
+
+    dry = replay_elo(db_session, dry_run=True)
+    assert dry["matches"] == 12
+    assert dry["players_changed"] == 4
+
+    summary = replay_elo(db_session)
+    assert summary["players_changed"] == 4
+
+    db_session.expire_all()
+    for p in db_session.query(Player).filter(Player.name.in_(names)):
+        assert (p.cant_partidos, p.cant_partidos_ganados, p.recent_results, p.elo) == expected[p.id]
+
+    assert replay_elo(db_session, dry_run=True)["players_changed"] == 0
@@ -0,0 +1,83 @@
+import pytest
+from datetime import datetime
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from src.database import SessionLocal
+from src.models import Match, Player, PlayerEvaluationPermission
+from src.models.match import MatchPlayer, TeamEnum
+from src.services.player_evaluation_service import (
+    create_evaluation_permissions_from_match,
+    can_player_evaluate,
+    get_evaluable_target_ids,
+    grant_evaluation_permission,
+)
+from src.test.utils_common_methods import TestUtils
+
+utils = TestUtils()
+
+
+@pytest.mark.nivel("medio")
+def test_match_permissions_are_set_based_and_cached(client: TestClient, db_session: Session, count_queries):
+    names = [f"perm_{i}" for i in range(4)]
+    for name in names:
+        utils.create_player(client, name)
+    utils.create_player(client, "perm_outsider")
+    players = db_session.query(Player).filter(Player.name.in_(names)).order_by(Player.id).all()
+    outsider = db_session.query(Player).filter(Player.name == "perm_outsider").one()
+
+    match = Match(date=datetime.utcnow(), max_players=4)
+    db_session.add(match)
+    db_session.flush()
+    db_session.add_all([
+        MatchPlayer(match_id=match.id, player_id=p.id, team=TeamEnum.team1 if i < 2 else TeamEnum.team2)
+        for i, p in enumerate(players)
+    ])
+    db_session.commit()
+
+    # ─────────────────────────────
+    # 4 jugadores → 12 permisos, idempotente
+    # ─────────────────────────────
+    assert create_evaluation_permissions_from_match(db_session, match.id) == 12
+    assert create_evaluation_permissions_from_match(db_session, match.id) == 0
+    assert db_session.query(PlayerEvaluationPermission).count() == 12
+
+    # ─────────────────────────────
+    # can_player_evaluate usa el set cacheado
+    # ─────────────────────────────
+    evaluator_id, teammate_id, rival_id, outsider_id = players[0].id, players[1].id, players[3].id, outsider.id
+    assert can_player_evaluate(db_session, evaluator_id, rival_id)
+
+    with count_queries() as statements:
+        assert can_player_evaluate(db_session, evaluator_id, teammate_id)
+        assert not can_player_evaluate(db_session, evaluator_id, outsider_id)
+        assert not can_player_evaluate(db_session, evaluator_id, evaluator_id)
+    assert statements == []
+
+
+@pytest.mark.nivel("medio")
+def test_grant_during_load_is_not_lost(client: TestClient, db_session: Session, monkeypatch):
+    evaluator_id = db_session.query(Player.id).filter(
+        Player.user_id == utils.create_player(client, "grant_evaluator")
+    ).scalar()
+    target_id = db_session.query(Player.id).filter(
+        Player.user_id == utils.create_player(client, "grant_target")
+    ).scalar()
+
+    # ─────────────────────────────
+    # El permiso se commitea justo después de que se leyó el set
+    # ─────────────────────────────
+    scalars = db_session.scalars
+
+    def _scalars_then_grant(*args, **kwargs):
+        result = list(scalars(*args, **kwargs))
+        with SessionLocal() as other:
+            grant_evaluation_permission(other, evaluator_id, target_id)
+        return result
+
+    monkeypatch.setattr(db_session, "scalars", _scalars_then_grant)
+    assert get_evaluable_target_ids(db_session, evaluator_id) == frozenset()
+    monkeypatch.undo()
+
+    # El set viejo no quedó en cache: se vuelve a leer con el permiso
+    assert get_evaluable_target_ids(db_session, evaluator_id) == {target_id}
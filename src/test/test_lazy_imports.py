@@ -0,0 +1,33 @@
+import subprocess
+import sys
+
+import pytest
+
+
+def _loaded_modules(module: str) -> set[str]:
+    """
+    Módulos cargados después de importar `module` en un proceso nuevo.
+    """
+    code = f"import sys, {module}; print('\\n'.join(sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return set(result.stdout.split())
+
+
+@pytest.mark.nivel("medio")
+def test_api_does_not_import_pillow_or_telegram():
+    loaded = _loaded_modules("src.main")
+
+    # ─────────────────────────────
+    # La API no carga el stack del bot ni Pillow al importar
+    # ─────────────────────────────
+    assert "PIL" not in loaded
+    assert "telegram" not in loaded
+    assert "src.bot.telegram_bot" not in loaded
+    assert "src.services.match_service_image" not in loaded
+
+    # ─────────────────────────────
+    # El worker usa telegram pero no los handlers del bot
+    # ─────────────────────────────
+    loaded = _loaded_modules("src.run_worker")
+    assert "telegram" in loaded
+    assert "src.bot.telegram_handlers" not in loaded
@@ -0,0 +1,141 @@
+import asyncio
+import threading
+
+import pytest
+from sqlalchemy import text
+
+from src.database import engine
+from src.services.leader_service import try_acquire_leadership, await_leadership, run_as_leader, exclusive
+
+
+LOCK = 9_999_001
+
+
+@pytest.mark.nivel("medio")
+def test_single_leader_and_failover():
+    # ─────────────────────────────
+    # Un solo líder por lock
+    # ─────────────────────────────
+    leader = try_acquire_leadership("test", LOCK)
+    assert leader is not None
+    assert try_acquire_leadership("test", LOCK) is None
+
+    # ─────────────────────────────
+    # Si el líder suelta (o se cae), otro toma el lugar
+    # ─────────────────────────────
+    leader.release()
+    standby = try_acquire_leadership("test", LOCK)
+    assert standby is not None
+
+    # Simula la caída: cerrar la conexión libera el lock en PostgreSQL
+    standby.connection.invalidate()
+    again = try_acquire_leadership("test", LOCK)
+    assert again is not None
+    again.release()
+
+
+@pytest.mark.nivel("medio")
+def test_standby_takes_over_in_background():
+    leader = try_acquire_leadership("test", LOCK + 2)
+
+    async def _standby():
+        # Sigue reintentando mientras el líder tiene el lock
+        waiting = asyncio.create_task(await_leadership("test", LOCK + 2, retry_seconds=0.05))
+        await asyncio.sleep(0.2)
+        assert not waiting.done()
+
+        leader.release()
+        return await asyncio.wait_for(waiting, timeout=2)
+
+    standby = asyncio.run(_standby())
+    assert standby is not None
+    standby.release()
+
+
+def _advisory_lock_pids(key: int) -> list[int]:
+    with engine.connect() as connection:
+        return list(connection.execute(text(
+            "SELECT pid FROM pg_locks WHERE locktype = 'advisory' AND objid = :key AND granted"
+        ), {"key": key}).scalars())
+
+
+def _kill_session(pid: int) -> None:
+    """
+    Corta la sesión pid desde otra conexión (como un reinicio de PostgreSQL
+    o idle_session_timeout): el servidor libera sus locks.
+    """
+    with engine.connect() as connection:
+        connection.execute(text("SELECT pg_terminate_backend(:pid)"), {"pid": pid})
+        connection.commit()
+
+
+@pytest.mark.nivel("medio")
+def test_leader_notices_lost_connection():
+    leader = try_acquire_leadership("test", LOCK + 3)
+    assert leader.is_alive()
+
+    _kill_session(_advisory_lock_pids(LOCK + 3)[0])
+    assert not leader.is_alive()
+    leader.release()  # conexión caída: no falla
+
+    # El lock quedó libre para otro
+    standby = try_acquire_leadership("test", LOCK + 3)
+    assert standby is not None
+    standby.release()
+
+
+@pytest.mark.nivel("medio")
+def test_run_as_leader_restarts_job_when_lock_is_lost():
+    starts = []
+
+    async def _scenario():
+        started = asyncio.Event()
+
+        async def _job():
+            starts.append(1)
+            started.set()
+            await asyncio.Event().wait()
+
+        task = asyncio.create_task(
+            run_as_leader("test", LOCK + 4, _job, check_seconds=0.05, retry_seconds=0.05)
+        )
+        await asyncio.wait_for(started.wait(), timeout=2)
+
+        # Se corta la sesión del líder: el job se cancela y vuelve a
+        # arrancar cuando recupera el lock
+        started.clear()
+        pids = await asyncio.to_thread(_advisory_lock_pids, LOCK + 4)
+        assert len(pids) == 1
+        await asyncio.to_thread(_kill_session, pids[0])
+        await asyncio.wait_for(started.wait(), timeout=2)
+
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(_scenario())
+    assert len(starts) == 2
+
+    # Cancelar soltó el lock
+    assert _advisory_lock_pids(LOCK + 4) == []
+
+
+@pytest.mark.nivel("medio")
+def test_exclusive_section_serializes_processes():
+    inside = []
+    overlaps = []
+
+    def _worker(n):
+        with exclusive("test", LOCK + 1):
+            if inside:
+                overlaps.append(n)
+            inside.append(n)
+            threading.Event().wait(0.05)
+            inside.remove(n)
+
+    threads = [threading.Thread(target=_worker, args=(i,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert overlaps == []
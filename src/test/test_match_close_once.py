@@ -0,0 +1,41 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from src.database import SessionLocal
+from src.models import Match
+from src.services.match_service import try_close_match_if_ready
+from src.test.utils_common_methods import TestUtils
+
+utils = TestUtils()
+
+
+@pytest.mark.nivel("medio")
+def test_match_closes_once_with_stale_copies(client: TestClient, db_session: Session):
+    # ─────────────────────────────
+    # Match 1 vs 1 con todos los votos para team1
+    # ─────────────────────────────
+    match, player_1, player_2 = utils.create_one_vs_one_match(
+        client, db_session, "close_once_1", "close_once_2", vote_win_team1=2, vote_win_team2=0
+    )
+
+    # ─────────────────────────────
+    # Dos copias del match leídas antes de cerrar (voto + dispatcher)
+    # ─────────────────────────────
+    other_session = SessionLocal()
+    try:
+        stale = other_session.get(Match, match.id)
+        assert stale.winner_team_id is None
+
+        assert try_close_match_if_ready(match, db_session) is True
+        assert try_close_match_if_ready(stale, other_session) is False
+        assert stale.winner_team_id == match.team1_id
+    finally:
+        other_session.close()
+
+    # ELO y partidos se aplicaron una sola vez
+    db_session.refresh(player_1)
+    db_session.refresh(player_2)
+    assert player_1.cant_partidos == 1 and player_1.cant_partidos_ganados == 1
+    assert player_2.cant_partidos == 1 and player_2.cant_partidos_ganados == 0
+    assert player_1.elo > 1000 > player_2.elo
@@ -0,0 +1,42 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from src.models import MatchResultReply
+from src.services.match_service import record_match_result_reply
+from src.test.utils_common_methods import TestUtils
+
+utils = TestUtils()
+
+
+@pytest.mark.nivel("medio")
+def test_reply_is_idempotent_and_closes_match(client: TestClient, db_session: Session):
+    # ─────────────────────────────
+    # Match 1 vs 1
+    # ─────────────────────────────
+    match, player_1, player_2 = utils.create_one_vs_one_match(client, db_session, "reply_user_1", "reply_user_2")
+    user_1, user_2 = player_1.user_id, player_2.user_id
+
+    # ─────────────────────────────
+    # Primer voto + doble click
+    # ─────────────────────────────
+    first = record_match_result_reply(db_session, match.id, user_1, "win", apply_now=True)
+    assert first == {"recorded": True, "applied": True, "closed": False}
+
+    again = record_match_result_reply(db_session, match.id, user_1, "win", apply_now=True)
+    assert again["recorded"] is False
+
+    db_session.refresh(match)
+    assert match.vote_win_team1 == 1
+    assert match.vote_win_team2 == 0
+    assert db_session.query(MatchResultReply).filter_by(match_id=match.id).count() == 1
+
+    # ─────────────────────────────
+    # "lose" del rival cierra el match
+    # ─────────────────────────────
+    last = record_match_result_reply(db_session, match.id, user_2, "lose", apply_now=True)
+    assert last["closed"] is True
+
+    db_session.refresh(match)
+    assert match.vote_win_team1 == 2
+    assert match.winner_team_id == match.team1_id
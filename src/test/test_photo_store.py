@@ -0,0 +1,124 @@
+import os
+import time
+from datetime import datetime, timedelta
+from io import BytesIO
+
+import pytest
+from fastapi.testclient import TestClient
+from PIL import Image
+from sqlalchemy.orm import Session
+
+from src.config import settings
+from src.models import Player, PhotoBlob
+from src.services.photo_store_service import collect_photo_garbage, migrate_legacy_photos, photo_hash_from_key, \
+    resolve_photo_path, delete_photo_files
+from src.test.utils_common_methods import TestUtils
+
+utils = TestUtils()
+
+
+def _image_bytes(color: tuple[int, int, int]) -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", (64, 64), color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _upload(client: TestClient, username: str, content: bytes) -> str:
+    res = client.post(f"/player/{username}/photo", files={"file": ("cara.png", content, "image/png")})
+    assert res.status_code == 200, res.text
+    return res.json()["photo"]
+
+
+def _refs(db: Session, key: str) -> int | None:
+    db.expire_all()
+    blob = db.query(PhotoBlob).filter(PhotoBlob.key == key).one_or_none()
+    return blob.ref_count if blob else None
+
+
+@pytest.mark.nivel("medio")
+def test_content_addressed_photo_store(client: TestClient, db_session: Session, tmp_path, monkeypatch):
+    # Store aislado: el GC no tiene que ver las fotos reales del repo
+    monkeypatch.setattr(settings, "API_PHOTO_PLAYER_PATH_FOLDER", tmp_path)
+    utils.create_player(client, "store_a")
+    utils.create_player(client, "store_b")
+    utils.create_player(client, "store_c")
+    folder = settings.API_PHOTO_PLAYER_PATH_FOLDER.resolve()
+    shared, other = _image_bytes((10, 120, 200)), _image_bytes((250, 200, 0))
+
+    # ─────────────────────────────
+    # Misma imagen para dos jugadores: un archivo, dos referencias
+    # ─────────────────────────────
+    key = _upload(client, "store_a", shared)
+    assert _upload(client, "store_b", shared) == key
+    assert photo_hash_from_key(key) is not None and not key.startswith("/")
+    assert len([p for p in folder.glob("*/*") if p.is_file() and p.stem == photo_hash_from_key(key)]) == 1
+    assert _refs(db_session, key) == 2
+
+    # Re-subir la misma foto al mismo jugador no suma referencias
+    _upload(client, "store_a", shared)
+    assert _refs(db_session, key) == 2
+
+    # ─────────────────────────────
+    # Reemplazos: se sueltan referencias, el GC respeta el margen
+    # ─────────────────────────────
+    other_key = _upload(client, "store_a", other)
+    _upload(client, "store_b", other)
+    assert _refs(db_session, key) == 0 and _refs(db_session, other_key) == 2
+
+    assert collect_photo_garbage(db_session)["orphan_blobs"] == 0
+    assert resolve_photo_path(key).exists()
+
+    dry = collect_photo_garbage(db_session, grace_hours=-1, dry_run=True)
+    assert dry["orphan_blobs"] == 1 and resolve_photo_path(key).exists()
+
+    collect_photo_garbage(db_session, grace_hours=-1)
+    assert not resolve_photo_path(key).exists()
+    assert _refs(db_session, key) is None
+    assert resolve_photo_path(other_key).exists()
+
+    # ─────────────────────────────
+    # Fotos del formato viejo (ruta absoluta) pasan al store
+    # ─────────────────────────────
+    legacy = folder / "store_c_legacy.png"
+    legacy.write_bytes(other)
+    db_session.query(Player).filter(Player.name == "store_c").update({"photo_path": str(legacy)})
+    db_session.commit()
+
+    assert migrate_legacy_photos(db_session) == 1
+    assert not legacy.exists()
+    assert _refs(db_session, other_key) == 3
+    player = db_session.query(Player).filter(Player.name == "store_c").one()
+    assert player.photo_path == other_key
+
+    delete_photo_files(other_key)
+
+
+@pytest.mark.nivel("medio")
+def test_gc_keeps_files_touched_during_collection(client: TestClient, db_session: Session, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "API_PHOTO_PLAYER_PATH_FOLDER", tmp_path)
+    utils.create_player(client, "gc_race")
+    key = _upload(client, "gc_race", _image_bytes((90, 30, 160)))
+    _upload(client, "gc_race", _image_bytes((0, 0, 0)))
+    assert _refs(db_session, key) == 0
+
+    # Blob y archivo sin tocar hace 2 horas
+    photo = resolve_photo_path(key)
+    two_hours_ago = time.time() - 2 * 3600
+    os.utime(photo, (two_hours_ago, two_hours_ago))
+    db_session.query(PhotoBlob).filter(PhotoBlob.key == key).update(
+        {"updated_at": datetime.utcnow() - timedelta(hours=2)}
+    )
+    db_session.commit()
+
+    # ─────────────────────────────
+    # Un re-upload toca el archivo entre el DELETE y el borrado
+    # ─────────────────────────────
+    commit = db_session.commit
+
+    def _commit_and_touch():
+        commit()
+        os.utime(photo)
+
+    monkeypatch.setattr(db_session, "commit", _commit_and_touch)
+    assert collect_photo_garbage(db_session, grace_hours=1)["orphan_blobs"] == 1
+    assert photo.exists()
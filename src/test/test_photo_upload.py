@@ -0,0 +1,99 @@
+import struct
+import zlib
+from io import BytesIO
+
+import pytest
+from fastapi.testclient import TestClient
+from PIL import Image
+from sqlalchemy.orm import Session
+
+from src.config import settings
+from src.models import Player
+from src.services.photo_store_service import thumbnail_path_for, photo_render_path, collect_photo_garbage
+from src.test.utils_common_methods import TestUtils
+
+utils = TestUtils()
+
+
+def _image_bytes(fmt: str, size=(1200, 900)) -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", size, (200, 30, 30)).save(buffer, format=fmt)
+    return buffer.getvalue()
+
+
+def _png_header(width: int, height: int) -> bytes:
+    """
+    PNG mínimo (~60 bytes) cuyo header declara width x height: sirve para
+    probar bombas de descompresión sin armar la imagen.
+    """
+    def _chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + _chunk(b"IHDR", ihdr) + _chunk(b"IDAT", zlib.compress(b"")) + _chunk(b"IEND", b"")
+
+
+def _upload(client: TestClient, username: str, content: bytes, name="cara.png", content_type="image/png"):
+    return client.post(f"/player/{username}/photo", files={"file": (name, content, content_type)})
+
+
+@pytest.mark.nivel("medio")
+def test_streaming_photo_upload(client: TestClient, db_session: Session, tmp_path, monkeypatch):
+    # Store aislado: el GC no tiene que ver las fotos reales del repo
+    monkeypatch.setattr(settings, "API_PHOTO_PLAYER_PATH_FOLDER", tmp_path)
+    utils.create_player(client, "photo_player")
+    folder = settings.API_PHOTO_PLAYER_PATH_FOLDER.resolve()
+    before = set(folder.rglob("*")) if folder.exists() else set()
+
+    # ─────────────────────────────
+    # Rechazos: no imagen, formato mentido, demasiado grande
+    # ─────────────────────────────
+    assert _upload(client, "photo_player", b"hola, no soy una imagen").status_code == 400
+    assert _upload(client, "photo_player", b"\x89PNG\r\n\x1a\n" + b"\x00" * 64).status_code == 400
+
+    too_big = b"\xff\xd8\xff" + b"\x00" * (settings.PHOTO_MAX_BYTES + 1)
+    assert _upload(client, "photo_player", too_big, "cara.jpg", "image/jpeg").status_code == 413
+
+    # Header que declara 20000x20000 (400 MP): Pillow lo corta como bomba
+    res = _upload(client, "photo_player", _png_header(20_000, 20_000))
+    assert res.status_code == 413 and "píxeles" in res.text
+    # 36 MP: Pillow lo deja pasar, lo corta PHOTO_MAX_PIXELS
+    assert _upload(client, "photo_player", _png_header(6_000, 6_000)).status_code == 413
+
+    # Ningún .part ni archivo a medio escribir
+    assert set(folder.rglob("*")) == before
+
+    # ─────────────────────────────
+    # Upload válido: extensión por contenido + miniatura en background
+    # ─────────────────────────────
+    res = _upload(client, "photo_player", _image_bytes("JPEG"), "cara.png")
+    assert res.status_code == 200, res.text
+    first = folder / res.json()["photo"]
+    assert first.suffix == ".jpg"
+
+    thumbnail = thumbnail_path_for(first)
+    assert thumbnail.exists()
+    with Image.open(thumbnail) as image:
+        assert max(image.size) == settings.PHOTO_THUMBNAIL_SIZE
+    assert photo_render_path(res.json()["photo"]) == str(thumbnail)
+
+    # ─────────────────────────────
+    # Reemplazo: la anterior (y su miniatura) las borra el GC
+    # ─────────────────────────────
+    res = _upload(client, "photo_player", _image_bytes("PNG", (300, 300)))
+    assert res.status_code == 200, res.text
+    second = folder / res.json()["photo"]
+
+    db_session.expire_all()
+    player = db_session.query(Player).filter(Player.name == "photo_player").one()
+    assert player.photo_path == res.json()["photo"]
+
+    collect_photo_garbage(db_session, grace_hours=-1)
+    assert not first.exists() and not thumbnail.exists()
+    assert second.exists()
+
+    # La carta se sigue generando con la miniatura
+    assert client.get("/player/photo_player/card").status_code == 200
+
+    second.unlink()
+    thumbnail_path_for(second).unlink(missing_ok=True)
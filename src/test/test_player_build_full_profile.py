@@ -56,7 +56,7 @@ def test_build_player_profile_basic(client: TestClient, db_session: Session):
     assert evaluation["can_evaluate"] == []
 
 @pytest.mark.nivel("alto")
-def test_build_player_profile_full(client: TestClient, db_session: Session):
+def test_build_player_profile_full(client: TestClient, db_session: Session, count_queries):
     # Crear admin y autenticarse
     utils.create_player(client, "admin_user")
     login = client.post("/auth/login", json={"username": "admin_user", "password": "testpass"})
@@ -136,4 +136,15 @@ def test_build_player_profile_full(client: TestClient, db_session: Session):
     # ---- Evaluations ----
     evaluation = profile["evaluation"]
     assert "can_evaluate" in evaluation
-    assert isinstance(evaluation["can_evaluate"], list)
\ No newline at end of file
+    assert isinstance(evaluation["can_evaluate"], list)
+
+    # ---- Compañeros / rivales / relaciones ----
+    assert len(match_info["teammates"]) + len(match_info["opponents"]) == len(player_names) - 1
+    assert len(relations["most_played_with"]) == len(player_names) - 1
+
+    # ---- Cantidad de queries fija ----
+    target_name = target_player.name
+    db_session.expire_all()
+    with count_queries() as statements:
+        build_full_player_profile(db=db_session, username=target_name, recent_matches_limit=5)
+    assert len(statements) == 4
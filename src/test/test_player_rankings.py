@@ -0,0 +1,54 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from src.models import Player
+from src.services.ranking_service import refresh_player_rankings
+from src.test.utils_common_methods import TestUtils
+
+utils = TestUtils()
+
+
+@pytest.mark.nivel("medio")
+def test_rankings_keyset_pagination(client: TestClient, db_session: Session):
+    for i, tiro in enumerate([70, 40, 90, 40, 60]):
+        stats = {"tiro": tiro, "ritmo": 50, "fisico": 50, "defensa": 50, "aura": 50}
+        utils.create_player(client, f"rank_user_{i}", stats=stats)
+
+    # ─────────────────────────────
+    # Recorrer todas las páginas
+    # ─────────────────────────────
+    seen = []
+    cursor = None
+    while True:
+        params = {"sort_by": "tiro", "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        res = client.get("/player/rankings", params=params)
+        assert res.status_code == 200, res.text
+        page = res.json()
+        seen.extend(page["items"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+
+    rank_users = [item for item in seen if item["name"].startswith("rank_user_")]
+    assert [item["tiro"] for item in rank_users] == [90, 70, 60, 40, 40]
+    assert len({item["player_id"] for item in seen}) == len(seen)
+
+    # ─────────────────────────────
+    # El refresco incremental se refleja en el ranking
+    # ─────────────────────────────
+    player = db_session.query(Player).filter(Player.name == "rank_user_1").one()
+    player.elo = 1999
+    db_session.commit()
+    refresh_player_rankings(db_session, [player.id])
+
+    res = client.get("/player/rankings", params={"sort_by": "elo", "limit": 1})
+    assert res.json()["items"][0]["name"] == "rank_user_1"
+
+    # ─────────────────────────────
+    # sort_by inválido
+    # ─────────────────────────────
+    res = client.get("/player/rankings", params={"sort_by": "password"})
+    assert res.status_code == 400
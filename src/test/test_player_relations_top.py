@@ -0,0 +1,55 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from src.models import Player
+from src.models.player import PlayerRelation
+from src.test.utils_common_methods import TestUtils
+
+utils = TestUtils()
+
+
+def _relation(a: Player, b: Player, together: int, apart: int) -> PlayerRelation:
+    player1_id, player2_id = sorted([a.id, b.id])
+    return PlayerRelation(player1_id=player1_id, player2_id=player2_id, games_together=together, games_apart=apart)
+
+
+@pytest.mark.nivel("medio")
+def test_top_related_filters_bots_in_sql(client: TestClient, db_session: Session):
+    utils.create_player(client, "rel_owner")
+    utils.create_player(client, "rel_other")
+    for i in range(3):
+        utils.create_player(client, f"rel_human_{i}")
+        utils.create_player(client, f"rel_bot_{i}", is_bot=True)
+
+    players = {p.name: p for p in db_session.query(Player).filter(Player.name.like("rel_%")).all()}
+    owner = players["rel_owner"]
+
+    # Los bots son los que más jugaron con owner
+    db_session.add_all(
+        [_relation(owner, players[f"rel_bot_{i}"], 10 + i, 0) for i in range(3)]
+        + [_relation(owner, players[f"rel_human_{i}"], i + 1, 5 - i) for i in range(3)]
+        + [_relation(players["rel_other"], players["rel_human_0"], 1, 1)]
+    )
+    db_session.commit()
+
+    # ─────────────────────────────
+    # Exactamente N sin bots
+    # ─────────────────────────────
+    allies = owner.top_allies(db_session, limit=2, exclude_bots=True)
+    assert [(p.name, games) for p, games in allies] == [("rel_human_2", 3), ("rel_human_1", 2)]
+
+    with_bots = owner.top_teammates(db_session, limit=2)
+    assert [p.name for p, _ in with_bots] == ["rel_bot_2", "rel_bot_1"]
+
+    # ─────────────────────────────
+    # Lote por endpoint
+    # ─────────────────────────────
+    res = client.get(
+        "/player/relations/top",
+        params={"usernames": ["rel_owner", "rel_other"], "order_by": "games_apart", "limit": 1, "exclude_bots": True},
+    )
+    assert res.status_code == 200, res.text
+    data = res.json()
+    assert [p["name"] for p in data["rel_owner"]] == ["rel_human_0"]
+    assert [p["name"] for p in data["rel_other"]] == ["rel_human_0"]
@@ -0,0 +1,54 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from src.models import Player
+from src.services.player_service import resolve_players
+from src.test.utils_common_methods import TestUtils
+
+utils = TestUtils()
+
+
+@pytest.mark.nivel("medio")
+def test_resolve_roster_in_one_query(client: TestClient, db_session: Session, count_queries):
+    for name in ("Resolve_Ana", "resolve_beto", "resolve_caro"):
+        utils.create_player(client, name)
+    caro_id = db_session.query(Player.id).filter(Player.name == "resolve_caro").scalar()
+
+    # ─────────────────────────────
+    # Una sola query para usernames + ids
+    # ─────────────────────────────
+    with count_queries() as statements:
+        players, missing_usernames, missing_ids = resolve_players(
+            db_session,
+            usernames=["resolve_ana", "RESOLVE_BETO", "nadie", "resolve_ana"],
+            ids=[caro_id, 999_999],
+        )
+        names = [p.name for p in players]
+
+    assert len(statements) == 1
+    assert names == ["Resolve_Ana", "resolve_beto", "resolve_caro"]
+    assert missing_usernames == ["nadie"]
+    assert missing_ids == [999_999]
+
+    # ─────────────────────────────
+    # Endpoint
+    # ─────────────────────────────
+    res = client.post("/player/resolve", json={"usernames": ["RESOLVE_caro", "fantasma"], "ids": [caro_id]})
+    assert res.status_code == 200, res.text
+    data = res.json()
+    assert [p["name"] for p in data["players"]] == ["resolve_caro"]
+    assert data["missing_usernames"] == ["fantasma"]
+    assert data["missing_ids"] == []
+
+    assert client.post("/player/resolve", json={}).status_code == 400
+
+    # ─────────────────────────────
+    # Nombres que solo difieren en mayúsculas
+    # ─────────────────────────────
+    utils.create_player(client, "resolve_ana")
+    players, missing_usernames, _ = resolve_players(
+        db_session, usernames=["resolve_ana", "Resolve_Ana", "RESOLVE_ANA"]
+    )
+    assert [p.name for p in players] == ["resolve_ana", "Resolve_Ana"]
+    assert missing_usernames == ["RESOLVE_ANA"]
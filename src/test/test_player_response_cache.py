@@ -0,0 +1,58 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from src.services.player_response_cache import get_or_build_response, invalidate_player_responses
+from src.test.utils_common_methods import TestUtils
+
+utils = TestUtils()
+
+
+@pytest.mark.nivel("medio")
+def test_profile_cache_etag_and_invalidation(client: TestClient, db_session: Session):
+    utils.create_player(client, "cache_target")
+    utils.create_player(client, "cache_evaluator")
+
+    # ─────────────────────────────
+    # Primer GET + 304 con If-None-Match
+    # ─────────────────────────────
+    first = client.get("/player/cache_target/profile")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    not_modified = client.get("/player/cache_target/profile", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+
+    # ─────────────────────────────
+    # Evaluar stats invalida
+    # ─────────────────────────────
+    res = client.put(
+        "/player/cache_target/stats",
+        params={"evaluator_username": "cache_evaluator"},
+        json={"tiro": 99},
+    )
+    assert res.status_code == 200
+
+    after = client.get("/player/cache_target/profile", headers={"If-None-Match": etag})
+    assert after.status_code == 200
+    assert after.headers["ETag"] != etag
+    assert after.json()["stats"]["tiro"] != first.json()["stats"]["tiro"]
+
+
+@pytest.mark.nivel("medio")
+def test_stale_build_is_not_cached():
+    builds = []
+
+    def _build_during_write():
+        # El builder ya leyó cuando otro request commitea e invalida
+        builds.append(1)
+        invalidate_player_responses([7])
+        return {"n": len(builds)}, [7]
+
+    # La respuesta se devuelve, pero no queda en cache
+    assert get_or_build_response("stale", _build_during_write).body == b'{"n":1}'
+    assert get_or_build_response("stale", _build_during_write).body == b'{"n":2}'
+
+    # Sin invalidaciones en el medio sí se cachea
+    assert get_or_build_response("fresh", lambda: ({"ok": True}, [8])).body == b'{"ok":true}'
+    assert get_or_build_response("fresh", lambda: ({"ok": False}, [8])).body == b'{"ok":true}'
@@ -0,0 +1,50 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from src.models import Player, PlayerEvaluationPermission
+from src.test.utils_common_methods import TestUtils
+
+utils = TestUtils()
+
+
+@pytest.mark.nivel("medio")
+def test_stats_batch_checks_permissions(client: TestClient, db_session: Session):
+    for name in ["batch_evaluator", "batch_allowed", "batch_denied"]:
+        utils.create_player(client, name)
+    players = {p.name: p for p in db_session.query(Player).filter(Player.name.like("batch_%"))}
+
+    db_session.add(PlayerEvaluationPermission(
+        evaluator_id=players["batch_evaluator"].id,
+        target_id=players["batch_allowed"].id,
+    ))
+    db_session.commit()
+    tiro_before = players["batch_allowed"].tiro
+
+    res = client.post("/player/stats/batch", json={
+        "evaluator": "batch_evaluator",
+        "evaluations": [
+            {"target": "batch_allowed", "stats": {"tiro": 95}},
+            {"target": "batch_denied", "stats": {"tiro": 95}},
+            {"target": "batch_missing", "stats": {"tiro": 95}},
+            {"target": "batch_evaluator", "stats": {"tiro": 95}},
+            {"target": "batch_allowed", "stats": {"tiro": 95}},
+        ],
+    })
+    assert res.status_code == 200, res.text
+    body = res.json()
+
+    assert body["updated"] == 1
+    assert [r["status"] for r in body["results"]] == ["updated", "forbidden", "not_found", "self", "duplicate"]
+
+    db_session.expire_all()
+    allowed = db_session.query(Player).filter(Player.name == "batch_allowed").one()
+    assert allowed.tiro > tiro_before
+    assert body["results"][0]["stats"]["tiro"] == allowed.tiro
+
+    # Evaluador inexistente
+    res = client.post("/player/stats/batch", json={
+        "evaluator": "nobody",
+        "evaluations": [{"target": "batch_allowed", "stats": {"tiro": 10}}],
+    })
+    assert res.status_code == 404
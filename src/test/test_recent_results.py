@@ -0,0 +1,55 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from src.models import Player
+from src.services.player_service import update_player_match_history, calculate_elo
+from src.test.utils_common_methods import TestUtils
+from src.utils.recent_results import encode_recent_results, decode_recent_results, push_recent_result, streak_score
+
+utils = TestUtils()
+
+
+@pytest.mark.nivel("medio")
+def test_recent_results_bitmask_updates(client: TestClient, db_session: Session):
+    utils.create_player(client, "streak_player")
+
+    history = [True, False, True, True, False, True, True, True, False, True, True, False]
+    for won in history:
+        update_player_match_history("streak_player", won, db_session)
+
+    player = db_session.query(Player).filter(Player.name == "streak_player").one()
+    db_session.refresh(player)
+
+    # ─────────────────────────────
+    # Ventana de 10, misma API de lista
+    # ─────────────────────────────
+    assert player.cant_partidos == len(history)
+    assert player.cant_partidos_ganados == sum(history)
+    assert player.recent_results == history[-10:]
+    assert player.recent_results_len == 10
+
+    # El shift en SQL == push_recent_result en Python
+    bits, length = 0, 0
+    for won in history:
+        bits, length = push_recent_result(bits, length, won)
+    assert (player.recent_results_bits, player.recent_results_len) == (bits, length)
+
+    # ─────────────────────────────
+    # Racha por popcount == suma sobre la lista
+    # ─────────────────────────────
+    window = history[-10:]
+    bits, length = encode_recent_results(window)
+    assert decode_recent_results(bits, length) == window
+    assert streak_score(bits, length) == sum(1 if r else -1 for r in window)
+
+    # ─────────────────────────────
+    # Mismo ELO que recorriendo la lista partido a partido
+    # ─────────────────────────────
+    elo, played, won, recent = 1000, 0, 0, []
+    for result in history:
+        played += 1
+        won += int(result)
+        recent = (recent + [result])[-10:]
+        elo = calculate_elo(played, won, recent, elo)
+    assert player.elo == elo
@@ -0,0 +1,50 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from src.config import settings
+from src.test.utils_common_methods import TestUtils
+from src.utils.executors import run_db, run_render
+
+utils = TestUtils()
+
+
+@pytest.mark.nivel("medio")
+def test_render_saturation_does_not_block_db_work():
+    release = threading.Event()
+
+    async def _scenario():
+        # Renders "colgados" que ocupan todo el executor de render (y uno más en cola)
+        renders = [
+            asyncio.ensure_future(run_render(release.wait, 5))
+            for _ in range(settings.RENDER_EXECUTOR_WORKERS + 1)
+        ]
+        await asyncio.sleep(0.05)
+
+        # ─────────────────────────────
+        # Una búsqueda rápida no espera a los renders
+        # ─────────────────────────────
+        start = time.perf_counter()
+        thread_name = await run_db(lambda: threading.current_thread().name)
+        elapsed = time.perf_counter() - start
+
+        release.set()
+        await asyncio.gather(*renders)
+        return thread_name, elapsed
+
+    thread_name, elapsed = asyncio.run(_scenario())
+    assert thread_name.startswith("maxio-db")
+    assert elapsed < 1
+
+
+@pytest.mark.nivel("medio")
+def test_async_routes(client: TestClient, db_session: Session):
+    utils.create_player(client, "exec_player")
+
+    res = client.get("/player/exec_player")
+    assert res.status_code == 200, res.text
+    assert client.get("/player/nadie").status_code == 404
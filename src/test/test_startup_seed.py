@@ -0,0 +1,41 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from src.models import Player, User, AppStateMarker
+from src.models.player import PlayerRelation
+from src.scripts.init_los_pibes import INITIAL_USERS
+from src.services.startup_service import run_startup_seed, seed_fingerprint, SEED_MARKER, TOTAL_BOTS
+
+
+@pytest.mark.nivel("medio")
+def test_startup_seed_runs_once_per_version(client: TestClient, db_session: Session, count_queries):
+    # ─────────────────────────────
+    # El startup del TestClient ya seedeó y dejó la marca
+    # ─────────────────────────────
+    marker = db_session.get(AppStateMarker, SEED_MARKER)
+    assert marker is not None and marker.version == seed_fingerprint()
+    assert db_session.query(func.count(User.id)).scalar() == len(INITIAL_USERS)
+    assert db_session.query(func.count(Player.id)).filter(Player.is_bot.is_(True)).scalar() == TOTAL_BOTS
+    relations = db_session.query(func.count(PlayerRelation.id)).scalar()
+    assert relations > 0
+
+    # ─────────────────────────────
+    # Misma versión: una sola query y no seedea
+    # ─────────────────────────────
+    with count_queries() as statements:
+        assert run_startup_seed(db_session) is False
+    assert len(statements) == 1
+
+    # ─────────────────────────────
+    # Versión distinta: re-seed idempotente (no duplica nada)
+    # ─────────────────────────────
+    marker.version = "viejo"
+    db_session.commit()
+
+    assert run_startup_seed(db_session) is True
+    assert db_session.query(func.count(User.id)).scalar() == len(INITIAL_USERS)
+    assert db_session.query(func.count(PlayerRelation.id)).scalar() == relations
+    db_session.expire_all()
+    assert db_session.get(AppStateMarker, SEED_MARKER).version == seed_fingerprint()
@@ -0,0 +1,73 @@
+import asyncio
+from io import BytesIO
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.orm import Session
+from telegram.error import BadRequest
+
+from src.bot.telegram_media import send_cached_photo
+from src.services.telegram_file_cache_service import compute_render_hash, get_cached_file_id, save_file_id
+
+
+class _StubMessage:
+    """
+    Message de Telegram mínimo: registra cada reply_photo y responde con
+    un file_id nuevo por subida. Los file_id de `rejected` dan BadRequest.
+    """
+    def __init__(self, rejected: set[str] | None = None):
+        self.sent: list = []
+        self.rejected = rejected or set()
+        self._uploads = 0
+
+    async def reply_photo(self, photo, caption=None):
+        self.sent.append(photo)
+        if isinstance(photo, str):
+            if photo in self.rejected:
+                raise BadRequest("Wrong file identifier/http url specified")
+            return SimpleNamespace(photo=[SimpleNamespace(file_id=photo, file_unique_id=f"u-{photo}")])
+
+        self._uploads += 1
+        file_id = f"file-{self._uploads}"
+        return SimpleNamespace(photo=[
+            SimpleNamespace(file_id=f"{file_id}-small", file_unique_id="small"),
+            SimpleNamespace(file_id=file_id, file_unique_id=f"u-{file_id}"),
+        ])
+
+
+def _card(content: bytes) -> BytesIO:
+    buffer = BytesIO(content)
+    buffer.render_hash = compute_render_hash(content)
+    return buffer
+
+
+@pytest.mark.nivel("medio")
+def test_send_cached_photo_hit_miss_and_stale(db_session: Session):
+    card = b"png de prueba"
+    render_hash = compute_render_hash(card)
+
+    # ─────────────────────────────
+    # Miss: se suben los bytes y se guarda el file_id más grande
+    # ─────────────────────────────
+    message = _StubMessage()
+    asyncio.run(send_cached_photo(message, _card(card), kind="player_card"))
+    assert isinstance(message.sent[0], BytesIO)
+    assert get_cached_file_id(db_session, render_hash) == "file-1"
+
+    # ─────────────────────────────
+    # Hit: se reenvía el file_id, sin subir nada
+    # ─────────────────────────────
+    message = _StubMessage()
+    asyncio.run(send_cached_photo(message, card, kind="player_card"))
+    assert message.sent == ["file-1"]
+
+    # ─────────────────────────────
+    # file_id rechazado por Telegram: se olvida, se sube y se guarda el nuevo
+    # ─────────────────────────────
+    save_file_id(db_session, render_hash, "vencido", "player_card")
+    message = _StubMessage(rejected={"vencido"})
+    sent = asyncio.run(send_cached_photo(message, _card(card), kind="player_card"))
+
+    assert message.sent[0] == "vencido" and isinstance(message.sent[1], BytesIO)
+    assert sent.photo[-1].file_id == "file-1"
+    assert get_cached_file_id(db_session, render_hash) == "file-1"
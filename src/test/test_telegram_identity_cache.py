@@ -0,0 +1,53 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from src.models import User
+from src.services.telegram_identity_service import (
+    create_identity_if_not_exists,
+    link_identity_to_user,
+    unlink_identity_from_user,
+    resolve_identity,
+    invalidate_identity_cache,
+)
+from src.test.utils_common_methods import TestUtils
+
+utils = TestUtils()
+
+TELEGRAM_USER_ID = 555001
+
+
+@pytest.mark.nivel("medio")
+def test_identity_cache_hits_and_invalidation(client: TestClient, db_session: Session, count_queries):
+    invalidate_identity_cache(TELEGRAM_USER_ID)
+    utils.create_player(client, "cached_user")
+    user = db_session.query(User).filter(User.username == "cached_user").one()
+
+    identity = create_identity_if_not_exists(db_session, TELEGRAM_USER_ID, "tg_cached")
+
+    # ─────────────────────────────
+    # Miss + hit
+    # ─────────────────────────────
+    first = resolve_identity(db_session, TELEGRAM_USER_ID)
+    assert first.user_id is None
+
+    with count_queries() as statements:
+        second = resolve_identity(db_session, TELEGRAM_USER_ID)
+    assert statements == []
+    assert second == first
+
+    # ─────────────────────────────
+    # link invalida
+    # ─────────────────────────────
+    link_identity_to_user(db_session, identity, user)
+    linked = resolve_identity(db_session, TELEGRAM_USER_ID)
+    assert linked.user_id == user.id
+    assert linked.username == "cached_user"
+
+    # ─────────────────────────────
+    # unlink invalida
+    # ─────────────────────────────
+    unlink_identity_from_user(db_session, identity)
+    unlinked = resolve_identity(db_session, TELEGRAM_USER_ID)
+    assert unlinked.user_id is None
+    assert unlinked.username is None
@@ -0,0 +1,29 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from src.config import settings
+
+HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+
+@pytest.mark.nivel("medio")
+def test_webhook_requires_secret(client: TestClient, monkeypatch):
+    path = settings.TELEGRAM_WEBHOOK_PATH
+    update = {"update_id": 1}
+
+    # ─────────────────────────────
+    # Sin secret configurado no entra nada
+    # ─────────────────────────────
+    monkeypatch.setattr(settings, "TELEGRAM_WEBHOOK_SECRET", "")
+    assert client.post(path, json=update).status_code == 403
+    assert client.post(path, json=update, headers={HEADER: ""}).status_code == 403
+
+    # ─────────────────────────────
+    # Con secret: header faltante o distinto => 403
+    # ─────────────────────────────
+    monkeypatch.setattr(settings, "TELEGRAM_WEBHOOK_SECRET", "s3cret")
+    assert client.post(path, json=update).status_code == 403
+    assert client.post(path, json=update, headers={HEADER: "otro"}).status_code == 403
+
+    # Secret correcto pasa el chequeo (el bot no está inicializado en los tests)
+    assert client.post(path, json=update, headers={HEADER: "s3cret"}).status_code == 503
@@ -7,6 +7,7 @@ from httpx import Response
 from sqlalchemy.orm import  Session
 
 from src.models import Team, Player, Match, MatchPlayer
+from src.models.match import TeamEnum
 from src.models.player import PlayerRelation
 from src.services import player_service
 from src.services.match_service import assign_team_to_match
@@ -214,6 +215,41 @@ class TestUtils:
         res = client.post(f"/match/matches/{match_id}/teams/{team_id}")
         assert res.status_code == 200, f"Error asignando team {team_id} al match {match_id}: {res.text}"
 
+    def create_one_vs_one_match(
+            self,
+            client: TestClient,
+            db_session: Session,
+            username_1: str,
+            username_2: str,
+            **match_fields
+    ) -> tuple[Match, Player, Player]:
+        """
+        Match 1 vs 1 armado directo en la base: username_1 en team1 y
+        username_2 en team2. match_fields pasa columnas extra (ej: votos).
+        Los user_id están en player.user_id.
+        """
+        user_1 = self.create_player(client, username_1)
+        user_2 = self.create_player(client, username_2)
+        player_1 = db_session.query(Player).filter(Player.user_id == user_1).one()
+        player_2 = db_session.query(Player).filter(Player.user_id == user_2).one()
+
+        team_1, team_2 = Team(name="Team 1"), Team(name="Team 2")
+        db_session.add_all([team_1, team_2])
+        db_session.flush()
+
+        match = Match(
+            date=datetime.utcnow(), max_players=2, team1_id=team_1.id, team2_id=team_2.id, **match_fields
+        )
+        db_session.add(match)
+        db_session.flush()
+
+        db_session.add_all([
+            MatchPlayer(match_id=match.id, player_id=player_1.id, team=TeamEnum.team1),
+            MatchPlayer(match_id=match.id, player_id=player_2.id, team=TeamEnum.team2),
+        ])
+        db_session.commit()
+        return match, player_1, player_2
+
     def setup_match_teams_players(
             self,
             client: TestClient,
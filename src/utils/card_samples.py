@@ -0,0 +1,85 @@
+# src/utils/card_samples.py
+"""
+Datos sintéticos para dibujar cartas sin base de datos: reportes de match,
+jugadores y fotos stub generadas en disco. Los usan el benchmark de render
+(src/scripts/benchmark_cards.py) y los tests golden.
+
+Todo sale de un Random con seed: mismo seed => mismas cartas.
+"""
+
+import random
+from pathlib import Path
+from types import SimpleNamespace
+
+from src.schemas.match_schema import MatchReportResponse
+
+STAT_NAMES = ("aura", "tiro", "ritmo", "fisico", "defensa")
+
+
+def sample_match_report(seed: int = 7, players_per_team: int = 5) -> MatchReportResponse:
+    """
+    Reporte de match con stats aleatorias y algunas relaciones fuertes
+    (links verdes y rojos) en cada equipo.
+    """
+    rnd = random.Random(seed)
+    teams = {}
+    relations = {}
+
+    for team_name in ("team_1", "team_2"):
+        names = [f"{team_name[-1]}jugador{i}" for i in range(players_per_team)]
+        individual = [
+            {"name": name, "stats": {stat: rnd.randint(60, 99) for stat in STAT_NAMES}}
+            for name in names
+        ]
+        teams[team_name] = {
+            "players": names,
+            "total_stats": {stat: sum(p["stats"][stat] for p in individual) for stat in STAT_NAMES},
+            "chemistry_score": round(rnd.uniform(-5, 5), 1),
+            "individual_stats": individual,
+        }
+        relations[team_name] = {
+            "together": [(names[0], names[1], rnd.randint(11, 30))],
+            "apart": [(names[2], names[3], rnd.randint(16, 40))] if players_per_team > 3 else [],
+        }
+
+    return MatchReportResponse(
+        match_id=seed,
+        teams=teams,
+        preserved_groups=[],
+        balance_score=round(rnd.uniform(0, 10), 2),
+        stat_diff={stat: teams["team_1"]["total_stats"][stat] - teams["team_2"]["total_stats"][stat] for stat in STAT_NAMES},
+        relations_summary=relations,
+    )
+
+
+def sample_player(seed: int = 7, photo_path: str | None = None) -> SimpleNamespace:
+    """
+    Objeto con los atributos que lee generate_player_card_from_player.
+    """
+    rnd = random.Random(seed)
+    stats = {stat: rnd.randint(40, 99) for stat in STAT_NAMES}
+    return SimpleNamespace(name=f"Jugador{seed}", photo_path=photo_path, **stats)
+
+
+def write_stub_photo(folder: str | Path, seed: int = 7, size: tuple[int, int] = (900, 1200)) -> Path:
+    """
+    Foto stub (JPEG con degradé y un círculo, para que el resize tenga
+    detalle que procesar). Retorna la ruta absoluta.
+    """
+    from PIL import Image, ImageDraw
+
+    rnd = random.Random(seed)
+    width, height = size
+    base = (rnd.randint(0, 255), rnd.randint(0, 255), rnd.randint(0, 255))
+
+    gradient = Image.linear_gradient("L").resize(size)
+    image = Image.merge("RGB", (gradient, gradient.transpose(Image.Transpose.FLIP_TOP_BOTTOM), gradient.rotate(90)))
+    image = Image.blend(image, Image.new("RGB", size, base), 0.5)
+    ImageDraw.Draw(image).ellipse(
+        (width * 0.25, height * 0.15, width * 0.75, height * 0.55), fill=(230, 190, 160)
+    )
+
+    path = Path(folder) / f"stub_{seed}.jpg"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    image.save(path, format="JPEG", quality=90)
+    return path.resolve()
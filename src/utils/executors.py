@@ -0,0 +1,65 @@
+# src/utils/executors.py
+"""
+Política de ejecución de las rutas de la API.
+
+Las rutas son async y mandan el trabajo bloqueante a un executor propio:
+
+    - DB:     queries / commits (sesiones SQLAlchemy sync). Dimensionado
+              para no pedir más conexiones que las que tiene el pool.
+    - render: cartas de jugador / match con Pillow (CPU).
+
+Así una ráfaga de renders llena su propio executor y no deja sin threads
+a las búsquedas rápidas, que además no compiten con el threadpool por
+defecto de Starlette (40 threads compartidos por todo lo sync).
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from src.config import settings
+
+T = TypeVar("T")
+
+
+# Se crean al primer uso y se recrean si se apagaron (cada ciclo
+# startup/shutdown de la app, ej: en los tests)
+_EXECUTOR_SIZES = {
+    "db": lambda: settings.DB_EXECUTOR_WORKERS,
+    "render": lambda: settings.RENDER_EXECUTOR_WORKERS,
+}
+_executors: dict[str, ThreadPoolExecutor] = {}
+
+
+def get_executor(name: str) -> ThreadPoolExecutor:
+    executor = _executors.get(name)
+    if executor is None:
+        executor = ThreadPoolExecutor(max_workers=_EXECUTOR_SIZES[name](), thread_name_prefix=f"maxio-{name}")
+        _executors[name] = executor
+    return executor
+
+
+async def _run(name: str, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(name), functools.partial(func, *args, **kwargs))
+
+
+async def run_db(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Corre func(*args, **kwargs) en el executor de base de datos.
+    """
+    return await _run("db", func, *args, **kwargs)
+
+
+async def run_render(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Corre func(*args, **kwargs) en el executor de render de imágenes.
+    """
+    return await _run("render", func, *args, **kwargs)
+
+
+def shutdown_executors() -> None:
+    while _executors:
+        _, executor = _executors.popitem()
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,48 @@
+# src/utils/recent_results.py
+"""
+Últimos resultados de un jugador guardados como bitmask + largo.
+
+    bit 0 = partido más reciente, bit 1 = el anterior, ...
+    1 = victoria, 0 = derrota
+
+Agregar un resultado es un shift + OR + máscara (se puede hacer en SQL) y
+la racha sale de contar bits en 1, sin recorrer listas.
+"""
+
+RECENT_RESULTS_SIZE = 10
+RECENT_RESULTS_MASK = (1 << RECENT_RESULTS_SIZE) - 1
+
+
+def encode_recent_results(results: list[bool] | None) -> tuple[int, int]:
+    """
+    Lista (más vieja → más nueva) a (bits, largo). Se queda con las últimas 10.
+    """
+    results = list(results or [])[-RECENT_RESULTS_SIZE:]
+    bits = 0
+    for won in results:
+        bits = (bits << 1) | int(bool(won))
+    return bits, len(results)
+
+
+def decode_recent_results(bits: int | None, length: int | None) -> list[bool]:
+    """
+    (bits, largo) a lista (más vieja → más nueva), igual que el ARRAY anterior.
+    """
+    bits = bits or 0
+    length = length or 0
+    return [bool((bits >> i) & 1) for i in range(length - 1, -1, -1)]
+
+
+def push_recent_result(bits: int, length: int, won: bool) -> tuple[int, int]:
+    """
+    Agrega un resultado como el más reciente. Es lo mismo que hace el
+    UPDATE de update_player_match_history en SQL.
+    """
+    return ((bits << 1) | int(won)) & RECENT_RESULTS_MASK, min(length + 1, RECENT_RESULTS_SIZE)
+
+
+def streak_score(bits: int, length: int) -> int:
+    """
+    Victorias - derrotas en la ventana: 2 * popcount - largo.
+    """
+    return 2 * (bits & RECENT_RESULTS_MASK).bit_count() - length
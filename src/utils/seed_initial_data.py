@@ -1,5 +1,7 @@
 # src/scripts/seed_initial_data.py
 
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
 from src.database import SessionLocal
@@ -10,83 +12,60 @@ from src.scripts.init_los_pibes import INITIAL_USERS
 from src.scripts.init_los_pibes import INITIAL_PLAYER_RELATIONS
 
 
-# -----------------------------
-# Helpers
-# -----------------------------
-
-def get_user_by_username(db: Session, username: str) -> User | None:
-    return db.query(User).filter(User.username == username).first()
-
-
-def get_player_by_username(db: Session, username: str) -> Player | None:
-    user = get_user_by_username(db, username)
-    if not user:
-        return None
-    return user.player
-
-
 # -----------------------------
 # Seed Users + Players
 # -----------------------------
 
 def seed_users_and_players(db: Session):
+    """
+    Crea en bulk los users (y su player) de INITIAL_USERS que no existan.
+    Los existentes no se tocan. Una query para ver cuáles existen y un
+    INSERT por tabla; solo se hashean las passwords de los nuevos.
+    """
     print("▶ Seeding users and players...")
 
+    # Validación fuerte de stats
     for entry in INITIAL_USERS:
-        username = entry["username"]
-        email = entry["email"]
-        password = entry["password"]
-        player_data = entry["player"]
-        stats = player_data["stats"]
-
-        # Validación fuerte de stats
+        stats = entry["player"]["stats"]
         for stat in ["tiro", "ritmo", "fisico", "defensa", "aura"]:
             if stats.get(stat) is None:
-                raise ValueError(f"Stat '{stat}' missing for user '{username}'")
-
-        user = get_user_by_username(db, username)
-
-        if not user:
-            user = User(
-                username=username,
-                email=email,
-            )
-            user.set_password(password)
-            db.add(user)
-            db.flush()  # necesitamos user.id
-            print(f"  + User creado: {username}")
-        else:
-            #print(f"  = User existente: {username}")
-            continue
-
-        if not user.player:
-            player = Player(
-                name=player_data["name"],
-                user_id=user.id,
-                is_bot=False,
-                elo=1000,
-                recent_results=[],
-                tiro=stats["tiro"],
-                ritmo=stats["ritmo"],
-                fisico=stats["fisico"],
-                defensa=stats["defensa"],
-                aura=stats["aura"],
-            )
-            db.add(player)
-            print(f"    + Player creado para {username}")
-        else:
-            # player = user.player
-            # player.name = player_data["name"]
-            # player.tiro = stats["tiro"]
-            # player.ritmo = stats["ritmo"]
-            # player.fisico = stats["fisico"]
-            # player.defensa = stats["defensa"]
-            # player.aura = stats["aura"]
-            # print(f"    = Player actualizado para {username}")
-            continue
+                raise ValueError(f"Stat '{stat}' missing for user '{entry['username']}'")
+
+    existing = set(db.scalars(
+        select(User.username).where(User.username.in_([e["username"] for e in INITIAL_USERS]))
+    ))
+    new_entries = [e for e in INITIAL_USERS if e["username"] not in existing]
+    if not new_entries:
+        print("✔ Users y Players listos (sin cambios)\n")
+        return
+
+    users = []
+    for entry in new_entries:
+        user = User(username=entry["username"], email=entry["email"])
+        user.set_password(entry["password"])
+        users.append(user)
+    db.add_all(users)
+    db.flush()  # necesitamos user.id
+
+    players = []
+    for entry, user in zip(new_entries, users):
+        player_data = entry["player"]
+        stats = player_data["stats"]
+        players.append(Player(
+            name=player_data["name"],
+            user_id=user.id,
+            is_bot=False,
+            elo=1000,
+            tiro=stats["tiro"],
+            ritmo=stats["ritmo"],
+            fisico=stats["fisico"],
+            defensa=stats["defensa"],
+            aura=stats["aura"],
+        ))
+    db.add_all(players)
 
     db.commit()
-    print("✔ Users y Players listos\n")
+    print(f"✔ Users y Players listos ({len(users)} nuevos)\n")
 
 
 # -----------------------------
@@ -94,16 +73,30 @@ def seed_users_and_players(db: Session):
 # -----------------------------
 
 def seed_player_relations(db: Session):
+    """
+    Crea en bulk las relaciones de INITIAL_PLAYER_RELATIONS que no existan
+    (las existentes no se pisan). Una query para resolver todos los players
+    y un INSERT ... ON CONFLICT DO NOTHING.
+    """
     print("▶ Seeding player relations...")
 
+    usernames = set(INITIAL_PLAYER_RELATIONS)
+    for relations in INITIAL_PLAYER_RELATIONS.values():
+        usernames.update(relations)
+
+    player_ids = dict(db.execute(
+        select(User.username, Player.id)
+        .join(Player, Player.user_id == User.id)
+        .where(User.username.in_(usernames))
+    ).all())
+
+    rows = {}
     for username_a, relations in INITIAL_PLAYER_RELATIONS.items():
-        player_a = get_player_by_username(db, username_a)
-        if not player_a:
+        if username_a not in player_ids:
             raise ValueError(f"Player not found for username '{username_a}'")
 
         for username_b, values in relations.items():
-            player_b = get_player_by_username(db, username_b)
-            if not player_b:
+            if username_b not in player_ids:
                 raise ValueError(f"Player not found for username '{username_b}'")
 
             together = values.get("together")
@@ -114,31 +107,27 @@ def seed_player_relations(db: Session):
                     f"Missing values for relation {username_a} - {username_b}"
                 )
 
-            player1_id, player2_id = sorted([player_a.id, player_b.id])
-
-            relation = (
-                db.query(PlayerRelation)
-                .filter_by(player1_id=player1_id, player2_id=player2_id)
-                .first()
-            )
-
-            if not relation:
-                relation = PlayerRelation(
-                    player1_id=player1_id,
-                    player2_id=player2_id,
-                )
-                db.add(relation)
-                print(f"  + Relation creada: {username_a} - {username_b}")
-            else:
-                #print(f"  = Relation existente: {username_a} - {username_b}")
-                break
-
-            # SET directo (idempotente)
-            relation.games_together = together
-            relation.games_apart = apart
+            player1_id, player2_id = sorted([player_ids[username_a], player_ids[username_b]])
+
+            # Si el par aparece de los dos lados gana el primero
+            rows.setdefault((player1_id, player2_id), {
+                "player1_id": player1_id,
+                "player2_id": player2_id,
+                "games_together": together,
+                "games_apart": apart,
+            })
+
+    created = 0
+    if rows:
+        created = len(db.execute(
+            pg_insert(PlayerRelation)
+            .values(list(rows.values()))
+            .on_conflict_do_nothing(constraint="uq_player_relation")
+            .returning(PlayerRelation.id)
+        ).all())
 
     db.commit()
-    print("✔ Player relations listas\n")
+    print(f"✔ Player relations listas ({created} nuevas)\n")
 
 
 # -----------------------------
@@ -0,0 +1,135 @@
+# src/utils/ttl_cache.py
+
+import threading
+import time
+from typing import Any, Callable, Hashable
+
+
+class TTLCache:
+    """
+    Cache en memoria con expiración por entrada.
+
+    - Thread-safe: el bot corre en otro thread que la API.
+    - max_size acota la memoria: al llenarse se descartan primero las
+      entradas vencidas y, si no alcanza, las más viejas.
+    - Es por proceso: cada proceso tiene su propia copia.
+    - generation sube con cada invalidación: quien arma un valor desde la
+      base la toma antes de leer y lo guarda con set_if_generation, así un
+      valor leído antes de una invalidación no vuelve a entrar.
+    """
+
+    _MISSING = object()
+
+    def __init__(self, ttl_seconds: float, max_size: int = 10_000):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._data: dict[Hashable, tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            if len(self._data) >= self.max_size and key not in self._data:
+                self._evict()
+            self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+
+    def set_if_generation(self, key: Hashable, value: Any, generation: int) -> bool:
+        """
+        Guarda value solo si no hubo invalidaciones desde generation (el
+        valor de self.generation antes de leer los datos). Retorna si lo guardó.
+        """
+        with self._lock:
+            if self._generation != generation:
+                return False
+            if len(self._data) >= self.max_size and key not in self._data:
+                self._evict()
+            self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+            return True
+
+    def set_if_absent(self, key: Hashable, value: Any, generation: int | None = None) -> Any:
+        """
+        Guarda value solo si no hay una entrada vigente para key (chequeo y
+        escritura bajo el mismo lock). Retorna el valor que quedó en cache.
+        Con generation, tampoco guarda si hubo invalidaciones desde entonces
+        (retorna value sin cachearlo).
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] >= time.monotonic():
+                return entry[1]
+            if generation is not None and self._generation != generation:
+                return value
+            if len(self._data) >= self.max_size and key not in self._data:
+                self._evict()
+            self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+            return value
+
+    def get_or_set(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Devuelve el valor cacheado o lo calcula con loader().
+        Los None no se cachean, ni lo cargado si hubo una invalidación
+        mientras loader() leía (ver set_if_generation).
+        """
+        value = self.get(key, self._MISSING)
+        if value is not self._MISSING:
+            return value
+        generation = self._generation
+        value = loader()
+        if value is not None:
+            self.set_if_generation(key, value, generation)
+        return value
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._generation += 1
+            self._data.pop(key, None)
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> None:
+        with self._lock:
+            self._generation += 1
+            for key in [k for k in self._data if predicate(k)]:
+                del self._data[key]
+
+    def invalidate_entries_where(self, predicate: Callable[[Hashable, Any], bool]) -> None:
+        """
+        Igual que invalidate_where pero el predicado recibe (key, value).
+        """
+        with self._lock:
+            self._generation += 1
+            for key in [k for k, (_, v) in self._data.items() if predicate(k, v)]:
+                del self._data[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        expired = [k for k, (expires_at, _) in self._data.items() if expires_at < now]
+        for key in expired:
+            del self._data[key]
+
+        if len(self._data) >= self.max_size:
+            # dict mantiene orden de inserción: las primeras son las más viejas
+            overflow = len(self._data) - self.max_size + 1
+            for key in list(self._data)[:overflow]:
+                del self._data[key]